@@ -5,15 +5,18 @@ PlotPlayer project.
 Public Modules:
   * plotplayer - Contains the PlotPlayer interface and functionality; this is the most
       common entry point for most usages
+  * notebook_player - Contains the NotebookPlayer playing a headless PlotPlayer in Jupyter
+  * player_group - Contains the PlayerGroup driving several PlotPlayers from a single clock
+  * stream_server - Contains the StreamServer serving the frames of a headless PlotPlayer to
+      browsers over HTTP
 
 Subpackages:
+  * data_models - Contains modules containing parameter and state classes
+  * frame_sources - Contains modules rendering frames from data instead of a render function
   * helpers - Contains various modules containing miscellaneous helper methods
   * managers - Contains modules related to managing the plotplayer functionality
   * validators - Contains modules related to input and type validation
 """
 
-# Prevent usage of backends other than Tkinter
-import matplotlib
-
-
-matplotlib.use("TkAgg")
+# The Tkinter backend is selected when the first PlotPlayer window is created (see
+#   helpers.ui_helper.get_pyplot) so importing the package loads neither pyplot nor Tkinter
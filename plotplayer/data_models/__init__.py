@@ -4,6 +4,14 @@ state objects
 
 Public Modules :
   * animation_params - Contains class and default values related to Animation Parameters
+  * cache_stats - Contains class related to Frame Cache Statistics
+  * canvas_params - Contains class related to Canvas Parameters used to rebuild headless canvases
+  * compression_report - Contains class related to the Compression of a Delta Frame Cache
+  * export_progress - Contains class related to the Progress of background export jobs
+  * frame_file_params - Contains class describing on disk arrays of stacked per frame data
+  * playback_stats - Contains class related to Playback Statistics
   * render_axes_params - Contains class and default values related to Render Axes Parameters
+  * series_params - Contains class and constants related to Series Parameters of stacked arrays
   * slider_params - Contains class and default values related to Slider Parameters
+  * timing_stats - Contains class related to Timing Statistics of render stages
 """
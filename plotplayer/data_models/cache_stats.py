@@ -0,0 +1,55 @@
+"""
+PlotPlayer specific Frame Cache Statistics Class
+
+Public Classes :
+  * CacheStats - Class containing counters related to a Frame Cache
+"""
+
+class CacheStats(object):
+    """
+    Counters related to Frame Cache usage
+
+    Public Attributes :
+      * hits - Number of frame lookups satisfied by the cache
+      * misses - Number of frame lookups not satisfied by the cache
+      * evictions - Number of frames removed to stay within the byte budget
+      * frame_count - Number of frames currently held by the cache
+      * size_bytes - Number of bytes currently held by the cache
+      * max_bytes - Byte budget of the cache
+    """
+
+    hits = 0
+    misses = 0
+    evictions = 0
+    frame_count = 0
+    size_bytes = 0
+    max_bytes = 0
+
+    #pylint: disable=too-many-arguments
+    def __init__(self, hits=0, misses=0, evictions=0, frame_count=0, size_bytes=0, max_bytes=0):
+        """
+        Constructor
+
+        Parameters :
+          * hits - Number of frame lookups satisfied by the cache
+          * misses - Number of frame lookups not satisfied by the cache
+          * evictions - Number of frames removed to stay within the byte budget
+          * frame_count - Number of frames currently held by the cache
+          * size_bytes - Number of bytes currently held by the cache
+          * max_bytes - Byte budget of the cache
+        """
+        self.hits = hits
+        self.misses = misses
+        self.evictions = evictions
+        self.frame_count = frame_count
+        self.size_bytes = size_bytes
+        self.max_bytes = max_bytes
+
+    def get_hit_ratio(self):
+        """
+        Return the ratio of lookups satisfied by the cache
+        """
+        lookups = self.hits + self.misses
+        if lookups == 0:
+            return 0.0
+        return self.hits / lookups
@@ -0,0 +1,102 @@
+"""
+PlotPlayer specific Canvas Parameters Class
+
+Public Classes :
+  * CanvasParams - Class containing the parameters needed to rebuild an Animation canvas
+"""
+
+class CanvasParams(object):
+    """
+    Parameters needed to rebuild an Animation canvas on a headless figure
+
+    Public Attributes :
+      * figure_size - Tuple containing the figure width and height in inches
+      * dpi - Dots per inch of the figure
+      * animation_axes_rect - Array representing the Animation Axes [ x, y, width, height ] in
+          percentage of figure size
+      * animation_x_limits - An array representing the minimum and maximum animation x-axis limits;
+          None if autoscaled
+      * animation_y_limits - An array representing the minimum and maximum animation y-axis limits;
+          None if autoscaled
+      * axis_visible - Boolean indicating whether the Animation Axes axis lines and labels are drawn
+    """
+
+    figure_size = None
+    dpi = None
+    animation_axes_rect = None
+    animation_x_limits = None
+    animation_y_limits = None
+    axis_visible = False
+
+    #pylint: disable=too-many-arguments
+    def __init__(self, figure_size, dpi, animation_axes_rect, animation_x_limits=None,
+                 animation_y_limits=None, axis_visible=False):
+        """
+        Constructor
+
+        Parameters :
+          * figure_size - Tuple containing the figure width and height in inches
+          * dpi - Dots per inch of the figure
+          * animation_axes_rect - Array representing the Animation Axes [ x, y, width, height ] in
+              percentage of figure size
+          * animation_x_limits (optional) - An array representing the minimum and maximum
+              animation x-axis limits
+          * animation_y_limits (optional) - An array representing the minimum and maximum
+              animation y-axis limits
+          * axis_visible (optional) - Boolean indicating whether the Animation Axes axis lines and
+              labels are drawn
+        """
+        self.figure_size = tuple(figure_size)
+        self.dpi = dpi
+        self.animation_axes_rect = tuple(animation_axes_rect)
+        self.animation_x_limits = animation_x_limits
+        self.animation_y_limits = animation_y_limits
+        self.axis_visible = axis_visible
+
+    def __eq__(self, other):
+        return isinstance(other, CanvasParams) and self._get_key() == other._get_key()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._get_key())
+
+    def get_figure_size(self):
+        """
+        Return the Figure Size in inches
+        """
+        return self.figure_size
+
+    def get_dpi(self):
+        """
+        Return the Figure DPI
+        """
+        return self.dpi
+
+    def get_animation_axes_rect(self):
+        """
+        Return the Animation Axes Rect
+        """
+        return self.animation_axes_rect
+
+    def get_animation_x_limits(self):
+        """
+        Return the Animation X-Axis Limits
+        """
+        return self.animation_x_limits
+
+    def get_animation_y_limits(self):
+        """
+        Return the Animation Y-Axis Limits
+        """
+        return self.animation_y_limits
+
+    def _get_key(self):
+        """
+        Return a hashable tuple of all parameters
+        """
+        x_limits = None if self.animation_x_limits is None else tuple(self.animation_x_limits)
+        y_limits = None if self.animation_y_limits is None else tuple(self.animation_y_limits)
+        return (self.figure_size, self.dpi, self.animation_axes_rect, x_limits, y_limits,
+                self.axis_visible)
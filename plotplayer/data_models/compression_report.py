@@ -0,0 +1,75 @@
+"""
+PlotPlayer specific Compression Report Class
+
+Public Classes :
+  * CompressionReport - Class containing the memory saved and decode cost of a delta frame cache
+"""
+
+class CompressionReport(object):
+    """
+    Memory use and decode cost of the frames held by a DeltaFrameCacheManager; durations are in
+    seconds
+
+    Public Attributes :
+      * frame_count - Number of frames held
+      * keyframe_count - Number of frames held as whole compressed keyframes
+      * delta_count - Number of frames held as changed tiles of their keyframe
+      * raw_bytes - Number of bytes the frames would take as raw pixels
+      * stored_bytes - Number of bytes the frames take as keyframes and deltas
+      * changed_tile_fraction - Mean fraction of tiles stored per delta frame
+      * mean_decode_time - Mean duration of recent frame lookups
+      * max_decode_time - Longest duration of recent frame lookups
+      * mean_encode_time - Mean duration of recent frame stores
+    """
+
+    frame_count = 0
+    keyframe_count = 0
+    delta_count = 0
+    raw_bytes = 0
+    stored_bytes = 0
+    changed_tile_fraction = 0.0
+    mean_decode_time = 0.0
+    max_decode_time = 0.0
+    mean_encode_time = 0.0
+
+    #pylint: disable=too-many-arguments
+    def __init__(self, frame_count=0, keyframe_count=0, delta_count=0, raw_bytes=0,
+                 stored_bytes=0, changed_tile_fraction=0.0, mean_decode_time=0.0,
+                 max_decode_time=0.0, mean_encode_time=0.0):
+        """
+        Constructor
+
+        Parameters :
+          * frame_count - Number of frames held
+          * keyframe_count - Number of frames held as whole compressed keyframes
+          * delta_count - Number of frames held as changed tiles of their keyframe
+          * raw_bytes - Number of bytes the frames would take as raw pixels
+          * stored_bytes - Number of bytes the frames take as keyframes and deltas
+          * changed_tile_fraction - Mean fraction of tiles stored per delta frame
+          * mean_decode_time - Mean duration of recent frame lookups
+          * max_decode_time - Longest duration of recent frame lookups
+          * mean_encode_time - Mean duration of recent frame stores
+        """
+        self.frame_count = frame_count
+        self.keyframe_count = keyframe_count
+        self.delta_count = delta_count
+        self.raw_bytes = raw_bytes
+        self.stored_bytes = stored_bytes
+        self.changed_tile_fraction = changed_tile_fraction
+        self.mean_decode_time = mean_decode_time
+        self.max_decode_time = max_decode_time
+        self.mean_encode_time = mean_encode_time
+
+    def get_compression_ratio(self):
+        """
+        Return the ratio of raw pixel bytes to stored bytes
+        """
+        if self.stored_bytes == 0:
+            return 0.0
+        return self.raw_bytes / self.stored_bytes
+
+    def get_saved_bytes(self):
+        """
+        Return the number of bytes saved compared to holding raw pixels
+        """
+        return self.raw_bytes - self.stored_bytes
@@ -0,0 +1,59 @@
+"""
+PlotPlayer specific Export Progress Class
+
+Public Classes :
+  * ExportProgress - Class containing the state, rate and remaining time of an export job
+"""
+
+class ExportProgress(object):
+    """
+    Progress of a background export job
+
+    Public Attributes :
+      * state - One of the JOB state constants of the ExportJobManager
+      * frames_done - Number of frames written so far, including resumed frames
+      * total_frames - Number of frames the export writes
+      * fps - Frames rendered per second by the job; resumed frames are not counted
+      * eta - Estimated seconds until the job completes; None until a frame is rendered
+      * error - Exception which failed the job; None unless the job failed
+      * frames_resumed - Number of frames taken over from the checkpoints of an earlier export
+    """
+
+    state = None
+    frames_done = 0
+    total_frames = 0
+    fps = 0.0
+    eta = None
+    error = None
+    frames_resumed = 0
+
+    #pylint: disable=too-many-arguments
+    def __init__(self, state, frames_done=0, total_frames=0, fps=0.0, eta=None, error=None,
+                 frames_resumed=0):
+        """
+        Constructor
+
+        Parameters :
+          * state - One of the JOB state constants of the ExportJobManager
+          * frames_done - Number of frames written so far
+          * total_frames - Number of frames the export writes
+          * fps - Frames rendered per second by the job
+          * eta - Estimated seconds until the job completes
+          * error - Exception which failed the job
+          * frames_resumed - Number of frames taken over from the checkpoints of an earlier export
+        """
+        self.state = state
+        self.frames_done = frames_done
+        self.total_frames = total_frames
+        self.fps = fps
+        self.eta = eta
+        self.error = error
+        self.frames_resumed = frames_resumed
+
+    def get_fraction(self):
+        """
+        Returns the fraction of frames written between 0.0 and 1.0
+        """
+        if self.total_frames <= 0:
+            return 0.0
+        return min(float(self.frames_done) / self.total_frames, 1.0)
@@ -0,0 +1,44 @@
+"""
+PlotPlayer specific Frame File Parameters Class
+
+Public Classes :
+  * FrameFileParams - Class describing an on disk array of stacked per frame data
+"""
+
+class FrameFileParams(object):
+    """
+    Description of an on disk array of stacked per frame data; the first dimension of the array is
+    the frame number
+
+    Public Attributes :
+      * file_name - Path of a .npy file or raw binary file
+      * dtype - NumPy dtype of a raw binary file; None reads the dtype from the .npy header
+      * shape - Shape of a raw binary file; None reads the shape from the .npy header
+      * offset - Byte offset of the data in a raw binary file
+    """
+
+    file_name = None
+    dtype = None
+    shape = None
+    offset = 0
+
+    def __init__(self, file_name, dtype=None, shape=None, offset=0):
+        """
+        Constructor
+
+        Parameters :
+          * file_name - Path of a .npy file or raw binary file
+          * dtype (optional) - NumPy dtype of a raw binary file
+          * shape (optional) - Shape of a raw binary file
+          * offset (optional) - Byte offset of the data in a raw binary file
+        """
+        self.file_name = file_name
+        self.dtype = dtype
+        self.shape = shape
+        self.offset = offset
+
+    def is_raw(self):
+        """
+        Return a boolean indicating whether the file is raw binary data instead of a .npy file
+        """
+        return self.dtype is not None
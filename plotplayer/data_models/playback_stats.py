@@ -0,0 +1,43 @@
+"""
+PlotPlayer specific Playback Statistics Class
+
+Public Classes :
+  * PlaybackStats - Class containing achieved and target playback rates and dropped frames
+"""
+
+class PlaybackStats(object):
+    """
+    Statistics related to the current or last Animation Playback
+
+    Public Attributes :
+      * target_fps - Frame rate the playback is scheduled at
+      * achieved_fps - Frame rate of the frames actually displayed
+      * displayed_frames - Number of frames displayed since playback began
+      * dropped_frames - Number of frames skipped to keep up with wall clock time
+      * playback_rate - Speed multiplier of the playback; negative for reverse playback
+    """
+
+    target_fps = 0.0
+    achieved_fps = 0.0
+    displayed_frames = 0
+    dropped_frames = 0
+    playback_rate = 1.0
+
+    #pylint: disable=too-many-arguments
+    def __init__(self, target_fps=0.0, achieved_fps=0.0, displayed_frames=0, dropped_frames=0,
+                 playback_rate=1.0):
+        """
+        Constructor
+
+        Parameters :
+          * target_fps - Frame rate the playback is scheduled at
+          * achieved_fps - Frame rate of the frames actually displayed
+          * displayed_frames - Number of frames displayed since playback began
+          * dropped_frames - Number of frames skipped to keep up with wall clock time
+          * playback_rate - Speed multiplier of the playback; negative for reverse playback
+        """
+        self.target_fps = target_fps
+        self.achieved_fps = achieved_fps
+        self.displayed_frames = displayed_frames
+        self.dropped_frames = dropped_frames
+        self.playback_rate = playback_rate
@@ -0,0 +1,70 @@
+"""
+PlotPlayer specific Series Parameters Class and Constants
+
+Public Constants :
+  * SERIES_LINE - Series drawn as a Matplotlib Line2D
+  * SERIES_SCATTER - Series drawn as a Matplotlib PathCollection
+
+Public Classes :
+  * SeriesParams - Class containing the stacked per frame data of a series
+"""
+
+SERIES_LINE = 'line'
+SERIES_SCATTER = 'scatter'
+SERIES_TYPES = [SERIES_LINE, SERIES_SCATTER]
+
+class SeriesParams(object):
+    """
+    Stacked per frame data of a series drawn by an ArrayFrameSource
+
+    Public Attributes :
+      * y_data - Array of shape (frames, points) containing the y values of every frame; scatter
+          series may instead provide stacked x/y offsets of shape (frames, points, 2)
+      * x_data - Array of shape (frames, points) or (points,) containing the x values; a
+          one-dimensional array is shared by every frame; None uses the point indices
+      * series_type - One of the SERIES constants
+      * color_data - Array of shape (frames, points) mapped through the colormap of a scatter
+          series; None keeps a fixed color
+      * plot_kwargs - Dictionary of keyword arguments passed to the Matplotlib plot or scatter
+          method when the artist is created
+      * level_of_detail - Boolean indicating whether a line series with a shared increasing x_data
+          is drawn from a min/max decimation pyramid matching the axes pixel width
+    """
+
+    y_data = None
+    x_data = None
+    series_type = SERIES_LINE
+    color_data = None
+    plot_kwargs = None
+    level_of_detail = False
+
+    #pylint: disable=too-many-arguments
+    def __init__(self, y_data, x_data=None, series_type=SERIES_LINE, color_data=None,
+                 plot_kwargs=None, level_of_detail=False):
+        """
+        Constructor
+
+        Parameters :
+          * y_data - Array of shape (frames, points) containing the y values of every frame
+          * x_data (optional) - Array of shape (frames, points) or (points,) containing the x
+              values
+          * series_type (optional) - One of the SERIES constants
+          * color_data (optional) - Array of shape (frames, points) mapped through the colormap
+              of a scatter series
+          * plot_kwargs (optional) - Dictionary of keyword arguments for the Matplotlib plot or
+              scatter method
+          * level_of_detail (optional) - Boolean indicating whether a line series is drawn from a
+              min/max decimation pyramid
+        """
+        self.y_data = y_data
+        self.x_data = x_data
+        self.series_type = series_type
+        self.color_data = color_data
+        self.plot_kwargs = plot_kwargs if plot_kwargs is not None else {}
+        self.level_of_detail = level_of_detail
+
+    def get_total_frames(self):
+        """
+        Return the number of frames in the series
+        """
+        return self.y_data.shape[0]
@@ -0,0 +1,50 @@
+"""
+PlotPlayer specific Timing Statistics Class
+
+Public Classes :
+  * TimingStats - Class containing percentile summaries of recent durations of a render stage
+"""
+
+class TimingStats(object):
+    """
+    Summary of the recent durations of a render stage; durations are in seconds
+
+    Public Attributes :
+      * stage - One of the STAGE constants of the StatsManager
+      * sample_count - Number of recent durations summarized
+      * mean - Mean duration
+      * p50 - Median duration
+      * p90 - 90th percentile duration
+      * p99 - 99th percentile duration
+      * maximum - Longest duration
+    """
+
+    stage = None
+    sample_count = 0
+    mean = 0.0
+    p50 = 0.0
+    p90 = 0.0
+    p99 = 0.0
+    maximum = 0.0
+
+    #pylint: disable=too-many-arguments
+    def __init__(self, stage, sample_count=0, mean=0.0, p50=0.0, p90=0.0, p99=0.0, maximum=0.0):
+        """
+        Constructor
+
+        Parameters :
+          * stage - One of the STAGE constants of the StatsManager
+          * sample_count - Number of recent durations summarized
+          * mean - Mean duration
+          * p50 - Median duration
+          * p90 - 90th percentile duration
+          * p99 - 99th percentile duration
+          * maximum - Longest duration
+        """
+        self.stage = stage
+        self.sample_count = sample_count
+        self.mean = mean
+        self.p50 = p50
+        self.p90 = p90
+        self.p99 = p99
+        self.maximum = maximum
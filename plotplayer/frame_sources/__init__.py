@@ -0,0 +1,11 @@
+"""
+PlotPlayer FrameSources Subpackage contains various modules and classes which render frames from
+data instead of a user provided render function.  Frame sources are called like render functions
+and additionally provide the total frame count and axis limits of their data.
+
+Public Modules:
+  * array_frame_source - Contains class used to render stacked NumPy arrays
+  * image_frame_source - Contains class used to render image stacks through a single AxesImage
+  * lod_pyramid - Contains class used to decimate long line series to the axes pixel width
+  * memmap_frame_source - Contains class used to render stacked arrays memory mapped from files
+"""
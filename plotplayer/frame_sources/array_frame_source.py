@@ -0,0 +1,301 @@
+"""
+PlotPlayer specific Array Frame Source Methods and Classes
+
+Public Constants:
+  * LIMIT_MARGIN - Fraction of the data range added around derived axis limits
+
+Public Classes:
+  * ArrayFrameSource - Render function drawing stacked NumPy arrays without per frame callbacks
+
+Public Methods:
+  * get_data_limits - Returns the padded minimum and maximum of one or more arrays
+"""
+
+import weakref
+
+import numpy
+
+from ..data_models.series_params import SeriesParams, SERIES_LINE, SERIES_SCATTER, SERIES_TYPES
+from ..validators import type_validation
+from .lod_pyramid import LodPyramid
+
+LIMIT_MARGIN = 0.05
+
+FRAME_COUNT_MESSAGE = 'All series must contain the same number of frames'
+LEVEL_OF_DETAIL_MESSAGE = 'Level of detail is only supported for line series'
+LEVEL_OF_DETAIL_MEMMAP_MESSAGE = ('Level of detail is not supported for memory mapped series; its '
+                                  'pyramid would be built in memory')
+
+def get_data_limits(arrays, margin=LIMIT_MARGIN):
+    """
+    Returns the minimum and maximum of one or more arrays, ignoring NaNs and padded by a fraction
+      of the data range
+
+    Parameters:
+      * arrays - An iterable of NumPy arrays
+      * margin (optional) - Fraction of the data range added on each side
+    """
+    minimum = min(float(numpy.nanmin(array)) for array in arrays)
+    maximum = max(float(numpy.nanmax(array)) for array in arrays)
+
+    padding = (maximum - minimum) * margin
+    if padding == 0:
+        padding = 0.5
+    return [minimum - padding, maximum + padding]
+
+def _has_stacked_offsets(series_params):
+    """
+    Returns a boolean indicating whether a scatter series provides (frames, points, 2) offsets
+    """
+    return series_params.series_type == SERIES_SCATTER and series_params.y_data.ndim == 3
+
+class ArrayFrameSource(object):
+    """
+    Render function drawing stacked per frame arrays
+
+    The artists of every series are created once per axes; each frame only hands views of the
+    stacked arrays to set_data, set_offsets and set_array, so no per frame arrays are built.
+    Axes are only weakly referenced, so the headless figures of finished exports are freed.
+    Instances are called like any other render function and return their artists so the
+    RenderManager blits only them.
+
+    Line series with level_of_detail enabled are drawn from a LodPyramid; the level and visible
+    slice are chosen again whenever the x-axis limits change (ie. toolbar zoom).
+
+    Public Methods:
+      * get_total_frames - Returns the number of frames in the data
+      * get_limits - Returns x-axis and y-axis limits covering every frame
+      * get_series - Returns the SeriesParams drawn by the source
+    """
+
+    _series = None
+    _x_data = None
+    _y_data = None
+    _offsets = None
+    _offset_buffers = None
+    _pyramids = None
+    _artists = None
+    _frame_nums = None
+
+    def __init__(self, series):
+        """
+        Constructor
+
+        Parameters:
+          * series - Instance of SeriesParams or a list of SeriesParams instances
+        """
+        if isinstance(series, SeriesParams):
+            series = [series]
+        self._series = list(series)
+
+        total_frames = self._series[0].get_total_frames()
+        for series_params in self._series:
+            type_validation.assert_is_in(series_params.series_type, SERIES_TYPES, 'series_type')
+            assert series_params.get_total_frames() == total_frames, FRAME_COUNT_MESSAGE
+            assert (not series_params.level_of_detail or
+                    series_params.series_type == SERIES_LINE), LEVEL_OF_DETAIL_MESSAGE
+            assert (not series_params.level_of_detail or
+                    not isinstance(series_params.y_data, numpy.memmap)), \
+                LEVEL_OF_DETAIL_MEMMAP_MESSAGE
+
+        self._x_data = [self._get_x_data(series_params) for series_params in self._series]
+        self._y_data = [self._get_y_data(series_params) for series_params in self._series]
+        self._offsets = [self._get_offsets(series_params, x_data)
+                         for series_params, x_data in zip(self._series, self._x_data)]
+        self._offset_buffers = [None] * len(self._series)
+        self._pyramids = [LodPyramid(x_data, series_params.y_data)
+                          if series_params.level_of_detail else None
+                          for series_params, x_data in zip(self._series, self._x_data)]
+        self._artists = weakref.WeakKeyDictionary()
+        self._frame_nums = weakref.WeakKeyDictionary()
+
+    def __call__(self, frame_num, axes):
+        """
+        Render a frame onto an axes
+
+        Parameters:
+          * frame_num - The frame number to render
+          * axes - The Matplotlib Axes to render onto
+
+        Returns the list of artists drawn
+        """
+        self._frame_nums[axes] = frame_num
+        artists = self._get_artists(axes)
+        if artists is None:
+            artists = [self._create_artist(axes, index, frame_num)
+                       for index in range(len(self._series))]
+            # Artists reference their axes, so only weak references keep the axes collectable
+            self._artists[axes] = [weakref.ref(artist) for artist in artists]
+            if any(self._pyramids):
+                axes.callbacks.connect('xlim_changed', self._handle_xlim_changed)
+            return artists
+
+        for index, artist in enumerate(artists):
+            self._update_artist(artist, index, frame_num)
+        return artists
+
+    def __getstate__(self):
+        """
+        Returns the picklable state; artists belong to the process which created them
+        """
+        state = self.__dict__.copy()
+        state['_artists'] = None
+        state['_frame_nums'] = None
+        return state
+
+    def __setstate__(self, state):
+        """
+        Restores the picklable state with empty per axes state
+        """
+        self.__dict__.update(state)
+        self._artists = weakref.WeakKeyDictionary()
+        self._frame_nums = weakref.WeakKeyDictionary()
+
+    def get_total_frames(self):
+        """
+        Returns the number of frames in the data
+        """
+        return self._series[0].get_total_frames()
+
+    def get_limits(self):
+        """
+        Returns a tuple of x-axis and y-axis limits covering the data of every frame
+        """
+        x_limits = get_data_limits(self._x_data)
+        y_limits = get_data_limits(self._y_data)
+        return x_limits, y_limits
+
+    def get_series(self):
+        """
+        Returns the list of SeriesParams drawn by the source
+        """
+        return self._series
+
+    def _get_artists(self, axes):
+        """
+        Returns the artists created on an axes or None if they were never created or have since
+          been removed from it (ie. the axes was cleared)
+        """
+        artist_refs = self._artists.get(axes)
+        if artist_refs is None:
+            return None
+
+        artists = [artist_ref() for artist_ref in artist_refs]
+        if any(artist is None or artist.axes is not axes for artist in artists):
+            return None
+        return artists
+
+    def _create_artist(self, axes, index, frame_num):
+        """
+        Create the artist of a series for the first rendered frame
+        """
+        series_params = self._series[index]
+        if series_params.series_type == SERIES_SCATTER:
+            offsets = self._get_frame_offsets(index, frame_num)
+            colors = None
+            if series_params.color_data is not None:
+                colors = series_params.color_data[frame_num]
+            return axes.scatter(offsets[:, 0], offsets[:, 1], c=colors,
+                                **series_params.plot_kwargs)
+
+        x_data, y_data = self._get_line_data(axes, index, frame_num)
+        line, = axes.plot(x_data, y_data, **series_params.plot_kwargs)
+        return line
+
+    def _update_artist(self, artist, index, frame_num):
+        """
+        Update the artist of a series with views of the frame data
+        """
+        series_params = self._series[index]
+        if series_params.series_type == SERIES_SCATTER:
+            artist.set_offsets(self._get_frame_offsets(index, frame_num))
+            if series_params.color_data is not None:
+                artist.set_array(series_params.color_data[frame_num])
+            return
+
+        artist.set_data(*self._get_line_data(artist.axes, index, frame_num))
+
+    def _get_line_data(self, axes, index, frame_num):
+        """
+        Returns views of the x and y values of a line series for a frame; level of detail series
+          are decimated to the current x-axis limits and pixel width of the axes
+        """
+        pyramid = self._pyramids[index]
+        if pyramid is not None:
+            return pyramid.get_frame_data(frame_num, axes.get_xlim(), axes.bbox.width)
+        return self._get_frame_x(index, frame_num), self._series[index].y_data[frame_num]
+
+    def _handle_xlim_changed(self, axes):
+        """
+        Handle Matplotlib xlim_changed events; redraws level of detail series for the new limits
+        """
+        artists = self._get_artists(axes)
+        frame_num = self._frame_nums.get(axes)
+        if artists is None or frame_num is None:
+            return
+
+        for index, artist in enumerate(artists):
+            if self._pyramids[index] is not None:
+                self._update_artist(artist, index, frame_num)
+
+    def _get_frame_offsets(self, index, frame_num):
+        """
+        Returns the (points, 2) offsets of a scatter series for a frame; a view of the stacked
+          offsets, or the x and y values of the frame copied into a buffer reused every frame if
+          the offsets were not stacked up front
+        """
+        offsets = self._offsets[index]
+        if offsets is not None:
+            return offsets[frame_num]
+
+        y_data = self._series[index].y_data[frame_num]
+        offset_buffer = self._offset_buffers[index]
+        if offset_buffer is None:
+            offset_buffer = numpy.empty((len(y_data), 2))
+            self._offset_buffers[index] = offset_buffer
+        offset_buffer[:, 0] = self._get_frame_x(index, frame_num)
+        offset_buffer[:, 1] = y_data
+        return offset_buffer
+
+    def _get_frame_x(self, index, frame_num):
+        """
+        Returns a view of the x values of a series for a frame
+        """
+        x_data = self._x_data[index]
+        if x_data.ndim == 1:
+            return x_data
+        return x_data[frame_num]
+
+    @staticmethod
+    def _get_x_data(series_params):
+        """
+        Returns the x values of a series; point indices are used if none were provided
+        """
+        if _has_stacked_offsets(series_params):
+            return series_params.y_data[..., 0]
+        if series_params.x_data is None:
+            return numpy.arange(series_params.y_data.shape[-1])
+        return numpy.asanyarray(series_params.x_data)
+
+    @staticmethod
+    def _get_y_data(series_params):
+        """
+        Returns the y values of a series
+        """
+        if _has_stacked_offsets(series_params):
+            return series_params.y_data[..., 1]
+        return series_params.y_data
+
+    @staticmethod
+    def _get_offsets(series_params, x_data):
+        """
+        Returns the (frames, points, 2) offsets of a scatter series, stacked once up front so
+          each frame is a view; None for other series types
+        """
+        if series_params.series_type != SERIES_SCATTER:
+            return None
+        if _has_stacked_offsets(series_params):
+            return series_params.y_data
+
+        y_data = series_params.y_data
+        return numpy.stack((numpy.broadcast_to(x_data, y_data.shape), y_data), axis=-1)
@@ -0,0 +1,151 @@
+"""
+PlotPlayer specific Image Frame Source Methods and Classes
+
+Public Constants:
+  * DEFAULT_INTERPOLATION - Default interpolation of the AxesImage
+
+Public Classes:
+  * ImageFrameSource - Render function swapping the frames of an image stack into a single
+      AxesImage
+"""
+
+import weakref
+
+import numpy
+from matplotlib.colors import Normalize
+
+from .memmap_frame_source import LIMITS_CHUNK_FRAMES
+
+DEFAULT_INTERPOLATION = 'nearest'
+
+IMAGE_SHAPE_MESSAGE = 'images must be of shape (frames, rows, columns[, 3 or 4])'
+
+class ImageFrameSource(object):
+    """
+    Render function swapping the frames of an image stack into a single AxesImage
+
+    The AxesImage is created once per axes with a fixed normalization and extent; each frame only
+    hands a view of the image stack to set_data, so the stack may be a numpy.memmap and integer
+    images (ie. uint8, uint16) are never converted to float64 by the frame source.  The AxesImage
+    is returned so the RenderManager blits only the image.  Axes are only weakly referenced, so
+    the headless figures of finished exports are freed.
+
+    Public Methods:
+      * get_total_frames - Returns the number of frames in the image stack
+      * get_limits - Returns x-axis and y-axis limits matching the image extent
+      * get_norm - Returns the fixed normalization of the image values
+    """
+
+    _images = None
+    _norm = None
+    _extent = None
+    _imshow_kwargs = None
+    _artists = None
+
+    #pylint: disable=too-many-arguments
+    def __init__(self, images, vmin=None, vmax=None, extent=None,
+                 interpolation=DEFAULT_INTERPOLATION, imshow_kwargs=None):
+        """
+        Constructor
+
+        Parameters:
+          * images - Array or numpy.memmap of shape (frames, rows, columns) or
+              (frames, rows, columns, 3 or 4)
+          * vmin (optional) - Value mapped to the bottom of the colormap; defaults to the minimum
+              of the dtype for integer images and the data minimum otherwise
+          * vmax (optional) - Value mapped to the top of the colormap; defaults to the maximum
+              of the dtype for integer images and the data maximum otherwise
+          * extent (optional) - [ left, right, bottom, top ] of the image in data coordinates
+          * interpolation (optional) - Interpolation of the AxesImage
+          * imshow_kwargs (optional) - Dictionary of keyword arguments for the Matplotlib imshow
+              method
+        """
+        assert images.ndim in (3, 4), IMAGE_SHAPE_MESSAGE
+        self._images = images
+
+        if vmin is None or vmax is None:
+            default_vmin, default_vmax = _get_value_range(images)
+            vmin = default_vmin if vmin is None else vmin
+            vmax = default_vmax if vmax is None else vmax
+        self._norm = Normalize(vmin, vmax)
+
+        rows, columns = images.shape[1:3]
+        if extent is None:
+            extent = [-0.5, columns - 0.5, rows - 0.5, -0.5]
+        self._extent = list(extent)
+
+        self._imshow_kwargs = dict(imshow_kwargs) if imshow_kwargs is not None else {}
+        self._imshow_kwargs.setdefault('interpolation', interpolation)
+        self._artists = weakref.WeakKeyDictionary()
+
+    def __call__(self, frame_num, axes):
+        """
+        Render a frame onto an axes
+
+        Parameters:
+          * frame_num - The frame number to render
+          * axes - The Matplotlib Axes to render onto
+
+        Returns a list containing the AxesImage
+        """
+        image_ref = self._artists.get(axes)
+        image = None if image_ref is None else image_ref()
+        if image is None or image.axes is not axes:
+            image = axes.imshow(self._images[frame_num], norm=self._norm, extent=self._extent,
+                                aspect='auto', **self._imshow_kwargs)
+            # The image references its axes, so only a weak reference keeps the axes collectable
+            self._artists[axes] = weakref.ref(image)
+        else:
+            image.set_data(self._images[frame_num])
+        return [image]
+
+    def __getstate__(self):
+        """
+        Returns the picklable state; artists belong to the process which created them
+        """
+        state = self.__dict__.copy()
+        state['_artists'] = None
+        return state
+
+    def __setstate__(self, state):
+        """
+        Restores the picklable state with empty per axes state
+        """
+        self.__dict__.update(state)
+        self._artists = weakref.WeakKeyDictionary()
+
+    def get_total_frames(self):
+        """
+        Returns the number of frames in the image stack
+        """
+        return self._images.shape[0]
+
+    def get_limits(self):
+        """
+        Returns a tuple of x-axis and y-axis limits matching the image extent
+        """
+        left, right, bottom, top = self._extent
+        return [left, right], [bottom, top]
+
+    def get_norm(self):
+        """
+        Returns the fixed Normalize instance of the image values
+        """
+        return self._norm
+
+def _get_value_range(images):
+    """
+    Returns the minimum and maximum image values; the dtype range for integer images and the data
+      range, scanned in chunks of frames, otherwise
+    """
+    if numpy.issubdtype(images.dtype, numpy.integer):
+        dtype_info = numpy.iinfo(images.dtype)
+        return dtype_info.min, dtype_info.max
+
+    minimum = numpy.inf
+    maximum = -numpy.inf
+    for first_frame_num in range(0, images.shape[0], LIMITS_CHUNK_FRAMES):
+        chunk = images[first_frame_num:first_frame_num + LIMITS_CHUNK_FRAMES]
+        minimum = min(minimum, float(numpy.nanmin(chunk)))
+        maximum = max(maximum, float(numpy.nanmax(chunk)))
+    return minimum, maximum
@@ -0,0 +1,125 @@
+"""
+PlotPlayer specific Level of Detail Pyramid Methods and Classes
+
+Public Constants:
+  * MIN_DECIMATION_POINTS - Number of points below which no decimated levels are built
+  * MIN_LEVEL_BUCKETS - Number of buckets below which no coarser levels are built
+  * POINTS_PER_PIXEL - Minimum number of points drawn per pixel column of the axes
+
+Public Classes:
+  * LodPyramid - Min/Max decimation pyramid of a stacked line series
+"""
+
+import numpy
+
+MIN_DECIMATION_POINTS = 4096
+MIN_LEVEL_BUCKETS = 16
+POINTS_PER_PIXEL = 4
+
+MONOTONIC_MESSAGE = 'x_data must be one-dimensional and increasing for level of detail series'
+
+class LodPyramid(object):
+    """
+    Min/Max decimation pyramid of a stacked (frames, points) line series sharing one increasing
+    x-axis
+
+    Every level halves the number of buckets of the previous level, down to a handful of buckets,
+    so the level drawn is sized by the pixel width of the axes alone.  Each bucket keeps the
+    minimum and maximum of the points it covers, interleaved and drawn at the x value of the first
+    point, so the drawn line always reaches the exact extremes of every bucket.  Levels are
+    computed once with vectorized reductions over every frame; each frame and view is then a
+    slice of the precomputed arrays.
+
+    Public Methods:
+      * get_level_count - Returns the number of levels including the full resolution level
+      * get_frame_data - Returns views of the x and y values to draw for a frame, x-axis limits
+          and pixel width
+    """
+
+    _x_data = None
+    _y_data = None
+    _level_starts = None
+    _level_x = None
+    _level_y = None
+
+    def __init__(self, x_data, y_data, min_points=MIN_DECIMATION_POINTS,
+                 min_buckets=MIN_LEVEL_BUCKETS):
+        """
+        Constructor
+
+        Parameters:
+          * x_data - Increasing array of shape (points,)
+          * y_data - Array of shape (frames, points)
+          * min_points (optional) - Number of points below which no decimated levels are built
+          * min_buckets (optional) - Number of buckets below which no further levels are built
+        """
+        x_data = numpy.asanyarray(x_data)
+        assert x_data.ndim == 1 and numpy.all(numpy.diff(x_data) >= 0), MONOTONIC_MESSAGE
+        self._x_data = x_data
+        self._y_data = y_data
+
+        self._level_starts = [numpy.arange(x_data.shape[0])]
+        self._level_x = [x_data]
+        self._level_y = [y_data]
+
+        y_min = y_data
+        y_max = y_data
+        starts = self._level_starts[0]
+        if starts.shape[0] < min_points:
+            return
+        while starts.shape[0] // 2 >= min_buckets:
+            pair_starts = numpy.arange(0, starts.shape[0], 2)
+            y_min = numpy.minimum.reduceat(y_min, pair_starts, axis=-1)
+            y_max = numpy.maximum.reduceat(y_max, pair_starts, axis=-1)
+            starts = starts[pair_starts]
+
+            level_y = numpy.empty(y_min.shape[:-1] + (2 * y_min.shape[-1],), y_min.dtype)
+            level_y[..., 0::2] = y_min
+            level_y[..., 1::2] = y_max
+
+            self._level_starts.append(starts)
+            self._level_x.append(numpy.repeat(x_data[starts], 2))
+            self._level_y.append(level_y)
+
+    def get_level_count(self):
+        """
+        Returns the number of levels including the full resolution level
+        """
+        return len(self._level_y)
+
+    def get_frame_data(self, frame_num, x_limits, pixel_width):
+        """
+        Returns views of the x and y values to draw for a frame
+
+        The coarsest level which still draws at least POINTS_PER_PIXEL points per pixel column
+        inside the x-axis limits is chosen and only the buckets inside the limits are returned.
+
+        Parameters:
+          * frame_num - The frame number to draw
+          * x_limits - The current x-axis limits of the axes
+          * pixel_width - The current width of the axes in pixels
+        """
+        x_start = min(x_limits)
+        x_end = max(x_limits)
+        first_point = max(numpy.searchsorted(self._x_data, x_start, 'right') - 1, 0)
+        last_point = numpy.searchsorted(self._x_data, x_end, 'left') + 1
+        visible_points = max(last_point - first_point, 1)
+
+        level = 0
+        bucket_size = 1
+        # Every bucket draws its minimum and maximum
+        min_buckets = max(POINTS_PER_PIXEL * pixel_width / 2, 1)
+        while (level + 1 < len(self._level_y) and
+               visible_points // (bucket_size * 2) >= min_buckets):
+            level += 1
+            bucket_size *= 2
+
+        if level == 0:
+            return (self._x_data[first_point:last_point],
+                    self._y_data[frame_num, first_point:last_point])
+
+        starts = self._level_starts[level]
+        first_bucket = max(numpy.searchsorted(starts, first_point, 'right') - 1, 0)
+        last_bucket = numpy.searchsorted(starts, last_point, 'left') + 1
+        return (self._level_x[level][2 * first_bucket:2 * last_bucket],
+                self._level_y[level][frame_num, 2 * first_bucket:2 * last_bucket])
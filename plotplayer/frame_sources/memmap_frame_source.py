@@ -0,0 +1,210 @@
+"""
+PlotPlayer specific Memory Mapped Frame Source Methods and Classes
+
+Public Constants:
+  * DEFAULT_READ_AHEAD - Default number of frames read ahead of the playhead
+  * DEFAULT_READ_BEHIND - Default number of frames kept resident behind the playhead
+  * LIMITS_CHUNK_FRAMES - Number of frames scanned at once when deriving axis limits
+
+Public Classes:
+  * MemmapFrameSource - Render function drawing stacked on disk arrays with bounded resident
+      memory
+"""
+
+import numpy
+
+from ..data_models.frame_file_params import FrameFileParams
+from ..data_models.series_params import SeriesParams
+from ..helpers import memmap_helper
+from .array_frame_source import (ArrayFrameSource, LIMIT_MARGIN, LEVEL_OF_DETAIL_MEMMAP_MESSAGE,
+                                 _has_stacked_offsets)
+
+DEFAULT_READ_AHEAD = 64
+DEFAULT_READ_BEHIND = 8
+LIMITS_CHUNK_FRAMES = 256
+
+_SERIES_DATA_ATTRIBUTES = ['y_data', 'x_data', 'color_data']
+
+class MemmapFrameSource(ArrayFrameSource):
+    """
+    Render function drawing stacked per frame arrays which are memory mapped from .npy or raw
+    binary files
+
+    Frames are read lazily from the mapped files.  Each rendered frame reads ahead a window of
+    upcoming frames and releases the resident pages of frames which fell behind the window, so
+    resident memory stays bounded regardless of the recording length.  Instances are picklable;
+    worker processes map the same files.  Scatter series given as separate x and y files have the
+    offsets of each frame copied into a reused buffer as it is drawn; stacked (frames, points, 2)
+    offsets are drawn from the mapped file directly.
+
+    Public Methods:
+      * get_total_frames - Returns the number of frames in the data
+      * get_limits - Returns x-axis and y-axis limits covering every frame
+      * get_series - Returns the SeriesParams drawn by the source
+      * get_read_ahead - Returns the number of frames read ahead of the playhead
+      * set_read_ahead - Sets the number of frames read ahead of the playhead
+    """
+
+    _series_files = None
+    _mappings = None
+    _limits = None
+    _read_ahead = None
+    _read_behind = None
+    _window = None
+
+    def __init__(self, series, read_ahead=DEFAULT_READ_AHEAD, read_behind=DEFAULT_READ_BEHIND,
+                 limits=None):
+        """
+        Constructor
+
+        Parameters:
+          * series - Instance of SeriesParams or a list of SeriesParams instances whose data
+              attributes are FrameFileParams instances (or in memory arrays)
+          * read_ahead (optional) - Number of frames read ahead of the playhead
+          * read_behind (optional) - Number of frames kept resident behind the playhead
+          * limits (optional) - Tuple of x-axis and y-axis limits; derived by scanning the files
+              in chunks if omitted
+        """
+        if isinstance(series, SeriesParams):
+            series = [series]
+        self._series_files = list(series)
+        for series_params in self._series_files:
+            assert not series_params.level_of_detail, LEVEL_OF_DETAIL_MEMMAP_MESSAGE
+        self._read_ahead = read_ahead
+        self._read_behind = read_behind
+        self._limits = limits
+        self._window = None
+
+        self._mappings = []
+        mapped_series = [self._map_series(series_params) for series_params in self._series_files]
+        super(MemmapFrameSource, self).__init__(mapped_series)
+
+    def __call__(self, frame_num, axes):
+        """
+        Render a frame onto an axes after moving the resident window to the frame
+
+        Parameters:
+          * frame_num - The frame number to render
+          * axes - The Matplotlib Axes to render onto
+
+        Returns the list of artists drawn
+        """
+        self._move_window(frame_num)
+        return super(MemmapFrameSource, self).__call__(frame_num, axes)
+
+    def __getstate__(self):
+        """
+        Returns the picklable state; the files are mapped again when unpickled
+        """
+        return {'series': self._series_files, 'read_ahead': self._read_ahead,
+                'read_behind': self._read_behind, 'limits': self._limits}
+
+    def __setstate__(self, state):
+        """
+        Restore the state of a pickled instance by mapping its files again
+        """
+        self.__init__(state['series'], state['read_ahead'], state['read_behind'],
+                      state['limits'])
+
+    def get_limits(self):
+        """
+        Returns a tuple of x-axis and y-axis limits covering the data of every frame; the files
+          are scanned in chunks of frames whose pages are released afterwards
+        """
+        if self._limits is None:
+            x_limits = _get_chunked_limits(self._x_data)
+            y_limits = _get_chunked_limits(self._y_data)
+            self._limits = (x_limits, y_limits)
+
+            for mmap_object, _, _ in self._mappings:
+                memmap_helper.advise(mmap_object, 0, len(mmap_object), False)
+            self._window = None
+        return self._limits
+
+    def get_read_ahead(self):
+        """
+        Returns the number of frames read ahead of the playhead
+        """
+        return self._read_ahead
+
+    def set_read_ahead(self, read_ahead):
+        """
+        Set the number of frames read ahead of the playhead
+        """
+        self._read_ahead = read_ahead
+
+    @staticmethod
+    def _get_offsets(series_params, x_data):
+        """
+        Returns the mapped (frames, points, 2) offsets of a scatter series providing them; None
+          otherwise, since stacking separate x and y files would read the whole recording
+        """
+        if _has_stacked_offsets(series_params):
+            return series_params.y_data
+        return None
+
+    def _map_series(self, series_params):
+        """
+        Returns a copy of a SeriesParams with its FrameFileParams replaced by mapped arrays
+        """
+        data = {}
+        for attribute in _SERIES_DATA_ATTRIBUTES:
+            value = getattr(series_params, attribute)
+            if isinstance(value, FrameFileParams):
+                mmap_object, array, offset = memmap_helper.open_frame_file(value)
+                if array.ndim > 1 and array.flags.c_contiguous:
+                    self._mappings.append((mmap_object, array, offset))
+                value = array
+            data[attribute] = value
+
+        return SeriesParams(data['y_data'], data['x_data'], series_params.series_type,
+                            data['color_data'], series_params.plot_kwargs)
+
+    def _move_window(self, frame_num):
+        """
+        Read ahead the frames of the new resident window and release the pages of frames which
+          fell out of the previous window
+        """
+        last_frame_num = self.get_total_frames() - 1
+        window = (max(frame_num - self._read_behind, 0),
+                  min(frame_num + self._read_ahead, last_frame_num))
+        if window == self._window:
+            return
+
+        released_ranges = []
+        if self._window is not None:
+            previous_first, previous_last = self._window
+            if previous_first < window[0]:
+                released_ranges.append((previous_first, min(previous_last, window[0] - 1)))
+            if previous_last > window[1]:
+                released_ranges.append((max(previous_first, window[1] + 1), previous_last))
+
+        for mmap_object, array, offset in self._mappings:
+            for first_frame_num, last_frame_num in released_ranges:
+                start, length = memmap_helper.get_frame_byte_range(array, offset, first_frame_num,
+                                                                   last_frame_num)
+                memmap_helper.advise(mmap_object, start, length, False)
+
+            start, length = memmap_helper.get_frame_byte_range(array, offset, frame_num,
+                                                               window[1])
+            memmap_helper.advise(mmap_object, start, length, True)
+
+        self._window = window
+
+def _get_chunked_limits(arrays):
+    """
+    Returns the padded minimum and maximum of arrays, scanning frame stacked arrays in chunks of
+      frames
+    """
+    minimum = numpy.inf
+    maximum = -numpy.inf
+    for array in arrays:
+        for first_frame_num in range(0, array.shape[0], LIMITS_CHUNK_FRAMES):
+            chunk = array[first_frame_num:first_frame_num + LIMITS_CHUNK_FRAMES]
+            minimum = min(minimum, float(numpy.nanmin(chunk)))
+            maximum = max(maximum, float(numpy.nanmax(chunk)))
+
+    padding = (maximum - minimum) * LIMIT_MARGIN
+    if padding == 0:
+        padding = 0.5
+    return [minimum - padding, maximum + padding]
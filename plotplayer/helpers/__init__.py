@@ -4,5 +4,9 @@ ease development.
 
 Public Modules:
   * file_helper - Contains methods for interacting with the local file system
+  * headless_helper - Contains methods for rendering frames on headless Agg canvases
+  * html_helper - Contains methods for streaming animations into HTML documents
+  * memmap_helper - Contains methods for memory mapping frame data and managing resident pages
+  * raster_helper - Contains methods for reading and writing canvas pixel buffers
   * ui_helper - Contains methods for providing generic UI elements & dialogs
 """
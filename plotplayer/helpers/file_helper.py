@@ -2,7 +2,13 @@
 Simple helper functions for File Operations
 """
 
+import hashlib
+import os
+
 WRITE_FILE_MODE = 'w'
+READ_BINARY_MODE = 'rb'
+TEMPORARY_FILE_SUFFIX = '.tmp'
+HASH_CHUNK_BYTES = 2 ** 20
 
 def save_file(file_name, data):
     """
@@ -11,3 +17,22 @@ def save_file(file_name, data):
     file = open(file_name, WRITE_FILE_MODE)
     file.write(data)
     file.close()
+
+def save_file_atomic(file_name, data):
+    """
+    Function to save data to a file by writing a temporary file next to it and renaming it over
+      the file; readers see either the old or the new contents, never a partial file
+    """
+    temporary_file_name = file_name + TEMPORARY_FILE_SUFFIX
+    save_file(temporary_file_name, data)
+    os.replace(temporary_file_name, file_name)
+
+def get_file_sha256(file_name):
+    """
+    Function returning the hex SHA-256 digest of a file; the file is read in chunks
+    """
+    file_hash = hashlib.sha256()
+    with open(file_name, READ_BINARY_MODE) as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_BYTES), b''):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
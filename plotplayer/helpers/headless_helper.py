@@ -0,0 +1,132 @@
+"""
+Simple helper functions for rendering Animation frames on headless Agg canvases
+"""
+
+from . import raster_helper
+
+# Render function and headless canvas of a worker process; set once by the pool initializer
+_WORKER_STATE = {}
+
+def create_agg_figure(figure_size, dpi=None):
+    """
+    Creates a Figure with an Agg canvas; the figure is not registered with pyplot and needs no
+      GUI toolkit
+
+    Parameters:
+      * figure_size - Tuple of the figure width and height in inches
+      * dpi (optional) - Dots per inch of the figure; defaults to the Matplotlib default
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    figure = Figure(figsize=figure_size, dpi=dpi)
+    FigureCanvasAgg(figure)
+    return figure
+
+def create_headless_figure(canvas_params):
+    """
+    Creates a Figure with an Agg canvas and an Animation Axes matching the canvas parameters;
+      the figure is not registered with pyplot and needs no GUI toolkit
+
+    Parameters:
+      * canvas_params - Instance of CanvasParams
+
+    Returns a tuple of the figure and its Animation Axes
+    """
+    figure = create_agg_figure(canvas_params.figure_size, canvas_params.dpi)
+    animation_axes = figure.add_axes(canvas_params.animation_axes_rect)
+    reset_animation_axes(animation_axes, canvas_params)
+
+    return figure, animation_axes
+
+def reset_animation_axes(animation_axes, canvas_params):
+    """
+    Clears an Animation Axes and applies the axis visibility and limits of the canvas parameters
+    """
+    animation_axes.clear()
+    if not canvas_params.axis_visible:
+        animation_axes.set_axis_off()
+
+    x_limits = canvas_params.animation_x_limits
+    y_limits = canvas_params.animation_y_limits
+    if x_limits is None or y_limits is None:
+        animation_axes.autoscale(True)
+    else:
+        animation_axes.autoscale(False)
+        animation_axes.set_xlim(x_limits)
+        animation_axes.set_ylim(y_limits)
+
+def has_drawn_artists(axes):
+    """
+    Returns a boolean indicating whether anything was drawn onto an axes; render functions which
+      ignore the axes they are given draw nothing onto headless axes
+    """
+    return bool(axes.lines or axes.collections or axes.images or axes.patches or axes.texts or
+                axes.artists or axes.tables)
+
+def render_frame(figure, animation_axes, render_func, frame_num):
+    """
+    Renders a frame through the external render function and draws the headless canvas
+
+    Parameters:
+      * figure - Headless figure as returned by create_headless_figure
+      * animation_axes - Animation Axes of the headless figure
+      * render_func - The external render function
+      * frame_num - The frame number to render
+    """
+    figure.sca(animation_axes)
+    render_func(frame_num, animation_axes)
+    figure.canvas.draw()
+
+def render_frame_png(figure, animation_axes, render_func, frame_num, png_file):
+    """
+    Renders a frame on a headless canvas and writes the whole canvas to a file as PNG; the
+      rendered buffer is encoded directly without drawing the figure again
+
+    Parameters:
+      * figure - Headless figure as returned by create_headless_figure
+      * animation_axes - Animation Axes of the headless figure
+      * render_func - The external render function
+      * frame_num - The frame number to render
+      * png_file - Binary file object to write the PNG image to
+    """
+    render_frame(figure, animation_axes, render_func, frame_num)
+    write_canvas_png(figure.canvas, png_file)
+
+def write_canvas_png(canvas, png_file):
+    """
+    Writes the rendered buffer of an Agg based canvas to a file as PNG without drawing it again
+    """
+    from matplotlib import image
+
+    image.imsave(png_file, raster_helper.get_canvas_pixels(canvas), format='png')
+
+def render_frame_pixels(figure, animation_axes, render_func, frame_num):
+    """
+    Renders a frame on a headless canvas and returns a copy of the Animation Axes pixels
+    """
+    render_frame(figure, animation_axes, render_func, frame_num)
+    return raster_helper.copy_region(figure.canvas, animation_axes.bbox)
+
+def initialize_worker(canvas_params, render_func):
+    """
+    Worker process pool initializer; builds the headless canvas the worker renders every frame on
+      so the render function and canvas parameters are sent to each worker only once
+
+    Parameters:
+      * canvas_params - Instance of CanvasParams describing the canvas to render on
+      * render_func - The external render function
+    """
+    figure, animation_axes = create_headless_figure(canvas_params)
+    _WORKER_STATE['render_func'] = render_func
+    _WORKER_STATE['figure'] = figure
+    _WORKER_STATE['animation_axes'] = animation_axes
+
+def render_worker_frame(frame_num):
+    """
+    Renders a frame on the headless canvas of a worker process set up by initialize_worker
+
+    Returns a copy of the rendered Animation Axes pixels
+    """
+    return render_frame_pixels(_WORKER_STATE['figure'], _WORKER_STATE['animation_axes'],
+                               _WORKER_STATE['render_func'], frame_num)
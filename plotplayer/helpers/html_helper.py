@@ -0,0 +1,233 @@
+"""
+Simple helper functions for writing HTML documents embedding an Animation
+
+The documents are written to an open text file piece by piece; frames and video are base64
+encoded and appended as they are produced so memory use does not grow with the animation length.
+"""
+
+import base64
+import html
+import uuid
+
+# Multiple of 3 bytes so every chunk encodes to base64 without padding and chunks can be appended
+BASE64_CHUNK_BYTES = 3 * 2 ** 16
+
+VIDEO_HEADER = ('<video width="{width}" height="{height}" controls autoplay loop>\n'
+                '  <source type="{mime_type}" src="data:{mime_type};base64,')
+VIDEO_FOOTER = ('">\n'
+                '  Your browser does not support the video tag.\n'
+                '</video>\n')
+
+JAVASCRIPT_HEADER = '''<div class="plotplayer" id="{player_id}">
+  <img id="{player_id}_image" width="{width}" height="{height}">
+  <div>
+    <input id="{player_id}_slider" type="range" min="0" max="0" value="0" style="width: {width}px">
+  </div>
+  <div>
+    <button id="{player_id}_first">|&lt;</button>
+    <button id="{player_id}_previous">&lt;</button>
+    <button id="{player_id}_play">Play</button>
+    <button id="{player_id}_next">&gt;</button>
+    <button id="{player_id}_last">&gt;|</button>
+  </div>
+</div>
+<script>
+var {player_id}_frames = [];
+'''
+JAVASCRIPT_FRAME = '{player_id}_frames.push("data:{mime_type};base64,'
+JAVASCRIPT_FRAME_END = '");\n'
+JAVASCRIPT_FOOTER = '''</script>
+<script>
+(function () {{
+  var frames = {player_id}_frames;
+  var image = document.getElementById("{player_id}_image");
+  var slider = document.getElementById("{player_id}_slider");
+  var playButton = document.getElementById("{player_id}_play");
+  var frameNum = 0;
+  var timer = null;
+
+  function show(newFrameNum) {{
+    frameNum = Math.min(Math.max(newFrameNum, 0), frames.length - 1);
+    image.src = frames[frameNum];
+    slider.value = frameNum;
+  }}
+  function stop() {{
+    clearInterval(timer);
+    timer = null;
+    playButton.textContent = "Play";
+  }}
+  function play() {{
+    if (frameNum >= frames.length - 1) {{
+      show(0);
+    }}
+    playButton.textContent = "Pause";
+    timer = setInterval(function () {{
+      if (frameNum >= frames.length - 1) {{
+        stop();
+      }} else {{
+        show(frameNum + 1);
+      }}
+    }}, {interval});
+  }}
+
+  slider.max = frames.length - 1;
+  slider.oninput = function () {{ stop(); show(parseInt(slider.value, 10)); }};
+  playButton.onclick = function () {{ if (timer === null) {{ play(); }} else {{ stop(); }} }};
+  document.getElementById("{player_id}_first").onclick = function () {{ stop(); show(0); }};
+  document.getElementById("{player_id}_previous").onclick = function () {{
+    stop(); show(frameNum - 1);
+  }};
+  document.getElementById("{player_id}_next").onclick = function () {{
+    stop(); show(frameNum + 1);
+  }};
+  document.getElementById("{player_id}_last").onclick = function () {{
+    stop(); show(frames.length - 1);
+  }};
+  show(0);
+}})();
+</script>
+'''
+
+STREAM_PAGE = '''<!DOCTYPE html>
+<html>
+<head><title>{title}</title></head>
+<body>
+<div class="plotplayer">
+  <img id="frame" src="{stream_path}" width="{width}" height="{height}">
+  <div>
+    <input id="slider" type="range" min="{min_frame}" max="{max_frame}" value="{min_frame}"
+           style="width: {width}px">
+  </div>
+  <div>
+    <button onclick="command('seek', {min_frame})">|&lt;</button>
+    <button onclick="command('step', -1)">&lt;</button>
+    <button onclick="command('toggle')">Play/Pause</button>
+    <button onclick="command('step', 1)">&gt;</button>
+    <button onclick="command('seek', {max_frame})">&gt;|</button>
+    <span id="frame_number"></span>
+  </div>
+</div>
+<script>
+var slider = document.getElementById("slider");
+var dragging = false;
+function show(state) {{
+  if (!dragging) {{ slider.value = state.frame_number; }}
+  document.getElementById("frame_number").textContent = state.frame_number;
+}}
+function command(action, value) {{
+  var query = "?action=" + action + (value === undefined ? "" : "&value=" + value);
+  fetch("{command_path}" + query, {{method: "POST"}})
+    .then(function (response) {{ return response.json(); }}).then(show);
+}}
+slider.onmousedown = function () {{ dragging = true; }};
+slider.onmouseup = function () {{ dragging = false; }};
+slider.oninput = function () {{ command("seek", slider.value); }};
+setInterval(function () {{
+  fetch("{state_path}").then(function (response) {{ return response.json(); }}).then(show);
+}}, 500);
+</script>
+</body>
+</html>
+'''
+
+VIDEO_MIME_TYPE = 'video/mp4'
+IMAGE_MIME_TYPE = 'image/png'
+PLAYER_ID_PREFIX = 'plotplayer_'
+
+def write_base64(output_file, input_file, chunk_bytes=BASE64_CHUNK_BYTES):
+    """
+    Append the base64 encoding of a binary file to an open text file one chunk at a time
+
+    Parameters:
+      * output_file - Text file object to write to
+      * input_file - Binary file object to read from
+      * chunk_bytes (optional) - Number of bytes read per chunk; must be a multiple of 3
+    """
+    while True:
+        chunk = input_file.read(chunk_bytes)
+        if not chunk:
+            break
+        output_file.write(base64.b64encode(chunk).decode('ascii'))
+
+def write_html_video(output_file, video_file, width, height, mime_type=VIDEO_MIME_TYPE):
+    """
+    Write an HTML5 video tag embedding an encoded video file as a base64 data URI
+
+    Parameters:
+      * output_file - Text file object to write to
+      * video_file - Binary file object of the encoded video
+      * width - Width of the video in pixels
+      * height - Height of the video in pixels
+      * mime_type (optional) - MIME type of the video
+    """
+    output_file.write(VIDEO_HEADER.format(width=width, height=height, mime_type=mime_type))
+    write_base64(output_file, video_file)
+    output_file.write(VIDEO_FOOTER)
+
+def get_player_id():
+    """
+    Returns a new unique identifier for a Javascript player; every written player needs its own
+      so several players can share one page
+    """
+    # Prefixed so the identifier never starts with a digit and stays a valid Javascript name
+    return PLAYER_ID_PREFIX + uuid.uuid4().hex
+
+def write_javascript_header(output_file, width, height, player_id):
+    """
+    Write the HTML elements of the Javascript player and open the script collecting its frames
+
+    Parameters:
+      * output_file - Text file object to write to
+      * width - Width of the frames in pixels
+      * height - Height of the frames in pixels
+      * player_id - Identifier prefixing the player element ids and variables; see
+          get_player_id
+    """
+    output_file.write(JAVASCRIPT_HEADER.format(player_id=player_id, width=width, height=height))
+
+def write_javascript_frame(output_file, image_bytes, player_id, mime_type=IMAGE_MIME_TYPE):
+    """
+    Append an encoded frame image to the frames of the Javascript player
+
+    Parameters:
+      * output_file - Text file object to write to
+      * image_bytes - Bytes of the encoded frame image
+      * player_id - Identifier used in write_javascript_header
+      * mime_type (optional) - MIME type of the frame image
+    """
+    output_file.write(JAVASCRIPT_FRAME.format(player_id=player_id, mime_type=mime_type))
+    output_file.write(base64.b64encode(image_bytes).decode('ascii'))
+    output_file.write(JAVASCRIPT_FRAME_END)
+
+def write_javascript_footer(output_file, frame_rate, player_id):
+    """
+    Close the script collecting the frames and write the script playing them
+
+    Parameters:
+      * output_file - Text file object to write to
+      * frame_rate - Frame rate of the playback
+      * player_id - Identifier used in write_javascript_header
+    """
+    interval = max(int(1000 / frame_rate), 1)
+    output_file.write(JAVASCRIPT_FOOTER.format(player_id=player_id, interval=interval))
+
+#pylint: disable=too-many-arguments
+def get_stream_page(title, width, height, min_frame, max_frame, stream_path, command_path,
+                    state_path):
+    """
+    Returns an HTML page showing a streamed animation with a slider and playback buttons which
+      send commands to a StreamServer
+
+    Parameters:
+      * title - Title of the page
+      * width - Width of the frames in pixels
+      * height - Height of the frames in pixels
+      * min_frame - Minimum frame number of the animation
+      * max_frame - Maximum frame number of the animation
+      * stream_path - URL path of the MJPEG stream
+      * command_path - URL path commands are sent to
+      * state_path - URL path of the JSON playback state
+    """
+    return STREAM_PAGE.format(title=html.escape(title), width=width, height=height,
+                              min_frame=min_frame, max_frame=max_frame, stream_path=stream_path,
+                              command_path=command_path, state_path=state_path)
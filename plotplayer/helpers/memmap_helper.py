@@ -0,0 +1,81 @@
+"""
+Simple helper functions for memory mapping on disk frame data and managing its resident pages
+"""
+
+import mmap
+
+import numpy
+from numpy.lib import format as npy_format
+
+READ_FILE_MODE = 'rb'
+
+def open_frame_file(frame_file_params):
+    """
+    Memory maps an on disk array read-only
+
+    Parameters:
+      * frame_file_params - Instance of FrameFileParams
+
+    Returns a tuple of the mmap object, a NumPy array backed by it and the byte offset of the
+      array data in the mapping
+    """
+    with open(frame_file_params.file_name, READ_FILE_MODE) as frame_file:
+        if frame_file_params.is_raw():
+            dtype = numpy.dtype(frame_file_params.dtype)
+            shape = tuple(frame_file_params.shape)
+            offset = frame_file_params.offset
+            fortran_order = False
+        else:
+            version = npy_format.read_magic(frame_file)
+            if version == (1, 0):
+                shape, fortran_order, dtype = npy_format.read_array_header_1_0(frame_file)
+            else:
+                shape, fortran_order, dtype = npy_format.read_array_header_2_0(frame_file)
+            offset = frame_file.tell()
+
+        mmap_object = mmap.mmap(frame_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    order = 'F' if fortran_order else 'C'
+    array = numpy.ndarray(shape, dtype, buffer=mmap_object, offset=offset, order=order)
+    return mmap_object, array, offset
+
+def get_frame_byte_range(array, offset, first_frame_num, last_frame_num):
+    """
+    Returns the start and length in bytes of a range of frames of a C ordered mapped array
+
+    Parameters:
+      * array - Array returned by open_frame_file
+      * offset - Byte offset of the array data in the mapped file
+      * first_frame_num - First frame of the range
+      * last_frame_num - Last frame of the range (inclusive)
+    """
+    frame_bytes = array.strides[0]
+    start = offset + first_frame_num * frame_bytes
+    length = (last_frame_num - first_frame_num + 1) * frame_bytes
+    return start, length
+
+def advise(mmap_object, start, length, will_need):
+    """
+    Advise the kernel that a byte range of a mapping will be needed soon or can be released
+
+    The range is widened to page boundaries.  Does nothing on platforms without madvise.
+
+    Parameters:
+      * mmap_object - The mmap object of a mapping
+      * start - First byte of the range
+      * length - Number of bytes in the range
+      * will_need - True to read the range ahead; False to release its resident pages
+    """
+    if length <= 0 or not hasattr(mmap_object, 'madvise'):
+        return
+
+    option_name = 'MADV_WILLNEED' if will_need else 'MADV_DONTNEED'
+    option = getattr(mmap, option_name, None)
+    if option is None:
+        return
+
+    page_start = start - start % mmap.PAGESIZE
+    page_end = min(start + length, len(mmap_object))
+    if page_end <= page_start:
+        return
+    mmap_object.madvise(option, page_start, page_end - page_start)
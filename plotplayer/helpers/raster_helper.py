@@ -0,0 +1,81 @@
+"""
+Simple helper functions for reading and writing the pixel buffer of an Agg based canvas
+"""
+
+import io
+import math
+
+import numpy
+
+def get_canvas_pixels(canvas):
+    """
+    Returns a writable view of the canvas RGBA pixel buffer as a (height, width, 4) array
+    """
+    return numpy.asarray(canvas.buffer_rgba())
+
+def get_region_slices(pixels, bbox):
+    """
+    Returns the row and column slices of a pixel buffer covered by a display space bounding box
+
+    Parameters:
+      * pixels - A (height, width, 4) pixel buffer as returned by get_canvas_pixels
+      * bbox - A Matplotlib Bbox in display (pixel) coordinates
+    """
+    height, width = pixels.shape[:2]
+
+    column_start = max(int(math.floor(bbox.x0)), 0)
+    column_end = min(int(math.ceil(bbox.x1)), width)
+    row_start = max(height - int(math.ceil(bbox.y1)), 0)
+    row_end = min(height - int(math.floor(bbox.y0)), height)
+
+    return slice(row_start, row_end), slice(column_start, column_end)
+
+def copy_region(canvas, bbox):
+    """
+    Returns a copy of the canvas pixels covered by a display space bounding box
+    """
+    pixels = get_canvas_pixels(canvas)
+    rows, columns = get_region_slices(pixels, bbox)
+    return pixels[rows, columns].copy()
+
+def paste_region(canvas, bbox, region):
+    """
+    Writes previously copied pixels back into the canvas pixel buffer
+
+    Returns a boolean indicating whether the region matched the bounding box and was written
+    """
+    pixels = get_canvas_pixels(canvas)
+    rows, columns = get_region_slices(pixels, bbox)
+    target = pixels[rows, columns]
+    if target.shape != region.shape:
+        return False
+
+    target[...] = region
+    return True
+
+IMAGE_FORMAT_JPEG = 'jpeg'
+IMAGE_FORMAT_PNG = 'png'
+IMAGE_FORMATS = [IMAGE_FORMAT_JPEG, IMAGE_FORMAT_PNG]
+IMAGE_MIME_TYPES = {IMAGE_FORMAT_JPEG: 'image/jpeg', IMAGE_FORMAT_PNG: 'image/png'}
+DEFAULT_JPEG_QUALITY = 85
+
+def encode_image(pixels, image_format=IMAGE_FORMAT_PNG, quality=DEFAULT_JPEG_QUALITY):
+    """
+    Returns the bytes of an RGBA pixel buffer encoded as a JPEG or PNG image
+
+    Parameters:
+      * pixels - A (height, width, 4) pixel buffer as returned by get_canvas_pixels
+      * image_format (optional) - One of the IMAGE_FORMAT constants
+      * quality (optional) - JPEG quality between 1 and 95; ignored for PNG
+    """
+    # Imported on first use; Pillow is only needed to encode frames
+    from PIL import Image
+
+    image_file = io.BytesIO()
+    if image_format == IMAGE_FORMAT_JPEG:
+        # JPEG has no alpha channel
+        rgb_pixels = numpy.ascontiguousarray(pixels[..., :3])
+        Image.fromarray(rgb_pixels).save(image_file, format='JPEG', quality=quality)
+    else:
+        Image.fromarray(pixels).save(image_file, format='PNG')
+    return image_file.getvalue()
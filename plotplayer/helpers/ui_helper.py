@@ -1,18 +1,47 @@
 """
 Miscellaneous UI helper methods
+
+Tkinter and pyplot are imported on first use so importing PlotPlayer stays fast and works on
+machines without a display.
 """
 
-from tkinter.filedialog import asksaveasfilename
-from matplotlib import pyplot
+import matplotlib
+
+WINDOW_BACKEND = 'TkAgg'
 
 ALL_FILES_EXTENSION = '*.*'
 ALL_FILES_TYPE = ['All Files', ALL_FILES_EXTENSION]
 
+# Whether the Tkinter backend has been selected for PlotPlayer windows
+_BACKEND_STATE = {}
+
+def get_pyplot():
+    """
+    Returns the Matplotlib pyplot module; the Tkinter backend is selected the first time so
+      pyplot, its figure registry and Tkinter are only loaded once a window is needed
+    """
+    if not _BACKEND_STATE.get('selected'):
+        matplotlib.use(WINDOW_BACKEND)
+        _BACKEND_STATE['selected'] = True
+
+    from matplotlib import pyplot
+    return pyplot
+
+def is_event_loop_timer(timer):
+    """
+    Returns a boolean indicating whether a canvas timer is driven by a GUI event loop; timers of
+      canvases without an event loop (ie. Agg) never fire
+    """
+    from matplotlib.backend_bases import TimerBase
+    return type(timer) is not TimerBase  #pylint: disable=unidiomatic-typecheck
+
 def get_save_dialog_result(title, default_file_name, file_types=None,
                            default_extension=ALL_FILES_EXTENSION):
     """
     Displays a Save File Dialog and returns the resulting file name
     """
+    from tkinter.filedialog import asksaveasfilename
+
     if file_types is None:
         file_types = [ALL_FILES_TYPE]
 
@@ -25,6 +54,7 @@ def show_players(blocking=True):
     """
     Shows all Pyplot figures.  Wraps the call in a try-catch block to avoid crashes.
     """
+    pyplot = get_pyplot()
     try:
         pyplot.show(blocking)
     except AttributeError:
@@ -4,7 +4,23 @@ functionality.
 
 Public Modules:
   * animation_manager - Contains methods and classes used to manage the Animation Playback
+  * delta_frame_cache_manager - Contains methods and classes used to cache rendered Animation
+      frames as compressed keyframes and tile deltas
+  * disk_frame_cache_manager - Contains methods and classes used to cache rendered Animation
+      frames in memory mapped files shared across sessions and processes
+  * export_job_manager - Contains methods and classes used to run Animation exports as background
+      jobs
+  * export_manager - Contains methods and classes used to export Animations through ffmpeg
+  * frame_cache_manager - Contains methods and classes used to cache rendered Animation frames
   * input_manager - Contains methods and classes used to manage user input and key mappings
+  * playback_manager - Contains methods and classes used to drive wall clock playback and
+      coalesce seek requests
+  * prefetch_manager - Contains methods and classes used to render upcoming frames in worker
+      processes
   * render_manager - Contains methods and classes used to manage rendering Animation frames
+  * stats_manager - Contains methods and classes used to record frame timings and show them on
+      the canvas
+  * thumbnail_manager - Contains methods and classes used to preview Animation frames over the
+      scrubber slider from thumbnails rendered in worker processes
   * window_manager - Contains methods and classes used to manage the windows used by PlotPlayer
 """
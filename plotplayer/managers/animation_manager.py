@@ -1,14 +1,36 @@
 """
 PlotPlayer specific Animation Manager Methods and Classes
 
+Public Constants:
+  * SEEK_INTERVAL - Milliseconds between renders of coalesced seek requests
+  * SEEK_ORIGIN_USER - Seek requested by user input (keys, scrubber slider)
+  * SEEK_ORIGIN_PLAYBACK - Seek requested by the playback timer
+  * SEEK_ORIGIN_API - Seek requested programmatically
+  * MIN_PLAYBACK_RATE - Slowest playback speed multiplier
+  * MAX_PLAYBACK_RATE - Fastest playback speed multiplier
+  * PLAYBACK_RATES - Speed multipliers stepped through by faster and slower
+
 Public Classes:
   * AnimationManager - Manages Matplotlib FuncAnimation and RenderManager integration to
       produce animation
 """
 
-from matplotlib.animation import FuncAnimation
+import io
+import math
+import time
+
+from ..helpers import ui_helper
+from ..validators import type_validation
+from .export_job_manager import (EXPORT_FORMATS, EXPORT_HTML, EXPORT_JAVASCRIPT, EXPORT_VIDEO,
+                                 ExportJobManager)
+from .export_manager import ExportManager
+# The seek and playback rate constants of the playback manager are public constants here too
+from .playback_manager import (MAX_PLAYBACK_RATE, MIN_PLAYBACK_RATE, SEEK_INTERVAL,
+                               SEEK_ORIGIN_API, SEEK_ORIGIN_PLAYBACK, SEEK_ORIGIN_USER,
+                               SEEK_ORIGINS, PlaybackManager)
+from .stats_manager import STAGE_FRAME
 
-from ..helpers import ui_helper, file_helper
+PLAYBACK_RATES = [0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0]
 
 VIDEO_EXTENSION = '.mp4'
 HTML_EXTENSION = '.html'
@@ -20,6 +42,10 @@ VIDEO_FILE_TYPE = ['MP4 Video', '*{}'.format(VIDEO_EXTENSION)]
 HTML_FILE_TYPE = ['HTML File', '*{}'.format(HTML_EXTENSION)]
 JAVASCRIPT_FILE_TYPE = ['Javascript HTML File', '*{}'.format(JAVASCRIPT_EXTENSION)]
 
+EXPORT_FILE_TYPES = {EXPORT_VIDEO: (VIDEO_FILE_TYPE, VIDEO_EXTENSION),
+                     EXPORT_HTML: (HTML_FILE_TYPE, HTML_EXTENSION),
+                     EXPORT_JAVASCRIPT: (JAVASCRIPT_FILE_TYPE, JAVASCRIPT_EXTENSION)}
+
 class AnimationManager(object):
     """
     Animation Manager for PlotPlayer Windows
@@ -27,36 +53,97 @@ class AnimationManager(object):
     Public Methods:
       * initialize - Initialize the Animation Manager for playback
       * render - Render a specific frame of the associated animation
+      * draw_deferred - Draw the canvas of a frame rendered with defer_draw
+      * request_seek - Request a frame to be rendered on the next display refresh; only the most
+          recent request is rendered
+      * get_target_frame_number - Returns the frame number of the pending seek request or the
+          current frame number
+      * get_seek_latency - Returns the latency from the last rendered seek request to its display
+      * get_seek_latencies - Returns the recent seek request latencies
       * play - Begin playback from the current position; restarts from beginning if current
-          position is the last frame
+          position is the last frame (the end if playing in reverse)
       * stop - Stop playback at its current position
       * toggle_playback - Toggle between play and stop states
+      * get_playback_rate - Returns the playback speed multiplier
+      * set_playback_rate - Sets the playback speed multiplier; negative plays in reverse
+      * faster - Steps the playback speed up to the next of the PLAYBACK_RATES
+      * slower - Steps the playback speed down to the previous of the PLAYBACK_RATES
+      * reverse - Reverses the playback direction keeping its speed
+      * get_drop_frames - Returns whether frames are dropped to keep up with wall clock time
+      * set_drop_frames - Sets whether frames are dropped to keep up with wall clock time
+      * get_playback_stats - Returns the achieved and target frame rates and dropped frames
+      * get_timing_stats - Returns percentile summaries of the recent render stage durations
+      * toggle_stats_hud - Toggle the on canvas statistics overlay between shown and hidden
       * get_frame_number - Returns the current frame number
+      * get_seek_origin - Returns the origin of the last rendered seek
       * get_total_frames - Returns the total number of frames in the current animation
       * get_html - Returns the current animation in HTML5 Video
       * get_javascript - Returns the current animation in Javascript Video
       * save_video - Saves the current animation to file as Video
       * save_html - Saves the current animation to file as HTML5 Video
       * save javascript - Saves the current animation to file as Javascript Video
+      * submit_export - Queues a background export of the current animation
+      * get_export_jobs - Returns the background export jobs
+      * cancel_exports - Cancels every queued and running background export
+      * get_export_manager - Returns the ExportManager used to save videos
+      * set_export_manager - Sets the ExportManager used to save videos
+      * get_export_job_manager - Returns the ExportJobManager running background exports
+      * set_export_job_manager - Sets the ExportJobManager running background exports
+      * get_frame_rate - Returns the playback frame rate of the current animation
+      * get_player_group - Returns the PlayerGroup driving this animation
+      * set_player_group - Sets the PlayerGroup driving this animation
+      * get_prefetch_manager - Returns the PrefetchManager rendering upcoming frames
+      * set_prefetch_manager - Sets the PrefetchManager rendering upcoming frames
+      * get_thumbnail_manager - Returns the ThumbnailManager previewing frames over the slider
+      * set_thumbnail_manager - Sets the ThumbnailManager previewing frames over the slider
+      * get_playback_manager - Returns the PlaybackManager driving playback and seeks
     """
 
     _figure = None
     _render_handler = None
     _frame_num = None
     _animation_params = None
-    _animation = None
-    _playing = False
-
-    def __init__(self, figure, render_handler):
+    _playback_handler = None
+    _seek_origin = None
+    _deferred_frame = None
+    _prefetch_handler = None
+    _export_handler = None
+    _export_job_handler = None
+    _player_group = None
+    _thumbnail_handler = None
+
+    #pylint: disable=too-many-arguments
+    def __init__(self, figure, render_handler, prefetch_handler=None, export_handler=None,
+                 drop_frames=True, export_job_handler=None, thumbnail_handler=None):
         """
         Constructor
 
         Parameters:
           * figure - Instance of Pyplot figure associated with the draw canvas
           * render_handler - Instance of RenderManager associated with the current animation
+          * prefetch_handler (optional) - Instance of PrefetchManager used to render upcoming
+              frames in worker processes
+          * export_handler (optional) - Instance of ExportManager used to save videos
+          * drop_frames (optional) - Boolean indicating whether frames which can no longer be
+              shown on time are skipped during playback; False shows every frame
+          * export_job_handler (optional) - Instance of ExportJobManager used to run background
+              exports
+          * thumbnail_handler (optional) - Instance of ThumbnailManager used to preview frames
+              while hovering over or dragging the Scrubber Slider
         """
         self._figure = figure
         self._render_handler = render_handler
+        self._prefetch_handler = prefetch_handler
+        self._thumbnail_handler = thumbnail_handler
+        self._playback_handler = PlaybackManager(self, lambda: self._figure.canvas, drop_frames)
+
+        if export_handler is None:
+            export_handler = ExportManager(render_handler)
+        self._export_handler = export_handler
+
+        if export_job_handler is None:
+            export_job_handler = ExportJobManager()
+        self._export_job_handler = export_job_handler
 
     def initialize(self, animation_params):
         """
@@ -70,70 +157,215 @@ class AnimationManager(object):
         self._animation_params = animation_params
 
         self._frame_num = 0
-        self._playing = False
-
-    def render(self, frame_num):
+        self._playback_handler.cancel_seek()
+        if self._prefetch_handler is not None:
+            self._prefetch_handler.cancel()
+        if self._thumbnail_handler is not None:
+            self._thumbnail_handler.initialize(animation_params.min_frame_number,
+                                               animation_params.max_frame_number)
+
+    def render(self, frame_num, origin=SEEK_ORIGIN_API, force_draw=False, defer_draw=False):
         """
         Render a specific frame of the animation
 
         Parameters:
           * frame_num - The frame number to render
+          * origin (optional) - One of the SEEK_ORIGIN constants describing what requested the
+              frame
+          * force_draw (optional) - Boolean indicating whether the canvas is drawn immediately
+              instead of when the GUI is idle
+          * defer_draw (optional) - Boolean indicating whether drawing the canvas is left to
+              draw_deferred so several players can be rendered before any of them is drawn
         """
+        type_validation.assert_is_in(origin, SEEK_ORIGINS, 'origin')
+        self._seek_origin = origin
+
         if frame_num < self._animation_params.min_frame_number:
             frame_num = self._animation_params.min_frame_number
         elif frame_num > self._animation_params.max_frame_number:
             frame_num = self._animation_params.max_frame_number
+        previous_frame_num = self._frame_num
         self._frame_num = int(round(frame_num))
-
+        self._playback_handler.handle_render(self._frame_num, origin)
+
+        if self._prefetch_handler is not None:
+            if origin == SEEK_ORIGIN_PLAYBACK:
+                # Prefetch the frames playback will show next, every n-th frame at n times speed
+                direction = self._playback_handler.get_playback_stride()
+            else:
+                direction = -1 if self._frame_num < previous_frame_num else 1
+            self._prefetch_handler.update(self._frame_num, direction,
+                                          self._animation_params.min_frame_number,
+                                          self._animation_params.max_frame_number)
+
+        stats_handler = self._render_handler.get_stats_manager()
+        if stats_handler.get_hud_visible():
+            stats_handler.update_hud(self.get_playback_stats())
+
+        # A shown thumbnail is lifted off the canvas so it never ends up in the Frame Cache
+        preview_frame_num = None
+        if self._thumbnail_handler is not None:
+            preview_frame_num = self._thumbnail_handler.get_preview_frame_number()
+            self._thumbnail_handler.hide_thumbnail(blit=False)
+
+        start_time = time.perf_counter()
         total_frames = self.get_total_frames()
-        self._render_handler.render(self._frame_num, total_frames)
+        self._render_handler.render(self._frame_num, total_frames, force_draw, defer_draw=True)
+        self._deferred_frame = (time.perf_counter() - start_time, preview_frame_num)
+        if not defer_draw:
+            self.draw_deferred()
 
-        if self._frame_num == self._animation_params.max_frame_number:
-            self._playing = False
-
-    def play(self):
+    def draw_deferred(self):
         """
-        Begin playback from the current frame; restart playback from beginning if at the end
+        Draw the canvas of the frame last rendered with defer_draw; does nothing if no frame is
+          waiting to be drawn
         """
-        if self._playing:
+        if self._deferred_frame is None:
             return
 
-        if self._frame_num == self._animation_params.max_frame_number:
-            self._frame_num = 0
+        render_duration, preview_frame_num = self._deferred_frame
+        self._deferred_frame = None
+        start_time = time.perf_counter()
+        self._render_handler.draw_deferred()
+        self._render_handler.get_stats_manager().record(
+            STAGE_FRAME, render_duration + time.perf_counter() - start_time)
+
+        if preview_frame_num is not None:
+            self._thumbnail_handler.show_thumbnail(preview_frame_num)
+
+    def request_seek(self, frame_num, origin=SEEK_ORIGIN_USER):
+        """
+        Request a frame to be rendered on the next display refresh; requests made before then
+          replace each other so only the most recent frame is rendered
+
+        Parameters:
+          * frame_num - The frame number to render
+          * origin (optional) - One of the SEEK_ORIGIN constants describing what requested the
+              frame
+        """
+        type_validation.assert_is_in(origin, SEEK_ORIGINS, 'origin')
+        if self._player_group is not None:
+            self._player_group.request_seek(frame_num, origin)
+        else:
+            self._playback_handler.request_seek(frame_num, origin)
+
+    def get_target_frame_number(self):
+        """
+        Returns the frame number of the pending seek request or the current frame number if no
+          seek is pending
+        """
+        if self._player_group is not None:
+            return self._player_group.get_target_frame_number()
+        return self._playback_handler.get_target_frame_number()
+
+    def get_seek_latency(self):
+        """
+        Returns the seconds between the last rendered seek request and its display; None if no
+          seek request has been rendered
+        """
+        return self._playback_handler.get_seek_latency()
+
+    def get_seek_latencies(self):
+        """
+        Returns a list of the recent seek request latencies in seconds
+        """
+        return self._playback_handler.get_seek_latencies()
 
-        frames_to_play = range(self._frame_num, self._animation_params.max_frame_number + 1)
-        animation = FuncAnimation(self._figure, self.render, frames_to_play,
-                                  interval=1000 // self._animation_params.frame_rate, repeat=False)
+    def play(self):
+        """
+        Begin playback from the current frame; restart playback from beginning if at the end,
+          or from the end if at the beginning while playing in reverse
+
+        Playback is driven by the wall clock; each timer tick displays the frame which should be
+        on screen at that time, skipping frames which can no longer be shown on time unless frame
+        dropping is disabled.  The timer ticks at the frame rate whatever the playback rate, so
+        faster playback advances several frames per tick instead of rendering every frame.
+        Players in a PlayerGroup start the whole group instead.
+        """
+        if self._player_group is not None:
+            self._player_group.play()
+            return
 
-        self._playing = True
-        self._animation = animation
-        self._figure.canvas.draw()
+        self._frame_num = self._playback_handler.play()
 
     def stop(self):
         """
-        Stop playback at the current position
+        Stop playback at the current position; players in a PlayerGroup stop the whole group
         """
-        if not self._playing:
+        if self._player_group is not None:
+            self._player_group.stop()
             return
 
-        self._animation.event_source.stop()
-        self._playing = False
+        self._playback_handler.stop()
 
     def toggle_playback(self):
         """
         Toggle between play and stop states
         """
-        if self._playing:
+        if self._player_group is not None:
+            self._player_group.toggle_playback()
+        elif self._playback_handler.is_playing():
             self.stop()
         else:
             self.play()
 
+    def get_playback_rate(self):
+        """
+        Returns the playback speed multiplier; negative values play in reverse
+        """
+        return self._playback_handler.get_playback_rate()
+
+    def set_playback_rate(self, playback_rate):
+        """
+        Set the playback speed multiplier; the playback clock is re-anchored at the current frame
+          so the change applies from the next timer tick without restarting the timer
+
+        Parameters:
+          * playback_rate - Speed multiplier whose magnitude is between MIN_PLAYBACK_RATE and
+              MAX_PLAYBACK_RATE; negative values play in reverse
+        """
+        self._playback_handler.set_playback_rate(playback_rate)
+        if self._animation_params is not None:
+            self._render_handler.get_stats_manager().update_hud(self.get_playback_stats())
+        if self._player_group is not None:
+            self._player_group.set_playback_rate(playback_rate)
+
+    def faster(self):
+        """
+        Step the playback speed up to the next of the PLAYBACK_RATES keeping the direction
+        """
+        playback_rate = self.get_playback_rate()
+        faster_rates = [rate for rate in PLAYBACK_RATES if rate > abs(playback_rate)]
+        if faster_rates:
+            self.set_playback_rate(math.copysign(faster_rates[0], playback_rate))
+
+    def slower(self):
+        """
+        Step the playback speed down to the previous of the PLAYBACK_RATES keeping the direction
+        """
+        playback_rate = self.get_playback_rate()
+        slower_rates = [rate for rate in PLAYBACK_RATES if rate < abs(playback_rate)]
+        if slower_rates:
+            self.set_playback_rate(math.copysign(slower_rates[-1], playback_rate))
+
+    def reverse(self):
+        """
+        Reverse the playback direction keeping its speed
+        """
+        self.set_playback_rate(-self.get_playback_rate())
+
     def get_frame_number(self):
         """
         Returns the current frame number
         """
         return self._frame_num
 
+    def get_seek_origin(self):
+        """
+        Returns the SEEK_ORIGIN constant of the last rendered seek
+        """
+        return self._seek_origin
+
     def get_min_frame_number(self):
         """
         Returns the minimum frame number in the current animation
@@ -146,6 +378,146 @@ class AnimationManager(object):
         """
         return self._animation_params.max_frame_number
 
+    def get_export_manager(self):
+        """
+        Returns the ExportManager used to save videos
+        """
+        return self._export_handler
+
+    def set_export_manager(self, export_handler):
+        """
+        Set the ExportManager used to save videos
+
+        Parameters:
+          * export_handler - Instance of ExportManager
+        """
+        self._export_handler = export_handler
+
+    def get_export_job_manager(self):
+        """
+        Returns the ExportJobManager running background exports
+        """
+        return self._export_job_handler
+
+    def set_export_job_manager(self, export_job_handler):
+        """
+        Sets the ExportJobManager running background exports
+
+        Parameters:
+          * export_job_handler - Instance of ExportJobManager
+        """
+        self._export_job_handler = export_job_handler
+
+    def get_drop_frames(self):
+        """
+        Returns a boolean indicating whether frames are dropped to keep up with wall clock time
+        """
+        return self._playback_handler.get_drop_frames()
+
+    def set_drop_frames(self, drop_frames):
+        """
+        Set whether frames which can no longer be shown on time are skipped during playback
+
+        Parameters:
+          * drop_frames - Boolean; False shows every frame for frame exact review
+        """
+        self._playback_handler.set_drop_frames(drop_frames)
+        if self._player_group is not None:
+            self._player_group.set_drop_frames(drop_frames)
+
+    def get_playback_stats(self):
+        """
+        Returns a PlaybackStats instance for the current or last playback
+        """
+        return self._playback_handler.get_playback_stats()
+
+    def get_frame_rate(self):
+        """
+        Returns the playback frame rate of the current animation
+        """
+        return self._animation_params.frame_rate
+
+    def get_player_group(self):
+        """
+        Returns the PlayerGroup driving this animation; None if it plays on its own
+        """
+        return self._player_group
+
+    def set_player_group(self, player_group):
+        """
+        Set the PlayerGroup driving this animation; its own playback timer is stopped since the
+          group timer renders its frames
+
+        Parameters:
+          * player_group - Instance of PlayerGroup; None plays the animation on its own
+        """
+        self._playback_handler.stop()
+        self._playback_handler.cancel_seek()
+        self._player_group = player_group
+
+    def get_playback_manager(self):
+        """
+        Returns the PlaybackManager driving the playback clock and coalescing seek requests
+        """
+        return self._playback_handler
+
+    def get_timing_stats(self):
+        """
+        Returns a dictionary of TimingStats instances summarizing the recent durations of each
+          render stage keyed by the STAGE constants of the StatsManager
+        """
+        return self._render_handler.get_stats_manager().get_stats()
+
+    def toggle_stats_hud(self):
+        """
+        Toggle the on canvas overlay showing the achieved frame rate, p50/p99 frame times and
+          dropped frames between shown and hidden
+        """
+        stats_handler = self._render_handler.get_stats_manager()
+        stats_handler.set_hud_visible(not stats_handler.get_hud_visible())
+        stats_handler.update_hud(self.get_playback_stats())
+
+    def get_prefetch_manager(self):
+        """
+        Returns the PrefetchManager rendering upcoming frames; None if prefetching is disabled
+        """
+        return self._prefetch_handler
+
+    def set_prefetch_manager(self, prefetch_handler):
+        """
+        Set the PrefetchManager rendering upcoming frames
+
+        Parameters:
+          * prefetch_handler - Instance of PrefetchManager; None disables prefetching
+        """
+        if self._prefetch_handler is not None:
+            self._prefetch_handler.cancel()
+        self._prefetch_handler = prefetch_handler
+
+    def get_thumbnail_manager(self):
+        """
+        Returns the ThumbnailManager previewing frames over the Scrubber Slider; None if
+          thumbnails are disabled
+        """
+        return self._thumbnail_handler
+
+    def set_thumbnail_manager(self, thumbnail_handler):
+        """
+        Set the ThumbnailManager previewing frames over the Scrubber Slider; its thumbnails are
+          scheduled immediately if an animation is initialized
+
+        Parameters:
+          * thumbnail_handler - Instance of ThumbnailManager; None disables thumbnails
+        """
+        if self._thumbnail_handler is not None:
+            self._thumbnail_handler.hide_thumbnail()
+            self._thumbnail_handler.cancel()
+        self._thumbnail_handler = thumbnail_handler
+
+        if thumbnail_handler is not None and self._animation_params is not None:
+            thumbnail_handler.initialize(self._animation_params.min_frame_number,
+                                         self._animation_params.max_frame_number)
+
     def get_total_frames(self):
         total_frames = (self._animation_params.max_frame_number -
                         self._animation_params.min_frame_number)
@@ -155,19 +527,24 @@ class AnimationManager(object):
         """
         Returns the current animation in HTML5 Video format
         """
-        html = self._animation.to_html5_video()
-        return html
+        html_file = io.StringIO()
+        self._export_handler.write_html(html_file, self._animation_params)
+        self._restore_frame()
+        return html_file.getvalue()
 
     def get_javascript(self):
         """
         Returns the current animation in Javascript Video format
         """
-        javascript = self._animation.to_jshtml()
-        return javascript
+        html_file = io.StringIO()
+        self._export_handler.write_javascript(html_file, self._animation_params)
+        self._restore_frame()
+        return html_file.getvalue()
 
     def save_video(self, file_name=None, writer=None):
         """
-        Saves the current animation to file as Video
+        Saves the whole animation to file as Video; frames are rendered on a headless canvas and
+          streamed into ffmpeg by the ExportManager unless a Matplotlib writer is specified
 
         Parameters:
           * file_name (optional) - Indicates the file name to write the video to; will prompt
@@ -177,16 +554,18 @@ class AnimationManager(object):
         self.stop()
 
         if file_name is None:
-            file_types = [VIDEO_FILE_TYPE, ui_helper.ALL_FILES_TYPE]
-            animation_name = self._animation_params.animation_name
-            file_name = ui_helper.get_save_dialog_result(SAVE_DIALOG_TITLE,
-                                                         animation_name + VIDEO_EXTENSION,
-                                                         file_types, VIDEO_EXTENSION)
-        self._animation.save(file_name, writer)
+            file_name = self._get_export_file_name(EXPORT_VIDEO)
+        if writer is None:
+            self._export_handler.save_video(file_name, self._animation_params)
+            self._restore_frame()
+        else:
+            animation = self._export_handler.get_animation(self._animation_params)
+            animation.save(file_name, writer)
 
     def save_html(self, file_name=None):
         """
-        Saves the current animation to file as HTML5 Video
+        Saves the current animation to file as HTML5 Video; the video is streamed into the file
+          by the ExportManager
 
         Parameters:
           * file_name (optional) - Indicates the file name to write the video to; will prompt
@@ -195,17 +574,14 @@ class AnimationManager(object):
         self.stop()
 
         if file_name is None:
-            file_types = [HTML_FILE_TYPE, ui_helper.ALL_FILES_TYPE]
-            animation_name = self._animation_params.animation_name
-            file_name = ui_helper.get_save_dialog_result(SAVE_DIALOG_TITLE,
-                                                         animation_name + HTML_EXTENSION,
-                                                         file_types, HTML_EXTENSION)
-        video_html = self.get_html()
-        file_helper.save_file(file_name, video_html)
+            file_name = self._get_export_file_name(EXPORT_HTML)
+        self._export_handler.save_html(file_name, self._animation_params)
+        self._restore_frame()
 
     def save_javascript(self, file_name=None):
         """
-        Saves the current animation to file as Javascript Video
+        Saves the current animation to file as Javascript Video; frames are streamed into the
+          file by the ExportManager
 
         Parameters:
           * file_name (optional) - Indicates the file name to write the video to; will prompt
@@ -214,9 +590,62 @@ class AnimationManager(object):
         self.stop()
 
         if file_name is None:
-            default_file_name = self._animation_params.animation_name + JAVASCRIPT_EXTENSION
-            file_types = [JAVASCRIPT_FILE_TYPE, ui_helper.ALL_FILES_TYPE]
-            file_name = ui_helper.get_save_dialog_result(SAVE_DIALOG_TITLE, default_file_name,
-                                                         file_types, JAVASCRIPT_EXTENSION)
-        video_javascript = self.get_javascript()
-        file_helper.save_file(file_name, video_javascript)
+            file_name = self._get_export_file_name(EXPORT_JAVASCRIPT)
+        self._export_handler.save_javascript(file_name, self._animation_params)
+        self._restore_frame()
+
+    def submit_export(self, export_format, file_name=None):
+        """
+        Queues a background export of the current animation; frames are rendered on a separate
+          headless figure by the ExportJobManager so playback and seeking continue meanwhile
+
+        Parameters:
+          * export_format - One of the EXPORT format constants of the export_job_manager
+          * file_name (optional) - Indicates the file name to write the export to; will prompt
+              if omitted
+
+        Returns the queued ExportJob or None if the save dialog is cancelled
+        """
+        type_validation.assert_is_in(export_format, EXPORT_FORMATS, 'export_format')
+
+        if file_name is None:
+            file_name = self._get_export_file_name(export_format)
+        if not file_name:
+            return None
+
+        return self._export_job_handler.submit(self._export_handler, export_format, file_name,
+                                               self._animation_params)
+
+    def get_export_jobs(self):
+        """
+        Returns a list of the background ExportJobs in the order submitted
+        """
+        return self._export_job_handler.get_jobs()
+
+    def cancel_exports(self):
+        """
+        Cancels every queued and running background export
+        """
+        self._export_job_handler.cancel_all()
+
+    def _get_export_file_name(self, export_format):
+        """
+        Prompt for the file name of an export
+
+        Parameters:
+          * export_format - One of the EXPORT format constants of the export_job_manager
+
+        Returns the selected file name
+        """
+        file_type, extension = EXPORT_FILE_TYPES[export_format]
+        default_file_name = self._animation_params.animation_name + extension
+        return ui_helper.get_save_dialog_result(SAVE_DIALOG_TITLE, default_file_name,
+                                                [file_type, ui_helper.ALL_FILES_TYPE], extension)
+
+    def _restore_frame(self):
+        """
+        Render the current frame again if the last export fell back to drawing every frame on the
+          player figure
+        """
+        if self._export_handler.get_used_player_figure():
+            self.render(self._frame_num, force_draw=True)
@@ -0,0 +1,446 @@
+"""
+PlotPlayer specific Delta Frame Cache Methods and Classes
+
+Notes :
+  * LZ4 compression requires the optional lz4 package; it is imported when first used
+
+Public Constants:
+  * COMPRESSION_NONE - Tiles and keyframes are stored uncompressed
+  * COMPRESSION_ZLIB - Tiles and keyframes are compressed with zlib
+  * COMPRESSION_LZ4 - Tiles and keyframes are compressed with LZ4 frames
+  * DEFAULT_KEYFRAME_INTERVAL - Default number of frames sharing a keyframe
+  * DEFAULT_TILE_SIZE - Default width and height in pixels of the compared tiles
+
+Public Classes:
+  * DeltaFrameCacheManager - Bounded LRU cache of rendered Animation Axes pixels held as
+      compressed keyframes and tile deltas
+"""
+
+import time
+import zlib
+from collections import OrderedDict, deque
+
+import numpy
+
+from ..data_models.cache_stats import CacheStats
+from ..data_models.compression_report import CompressionReport
+from ..validators import type_validation
+from .frame_cache_manager import DEFAULT_CACHE_BYTES
+
+COMPRESSION_NONE = 'none'
+COMPRESSION_ZLIB = 'zlib'
+COMPRESSION_LZ4 = 'lz4'
+COMPRESSIONS = [COMPRESSION_NONE, COMPRESSION_ZLIB, COMPRESSION_LZ4]
+
+DEFAULT_KEYFRAME_INTERVAL = 30
+DEFAULT_TILE_SIZE = 16
+
+# Fastest zlib level; frames are stored while the player is rendering
+ZLIB_LEVEL = 1
+TIMING_SAMPLES = 240
+# Decoded keyframes kept to encode and decode deltas without decompressing the keyframe each time
+DECODED_KEYFRAMES = 2
+
+def _compress(data, compression):
+    """
+    Returns data compressed with one of the COMPRESSION constants
+    """
+    if compression == COMPRESSION_ZLIB:
+        return zlib.compress(data, ZLIB_LEVEL)
+    if compression == COMPRESSION_LZ4:
+        import lz4.frame
+        return lz4.frame.compress(data)
+    return bytes(data)
+
+def _decompress(data, compression):
+    """
+    Returns data decompressed with one of the COMPRESSION constants
+    """
+    if compression == COMPRESSION_ZLIB:
+        return zlib.decompress(data)
+    if compression == COMPRESSION_LZ4:
+        import lz4.frame
+        return lz4.frame.decompress(data)
+    return data
+
+def _get_tile_bounds(shape, tile_size):
+    """
+    Returns the row and column start offsets of the tiles covering a frame
+    """
+    return numpy.arange(0, shape[0], tile_size), numpy.arange(0, shape[1], tile_size)
+
+def _get_changed_pixels(keyframe, pixels):
+    """
+    Returns a (height, width) boolean array marking the pixels differing from the keyframe
+    """
+    height, width, channels = pixels.shape
+    if channels == 4 and pixels.dtype == numpy.uint8:
+        # Compare whole RGBA pixels at once
+        return (keyframe.reshape(height, width * channels).view(numpy.uint32) !=
+                numpy.ascontiguousarray(pixels).reshape(height, width * channels).view(
+                    numpy.uint32))
+    return numpy.any(keyframe != pixels, axis=2)
+
+class _FrameGroup(object):
+    """
+    Frames sharing a keyframe; every other frame is held as the tiles differing from it
+    """
+
+    keyframe_num = None
+    shape = None
+    keyframe_data = None
+    deltas = None
+    size_bytes = 0
+
+    def __init__(self, keyframe_num, shape, keyframe_data):
+        self.keyframe_num = keyframe_num
+        self.shape = shape
+        self.keyframe_data = keyframe_data
+        self.deltas = {}
+        self.size_bytes = len(keyframe_data)
+
+    def contains(self, frame_num):
+        """
+        Returns a boolean indicating whether the group holds a frame number
+        """
+        return frame_num == self.keyframe_num or frame_num in self.deltas
+
+    def get_frame_count(self):
+        """
+        Returns the number of frames held by the group
+        """
+        return len(self.deltas) + 1
+
+class DeltaFrameCacheManager(object):
+    """
+    Delta Frame Cache Manager for PlotPlayer RenderManagers
+
+    A drop in replacement for the FrameCacheManager which holds far more frames in the same byte
+    budget when consecutive frames differ in few pixels.  Frame numbers are split into groups of
+    keyframe_interval frames; the first frame stored in a group becomes its keyframe and is held
+    whole, every other frame of the group is held as the tiles which differ from the keyframe.
+    Keyframes and tiles are optionally compressed.  Deltas always refer to the keyframe and never
+    to another delta, so decoding any frame costs at most one keyframe decompression and one delta
+    application.  Groups are evicted as a whole, least recently used first, since deltas are
+    useless without their keyframe.
+
+    Cached frames are only valid for the figure size, DPI and axis limits they were rendered with;
+    the RenderManager reports these through set_signature and the cache is cleared whenever they
+    change.
+
+    Public Methods:
+      * get - Returns the cached pixels for a frame number or None
+      * put - Stores the pixels for a frame number, evicting least recently used groups as needed
+      * contains - Returns a boolean indicating whether a frame number is cached
+      * clear - Removes all cached frames
+      * set_signature - Sets the render signature the cached frames belong to
+      * get_max_bytes - Returns the byte budget
+      * set_max_bytes - Sets the byte budget, evicting groups as needed
+      * get_stats - Returns a CacheStats instance describing cache usage
+      * reset_stats - Resets the hit, miss and eviction counters and the timings
+      * get_compression_report - Returns a CompressionReport of the memory saved and decode cost
+      * get_keyframe_interval - Returns the number of frames sharing a keyframe
+      * get_tile_size - Returns the width and height of the compared tiles
+      * get_compression - Returns the COMPRESSION constant of the cache
+    """
+
+    _max_bytes = None
+    _keyframe_interval = None
+    _tile_size = None
+    _compression = None
+    _groups = None
+    _decoded_keyframes = None
+    _size_bytes = 0
+    _signature = None
+
+    _hits = 0
+    _misses = 0
+    _evictions = 0
+    _decode_times = None
+    _encode_times = None
+    _changed_tile_fractions = None
+
+    #pylint: disable=too-many-arguments
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES, keyframe_interval=DEFAULT_KEYFRAME_INTERVAL,
+                 tile_size=DEFAULT_TILE_SIZE, compression=COMPRESSION_ZLIB):
+        """
+        Constructor
+
+        Parameters:
+          * max_bytes (optional) - Maximum number of stored bytes held by the cache
+          * keyframe_interval (optional) - Number of consecutive frame numbers sharing a keyframe
+          * tile_size (optional) - Width and height in pixels of the tiles compared to the keyframe
+          * compression (optional) - One of the COMPRESSION constants
+        """
+        type_validation.assert_is_int(keyframe_interval, 'keyframe_interval')
+        type_validation.assert_is_int(tile_size, 'tile_size')
+        type_validation.assert_is_in(compression, COMPRESSIONS, 'compression')
+
+        self._max_bytes = max_bytes
+        self._keyframe_interval = keyframe_interval
+        self._tile_size = tile_size
+        self._compression = compression
+        self._groups = OrderedDict()
+        self._decoded_keyframes = OrderedDict()
+        self._size_bytes = 0
+        self._signature = None
+        self._decode_times = deque(maxlen=TIMING_SAMPLES)
+        self._encode_times = deque(maxlen=TIMING_SAMPLES)
+        self._changed_tile_fractions = {}
+        self.reset_stats()
+
+    def get(self, frame_num):
+        """
+        Returns the cached pixels for a frame number or None if it is not cached
+
+        Parameters:
+          * frame_num - The frame number to look up
+        """
+        group_num = frame_num // self._keyframe_interval
+        group = self._groups.get(group_num)
+        if group is None or not group.contains(frame_num):
+            self._misses += 1
+            return None
+
+        start_time = time.perf_counter()
+        pixels = self._get_keyframe_pixels(group_num, group).copy()
+        if frame_num != group.keyframe_num:
+            self._apply_delta(pixels, group.deltas[frame_num])
+        self._decode_times.append(time.perf_counter() - start_time)
+
+        self._groups.move_to_end(group_num)
+        self._hits += 1
+        return pixels
+
+    def put(self, frame_num, pixels):
+        """
+        Store the pixels for a frame number
+
+        Parameters:
+          * frame_num - The frame number the pixels belong to
+          * pixels - A numpy array containing the rendered pixels
+        """
+        start_time = time.perf_counter()
+        group_num = frame_num // self._keyframe_interval
+        group = self._groups.get(group_num)
+        if group is not None and (group.shape != pixels.shape or frame_num == group.keyframe_num):
+            # The deltas of the group refer to pixels which are being replaced
+            self._remove_group(group_num)
+            group = None
+
+        if group is None:
+            keyframe = numpy.array(pixels)
+            group = _FrameGroup(frame_num, keyframe.shape,
+                                _compress(keyframe.tobytes(), self._compression))
+            self._groups[group_num] = group
+            self._size_bytes += group.size_bytes
+            self._set_decoded_keyframe(group_num, keyframe)
+        else:
+            previous = group.deltas.pop(frame_num, None)
+            if previous is not None:
+                self._resize_group(group, -self._get_delta_bytes(previous))
+            delta = self._encode_delta(self._get_keyframe_pixels(group_num, group), pixels,
+                                       frame_num)
+            group.deltas[frame_num] = delta
+            self._resize_group(group, self._get_delta_bytes(delta))
+
+        self._groups.move_to_end(group_num)
+        self._encode_times.append(time.perf_counter() - start_time)
+        self._evict()
+
+    def contains(self, frame_num):
+        """
+        Returns a boolean indicating whether a frame number is cached
+        """
+        group = self._groups.get(frame_num // self._keyframe_interval)
+        return group is not None and group.contains(frame_num)
+
+    def clear(self):
+        """
+        Remove all cached frames
+        """
+        self._groups.clear()
+        self._decoded_keyframes.clear()
+        self._changed_tile_fractions.clear()
+        self._size_bytes = 0
+
+    def set_signature(self, signature):
+        """
+        Set the render signature the cached frames belong to; clears the cache if it changed
+
+        Parameters:
+          * signature - A hashable value describing figure size, DPI and axis limits
+        """
+        if signature != self._signature:
+            self.clear()
+            self._signature = signature
+
+    def get_max_bytes(self):
+        """
+        Returns the byte budget of the cache
+        """
+        return self._max_bytes
+
+    def set_max_bytes(self, max_bytes):
+        """
+        Set the byte budget of the cache, evicting least recently used groups as needed
+        """
+        self._max_bytes = max_bytes
+        self._evict()
+
+    def get_stats(self):
+        """
+        Returns a CacheStats instance describing cache usage
+        """
+        frame_count = sum(group.get_frame_count() for group in self._groups.values())
+        return CacheStats(self._hits, self._misses, self._evictions, frame_count,
+                          self._size_bytes, self._max_bytes)
+
+    def reset_stats(self):
+        """
+        Reset the hit, miss and eviction counters and the recorded timings
+        """
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._decode_times.clear()
+        self._encode_times.clear()
+
+    def get_compression_report(self):
+        """
+        Returns a CompressionReport instance comparing the stored bytes with the raw pixel bytes of
+          the cached frames along with recent decode and encode durations
+        """
+        keyframe_count = len(self._groups)
+        delta_count = sum(len(group.deltas) for group in self._groups.values())
+        raw_bytes = sum(int(numpy.prod(group.shape)) * group.get_frame_count()
+                        for group in self._groups.values())
+
+        changed_tile_fraction = 0.0
+        if self._changed_tile_fractions:
+            changed_tile_fraction = float(numpy.mean(list(self._changed_tile_fractions.values())))
+
+        mean_decode_time = max_decode_time = mean_encode_time = 0.0
+        if self._decode_times:
+            mean_decode_time = float(numpy.mean(self._decode_times))
+            max_decode_time = float(numpy.max(self._decode_times))
+        if self._encode_times:
+            mean_encode_time = float(numpy.mean(self._encode_times))
+
+        return CompressionReport(keyframe_count + delta_count, keyframe_count, delta_count,
+                                 raw_bytes, self._size_bytes, changed_tile_fraction,
+                                 mean_decode_time, max_decode_time, mean_encode_time)
+
+    def get_keyframe_interval(self):
+        """
+        Returns the number of consecutive frame numbers sharing a keyframe
+        """
+        return self._keyframe_interval
+
+    def get_tile_size(self):
+        """
+        Returns the width and height in pixels of the tiles compared to the keyframe
+        """
+        return self._tile_size
+
+    def get_compression(self):
+        """
+        Returns the COMPRESSION constant of the cache
+        """
+        return self._compression
+
+    def _encode_delta(self, keyframe, pixels, frame_num):
+        """
+        Returns a tuple of the flat indices of the tiles differing from the keyframe and their
+          compressed pixels in index order
+        """
+        changed = _get_changed_pixels(keyframe, pixels)
+        row_starts, column_starts = _get_tile_bounds(pixels.shape, self._tile_size)
+        changed_rows = numpy.logical_or.reduceat(changed, row_starts, axis=0)
+        changed_tiles = numpy.logical_or.reduceat(changed_rows, column_starts, axis=1)
+        tile_indices = numpy.flatnonzero(changed_tiles).astype(numpy.uint32)
+        self._changed_tile_fractions[frame_num] = tile_indices.shape[0] / changed_tiles.size
+
+        column_count = column_starts.shape[0]
+        tiles = [pixels[row_starts[index // column_count]:
+                        row_starts[index // column_count] + self._tile_size,
+                        column_starts[index % column_count]:
+                        column_starts[index % column_count] + self._tile_size].tobytes()
+                 for index in tile_indices]
+        return tile_indices, _compress(b''.join(tiles), self._compression)
+
+    def _apply_delta(self, pixels, delta):
+        """
+        Write the tiles of a delta into a copy of its keyframe pixels
+        """
+        tile_indices, tile_data = delta
+        if tile_indices.shape[0] == 0:
+            return
+
+        tile_bytes = numpy.frombuffer(_decompress(tile_data, self._compression), pixels.dtype)
+        row_starts, column_starts = _get_tile_bounds(pixels.shape, self._tile_size)
+        column_count = column_starts.shape[0]
+        offset = 0
+        for index in tile_indices:
+            tile = pixels[row_starts[index // column_count]:
+                          row_starts[index // column_count] + self._tile_size,
+                          column_starts[index % column_count]:
+                          column_starts[index % column_count] + self._tile_size]
+            tile[...] = tile_bytes[offset:offset + tile.size].reshape(tile.shape)
+            offset += tile.size
+
+    def _get_keyframe_pixels(self, group_num, group):
+        """
+        Returns the decoded keyframe pixels of a group; recently used keyframes stay decoded
+        """
+        keyframe = self._decoded_keyframes.get(group_num)
+        if keyframe is None:
+            keyframe = numpy.frombuffer(_decompress(group.keyframe_data, self._compression),
+                                        numpy.uint8).reshape(group.shape)
+            self._set_decoded_keyframe(group_num, keyframe)
+        else:
+            self._decoded_keyframes.move_to_end(group_num)
+        return keyframe
+
+    def _set_decoded_keyframe(self, group_num, keyframe):
+        """
+        Keep the decoded keyframe pixels of a group, discarding the least recently used ones
+        """
+        self._decoded_keyframes[group_num] = keyframe
+        self._decoded_keyframes.move_to_end(group_num)
+        while len(self._decoded_keyframes) > DECODED_KEYFRAMES:
+            self._decoded_keyframes.popitem(last=False)
+
+    @staticmethod
+    def _get_delta_bytes(delta):
+        """
+        Returns the number of bytes held by a delta
+        """
+        tile_indices, tile_data = delta
+        return tile_indices.nbytes + len(tile_data)
+
+    def _resize_group(self, group, size_bytes):
+        """
+        Add a number of bytes to the size of a group and the cache
+        """
+        group.size_bytes += size_bytes
+        self._size_bytes += size_bytes
+
+    def _remove_group(self, group_num):
+        """
+        Remove a group and return the number of frames it held
+        """
+        group = self._groups.pop(group_num)
+        self._decoded_keyframes.pop(group_num, None)
+        self._changed_tile_fractions.pop(group.keyframe_num, None)
+        for frame_num in group.deltas:
+            self._changed_tile_fractions.pop(frame_num, None)
+        self._size_bytes -= group.size_bytes
+        return group.get_frame_count()
+
+    def _evict(self):
+        """
+        Remove least recently used groups until the cache fits within its byte budget
+        """
+        while self._size_bytes > self._max_bytes and self._groups:
+            self._evictions += self._remove_group(next(iter(self._groups)))
@@ -0,0 +1,348 @@
+"""
+PlotPlayer specific Disk Frame Cache Methods and Classes
+
+Public Constants:
+  * DEFAULT_CACHE_DIRECTORY - Default directory holding cached frames of every animation
+  * DEFAULT_DISK_CACHE_BYTES - Default byte budget shared by every animation in a directory
+  * DEFAULT_RESCAN_PUTS - Default number of stores between rescans of the directory size
+  * DEFAULT_RESCAN_SECONDS - Default seconds between rescans of the directory size
+
+Public Classes:
+  * DiskFrameCacheManager - Bounded LRU cache of rendered Animation Axes pixels held in memory
+      mapped files which outlive the player and are shared by every player process on the host
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+
+import numpy
+
+from ..data_models.cache_stats import CacheStats
+
+DEFAULT_CACHE_DIRECTORY = os.path.join(os.path.expanduser('~'), '.cache', 'plotplayer', 'frames')
+DEFAULT_DISK_CACHE_BYTES = 4 * 1024 ** 3
+# Each process only counts its own stores, so the directory is rescanned periodically to see
+#   the frames stored by other processes
+DEFAULT_RESCAN_PUTS = 64
+DEFAULT_RESCAN_SECONDS = 5.0
+
+FRAME_FILE_EXTENSION = '.npy'
+FRAME_FILE_NAME = '{:09d}' + FRAME_FILE_EXTENSION
+TEMPORARY_FILE_EXTENSION = '.tmp'
+TEMPORARY_FILE_NAME = '.{}.{}' + TEMPORARY_FILE_EXTENSION
+
+DIGEST_LENGTH = 24
+# Eviction frees some headroom so every store past the budget does not rescan the directory
+EVICTION_RATIO = 0.9
+# Temporary files older than this were left by a process which died while writing
+STALE_TEMPORARY_SECONDS = 600
+
+def _get_digest(value):
+    """
+    Returns a short hex digest identifying a JSON compatible value; numpy scalars are converted
+      to floats so every process computes the same digest
+    """
+    text = json.dumps(value, default=float, sort_keys=True)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:DIGEST_LENGTH]
+
+def _remove_file(file_name):
+    """
+    Remove a file which another process may have removed or still have mapped
+
+    Returns a boolean indicating whether the file was removed
+    """
+    try:
+        os.remove(file_name)
+    except OSError:
+        return False
+    return True
+
+class DiskFrameCacheManager(object):
+    """
+    Disk Frame Cache Manager for PlotPlayer RenderManagers
+
+    A drop in replacement for the FrameCacheManager which keeps rendered frames in a directory
+    so reopening the same animation, in this or any other process, reuses them instead of calling
+    the render function again.  Frames are stored under a user supplied fingerprint identifying
+    the animation (ie. a hash of its input data and drawing code) and the render signature of the
+    figure size, DPI and axis limits; changing either selects other frames instead of removing
+    the stored ones.  Because frames are keyed by the fingerprint, clear only forgets the in
+    process state when the RenderManager is reinitialized; purge deletes the stored frames.
+
+    Each frame is a .npy file which is loaded as a read only memory map, so cached frames are
+    paged in from the file system cache without being copied into the process first.  Files are
+    written to a temporary name and renamed into place, so readers in other processes never see
+    a partial frame.  Reading a frame updates its modification time; once the directory exceeds
+    the byte budget the frames with the oldest modification times are removed, by whichever
+    process notices first.  Each process adds its own stores to an estimate of the directory size
+    and rescans the directory every few stores or seconds, so the budget also holds for frames
+    stored by other processes.  Files being removed by another process or still mapped elsewhere
+    are skipped.
+
+    Public Methods:
+      * get - Returns the cached pixels for a frame number or None
+      * put - Stores the pixels for a frame number, evicting least recently used frames as needed
+      * contains - Returns a boolean indicating whether a frame number is cached
+      * clear - Forgets the in process state; the stored frames are kept
+      * purge - Deletes the stored frames of the fingerprint
+      * set_signature - Sets the render signature the cached frames belong to
+      * get_fingerprint - Returns the fingerprint identifying the animation
+      * set_fingerprint - Sets the fingerprint identifying the animation
+      * get_directory - Returns the directory holding the cached frames
+      * get_max_bytes - Returns the byte budget
+      * set_max_bytes - Sets the byte budget, evicting frames as needed
+      * get_stats - Returns a CacheStats instance describing cache usage
+      * reset_stats - Resets the hit, miss and eviction counters
+    """
+
+    _directory = None
+    _fingerprint = None
+    _signature = None
+    _max_bytes = None
+    _estimated_bytes = None
+    _rescan_puts = None
+    _rescan_seconds = None
+    _puts_since_scan = 0
+    _scan_time = None
+    _lock = None
+
+    _hits = 0
+    _misses = 0
+    _evictions = 0
+
+    #pylint: disable=too-many-arguments
+    def __init__(self, fingerprint, directory=DEFAULT_CACHE_DIRECTORY,
+                 max_bytes=DEFAULT_DISK_CACHE_BYTES, rescan_puts=DEFAULT_RESCAN_PUTS,
+                 rescan_seconds=DEFAULT_RESCAN_SECONDS):
+        """
+        Constructor
+
+        Parameters:
+          * fingerprint - String identifying the animation; frames stored under the same
+              fingerprint are assumed to be rendered from the same data and render function
+          * directory (optional) - Directory holding the cached frames; shared by every
+              fingerprint and process using it
+          * max_bytes (optional) - Maximum number of bytes of frames held in the directory
+          * rescan_puts (optional) - Number of stores after which the directory size is
+              rescanned to count frames stored by other processes
+          * rescan_seconds (optional) - Seconds after which the next store rescans the directory
+              size
+        """
+        self._directory = directory
+        self._fingerprint = fingerprint
+        self._max_bytes = max_bytes
+        self._rescan_puts = rescan_puts
+        self._rescan_seconds = rescan_seconds
+        self._estimated_bytes = None
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def get(self, frame_num):
+        """
+        Returns a read only memory map of the cached pixels for a frame number or None if it is
+          not cached
+
+        Parameters:
+          * frame_num - The frame number to look up
+        """
+        file_name = self._get_frame_file_name(frame_num)
+        try:
+            pixels = numpy.load(file_name, mmap_mode='r')
+            os.utime(file_name)
+        except (OSError, ValueError):
+            # Missing, evicted by another process or unreadable
+            self._misses += 1
+            return None
+
+        self._hits += 1
+        return pixels
+
+    def put(self, frame_num, pixels):
+        """
+        Store the pixels for a frame number
+
+        Parameters:
+          * frame_num - The frame number the pixels belong to
+          * pixels - A numpy array containing the rendered pixels
+        """
+        file_name = self._get_frame_file_name(frame_num)
+        directory = os.path.dirname(file_name)
+        os.makedirs(directory, exist_ok=True)
+
+        temporary_file_name = os.path.join(directory, TEMPORARY_FILE_NAME.format(
+            os.getpid(), uuid.uuid4().hex))
+        try:
+            with open(temporary_file_name, 'wb') as frame_file:
+                numpy.save(frame_file, numpy.ascontiguousarray(pixels))
+            # Sized before the rename since another process may evict the frame right after it
+            file_size = os.path.getsize(temporary_file_name)
+            os.replace(temporary_file_name, file_name)
+        except OSError:
+            # The frame is mapped by another process on a platform which forbids replacing it
+            _remove_file(temporary_file_name)
+            return
+
+        with self._lock:
+            self._puts_since_scan += 1
+            if (self._estimated_bytes is None or self._puts_since_scan >= self._rescan_puts or
+                    time.monotonic() - self._scan_time >= self._rescan_seconds):
+                self._set_estimated_bytes(self._get_directory_bytes())
+            else:
+                self._estimated_bytes += file_size
+            over_budget = self._estimated_bytes > self._max_bytes
+        if over_budget:
+            self._evict()
+
+    def contains(self, frame_num):
+        """
+        Returns a boolean indicating whether a frame number is cached
+        """
+        return os.path.isfile(self._get_frame_file_name(frame_num))
+
+    def clear(self):
+        """
+        Forget the in process state; called when the RenderManager is reinitialized.  The stored
+          frames belong to the fingerprint and are kept
+        """
+        with self._lock:
+            self._estimated_bytes = None
+
+    def purge(self):
+        """
+        Delete the stored frames of the fingerprint for every render signature
+        """
+        fingerprint_directory = os.path.join(self._directory, _get_digest(self._fingerprint))
+        for root, _, file_names in os.walk(fingerprint_directory, topdown=False):
+            for file_name in file_names:
+                _remove_file(os.path.join(root, file_name))
+            try:
+                os.rmdir(root)
+            except OSError:
+                pass
+        self.clear()
+
+    def set_signature(self, signature):
+        """
+        Set the render signature the cached frames belong to; frames stored with other
+          signatures are kept for when the signature changes back
+
+        Parameters:
+          * signature - A hashable value describing figure size, DPI and axis limits
+        """
+        self._signature = signature
+
+    def get_fingerprint(self):
+        """
+        Returns the fingerprint identifying the animation
+        """
+        return self._fingerprint
+
+    def set_fingerprint(self, fingerprint):
+        """
+        Set the fingerprint identifying the animation; set a new fingerprint whenever the
+          animation data or render function changes
+        """
+        self._fingerprint = fingerprint
+
+    def get_directory(self):
+        """
+        Returns the directory holding the cached frames
+        """
+        return self._directory
+
+    def get_max_bytes(self):
+        """
+        Returns the byte budget of the cache directory
+        """
+        return self._max_bytes
+
+    def set_max_bytes(self, max_bytes):
+        """
+        Set the byte budget of the cache directory, evicting least recently used frames as needed
+        """
+        self._max_bytes = max_bytes
+        self._evict()
+
+    def get_stats(self):
+        """
+        Returns a CacheStats instance describing cache usage; the frame count and size cover the
+          whole directory, including frames stored by other fingerprints and processes
+        """
+        frame_files = self._scan_frame_files()
+        size_bytes = sum(size for _, size, _ in frame_files)
+        return CacheStats(self._hits, self._misses, self._evictions, len(frame_files),
+                          size_bytes, self._max_bytes)
+
+    def reset_stats(self):
+        """
+        Reset the hit, miss and eviction counters
+        """
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def _get_frame_file_name(self, frame_num):
+        """
+        Returns the file name of a frame of the fingerprint and current render signature
+        """
+        return os.path.join(self._directory, _get_digest(self._fingerprint),
+                            _get_digest(self._signature), FRAME_FILE_NAME.format(frame_num))
+
+    def _scan_frame_files(self):
+        """
+        Returns a list of tuples of the file name, size and modification time of every frame in
+          the directory; temporary files abandoned by dead processes are removed
+        """
+        frame_files = []
+        now = time.time()
+        for root, _, file_names in os.walk(self._directory):
+            for file_name in file_names:
+                path = os.path.join(root, file_name)
+                try:
+                    file_stat = os.stat(path)
+                except OSError:
+                    continue
+
+                if file_name.endswith(FRAME_FILE_EXTENSION):
+                    frame_files.append((path, file_stat.st_size, file_stat.st_mtime))
+                elif (file_name.endswith(TEMPORARY_FILE_EXTENSION) and
+                      now - file_stat.st_mtime > STALE_TEMPORARY_SECONDS):
+                    _remove_file(path)
+        return frame_files
+
+    def _get_directory_bytes(self):
+        """
+        Returns the number of bytes of every frame in the directory
+        """
+        return sum(size for _, size, _ in self._scan_frame_files())
+
+    def _evict(self):
+        """
+        Remove the least recently used frames of the directory until it is below the byte budget
+        """
+        frame_files = sorted(self._scan_frame_files(), key=lambda frame_file: frame_file[2])
+        size_bytes = sum(size for _, size, _ in frame_files)
+        target_bytes = self._max_bytes * EVICTION_RATIO
+
+        for file_name, size, _ in frame_files:
+            if size_bytes <= target_bytes:
+                break
+            if _remove_file(file_name):
+                self._evictions += 1
+            # Counted as freed even if another process removed it first or still maps it
+            size_bytes -= size
+
+        with self._lock:
+            self._set_estimated_bytes(size_bytes)
+
+    def _set_estimated_bytes(self, size_bytes):
+        """
+        Set the estimated directory size from a scan of the directory; called with the lock held
+        """
+        self._estimated_bytes = size_bytes
+        self._puts_since_scan = 0
+        self._scan_time = time.monotonic()
@@ -0,0 +1,365 @@
+"""
+PlotPlayer specific Export Job Manager Methods and Classes
+
+Public Constants:
+  * EXPORT_VIDEO - Export format of a video file encoded by ffmpeg
+  * EXPORT_HTML - Export format of an HTML5 video tag
+  * EXPORT_JAVASCRIPT - Export format of a Javascript player
+  * JOB_QUEUED - State of a job waiting for earlier jobs to finish
+  * JOB_RUNNING - State of a job writing frames
+  * JOB_DONE - State of a job which wrote every frame
+  * JOB_CANCELLED - State of a job cancelled before it finished
+  * JOB_FAILED - State of a job which raised an exception
+
+Public Classes:
+  * ExportJob - A queued export of an animation with its progress
+  * ExportJobManager - Runs export jobs one after another on a background thread
+"""
+
+import os
+import queue
+import threading
+import time
+
+from ..data_models.export_progress import ExportProgress
+from ..validators import type_validation
+
+EXPORT_VIDEO = 'video'
+EXPORT_HTML = 'html'
+EXPORT_JAVASCRIPT = 'javascript'
+EXPORT_FORMATS = [EXPORT_VIDEO, EXPORT_HTML, EXPORT_JAVASCRIPT]
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_CANCELLED = 'cancelled'
+JOB_FAILED = 'failed'
+FINISHED_STATES = [JOB_DONE, JOB_CANCELLED, JOB_FAILED]
+
+_WORKER_THREAD_NAME = 'plotplayer-export'
+
+class ExportCancelled(Exception):
+    """
+    Raised from the frame callback of a cancelled job to abort its export
+    """
+
+class ExportJob(object):
+    """
+    Export of an animation to a file run by an ExportJobManager
+
+    The job holds a snapshot of the ExportManager taken when it was submitted, so the export
+    renders the animation as it was at that time on its own headless figure.  Progress is updated
+    by the worker thread and may be read from any thread.
+
+    Public Methods:
+      * get_file_name - Returns the file name the job writes to
+      * get_export_format - Returns the EXPORT format constant of the job
+      * get_state - Returns the JOB state constant of the job
+      * get_progress - Returns an ExportProgress instance of the job
+      * is_finished - Returns whether the job is done, cancelled or failed
+      * cancel - Request the job to stop; a partially written file is removed
+      * wait - Block until the job is finished
+    """
+
+    _export_handler = None
+    _export_format = None
+    _file_name = None
+    _animation_params = None
+    _lock = None
+    _finished = None
+    _state = JOB_QUEUED
+    _frames_done = 0
+    _frames_resumed = 0
+    _start_time = None
+    _render_start_time = None
+    _end_time = None
+    _error = None
+    _cancel_requested = False
+
+    def __init__(self, export_handler, export_format, file_name, animation_params):
+        """
+        Constructor
+
+        Parameters:
+          * export_handler - Instance of ExportManager used to write the file
+          * export_format - One of the EXPORT format constants
+          * file_name - The file name to write the export to
+          * animation_params - Instance of AnimationParams describing the frame range and rate
+        """
+        type_validation.assert_is_in(export_format, EXPORT_FORMATS, 'export_format')
+
+        self._export_handler = export_handler
+        self._export_format = export_format
+        self._file_name = file_name
+        self._animation_params = animation_params
+        self._lock = threading.Lock()
+        self._finished = threading.Event()
+
+    def get_file_name(self):
+        """
+        Returns the file name the job writes to
+        """
+        return self._file_name
+
+    def get_export_format(self):
+        """
+        Returns the EXPORT format constant of the job
+        """
+        return self._export_format
+
+    def get_state(self):
+        """
+        Returns the JOB state constant of the job
+        """
+        with self._lock:
+            return self._state
+
+    def get_total_frames(self):
+        """
+        Returns the number of frames the job writes
+        """
+        return (self._animation_params.max_frame_number -
+                self._animation_params.min_frame_number + 1)
+
+    def get_progress(self):
+        """
+        Returns an ExportProgress instance describing the current state of the job
+        """
+        with self._lock:
+            state = self._state
+            frames_done = self._frames_done
+            frames_resumed = self._frames_resumed
+            render_start_time = self._render_start_time
+            end_time = self._end_time
+            error = self._error
+
+        # Frames resumed from checkpoints were not rendered by this run, so they are left out of
+        # the rate and the remaining time
+        total_frames = self.get_total_frames()
+        frames_rendered = frames_done - frames_resumed
+        fps = 0.0
+        eta = None
+        if render_start_time is not None:
+            end_time = end_time if end_time is not None else time.perf_counter()
+            elapsed = end_time - render_start_time
+            if elapsed > 0 and frames_rendered > 0:
+                fps = frames_rendered / elapsed
+                eta = max(total_frames - frames_done, 0) / fps
+        if state in FINISHED_STATES:
+            eta = 0.0 if state == JOB_DONE else None
+
+        return ExportProgress(state, frames_done, total_frames, fps, eta, error, frames_resumed)
+
+    def is_finished(self):
+        """
+        Returns a boolean indicating whether the job is done, cancelled or failed
+        """
+        return self._finished.is_set()
+
+    def cancel(self):
+        """
+        Request the job to stop; a queued job never starts and a running job stops after the
+          frame being written and removes its partially written file.  The checkpoints of a
+          chunked video export are kept so the export can be resumed
+        """
+        with self._lock:
+            if self._state in FINISHED_STATES:
+                return
+            self._cancel_requested = True
+            if self._state == JOB_QUEUED:
+                self._finish(JOB_CANCELLED)
+
+    def wait(self, timeout=None):
+        """
+        Block until the job is finished
+
+        Parameters:
+          * timeout (optional) - Maximum number of seconds to wait
+
+        Returns a boolean indicating whether the job is finished
+        """
+        return self._finished.wait(timeout)
+
+    def run(self):
+        """
+        Write the export on the calling thread; called by the ExportJobManager worker thread
+        """
+        with self._lock:
+            if self._state != JOB_QUEUED:
+                return
+            self._state = JOB_RUNNING
+            self._start_time = time.perf_counter()
+            self._render_start_time = self._start_time
+
+        try:
+            if self._export_format == EXPORT_VIDEO:
+                self._export_handler.save_video(self._file_name, self._animation_params,
+                                                self._handle_frames_written,
+                                                self._handle_frames_resumed)
+            elif self._export_format == EXPORT_HTML:
+                self._export_handler.save_html(self._file_name, self._animation_params,
+                                               self._handle_frames_written)
+            else:
+                self._export_handler.save_javascript(self._file_name, self._animation_params,
+                                                     self._handle_frames_written)
+        except ExportCancelled:
+            self._remove_file()
+            with self._lock:
+                self._finish(JOB_CANCELLED)
+        #pylint: disable=broad-except
+        except Exception as error:
+            with self._lock:
+                self._error = error
+                self._finish(JOB_FAILED)
+        else:
+            with self._lock:
+                self._finish(JOB_DONE)
+
+    def _handle_frames_written(self, frame_count):
+        """
+        Frame callback of the ExportManager; counts written frames and aborts cancelled jobs
+        """
+        with self._lock:
+            self._frames_done += frame_count
+            cancel_requested = self._cancel_requested
+        if cancel_requested:
+            raise ExportCancelled()
+
+    def _handle_frames_resumed(self, frame_count):
+        """
+        Resume callback of the ExportManager; credits the frames of verified checkpoints and
+          restarts the rate measurement so it covers rendered frames only
+        """
+        with self._lock:
+            self._frames_done += frame_count
+            self._frames_resumed += frame_count
+            self._render_start_time = time.perf_counter()
+            cancel_requested = self._cancel_requested
+        if cancel_requested:
+            raise ExportCancelled()
+
+    def _finish(self, state):
+        """
+        Move the job to a finished state; the lock must be held
+        """
+        self._state = state
+        self._end_time = time.perf_counter()
+        self._finished.set()
+
+    def _remove_file(self):
+        """
+        Remove the partially written file of a cancelled job
+        """
+        if os.path.exists(self._file_name):
+            os.remove(self._file_name)
+
+class ExportJobManager(object):
+    """
+    Export Job Manager for PlotPlayer Windows
+
+    Jobs are run one after another on a single daemon thread started with the first job, so
+    exports never block the GUI thread.  Each job renders on its own headless figure through a
+    snapshot of the ExportManager; the render function is therefore called from the worker thread
+    (or from worker processes when exporting video in parallel) while the player keeps drawing on
+    the GUI thread.
+
+    Public Methods:
+      * submit - Queue an export of an animation and return its ExportJob
+      * get_jobs - Returns every submitted ExportJob
+      * get_active_jobs - Returns the queued and running ExportJobs
+      * clear_finished - Forget the finished ExportJobs
+      * cancel_all - Cancel every queued and running ExportJob
+      * shutdown - Cancel every ExportJob and stop the worker thread
+    """
+
+    _jobs = None
+    _queue = None
+    _thread = None
+    _lock = None
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self._jobs = []
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+
+    def submit(self, export_handler, export_format, file_name, animation_params):
+        """
+        Queue an export of an animation; jobs run in the order submitted
+
+        Parameters:
+          * export_handler - Instance of ExportManager used to write the file; a snapshot is
+              taken so later changes to the player do not affect the export
+          * export_format - One of the EXPORT format constants
+          * file_name - The file name to write the export to
+          * animation_params - Instance of AnimationParams describing the frame range and rate
+
+        Returns the queued ExportJob
+        """
+        job = ExportJob(export_handler.get_snapshot(), export_format, file_name,
+                        animation_params)
+
+        with self._lock:
+            self._jobs.append(job)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run_jobs, name=_WORKER_THREAD_NAME,
+                                                daemon=True)
+                self._thread.start()
+        self._queue.put(job)
+
+        return job
+
+    def get_jobs(self):
+        """
+        Returns a list of every submitted ExportJob in the order submitted
+        """
+        with self._lock:
+            return list(self._jobs)
+
+    def get_active_jobs(self):
+        """
+        Returns a list of the queued and running ExportJobs in the order submitted
+        """
+        return [job for job in self.get_jobs() if not job.is_finished()]
+
+    def clear_finished(self):
+        """
+        Forget the finished ExportJobs
+        """
+        with self._lock:
+            self._jobs = [job for job in self._jobs if not job.is_finished()]
+
+    def cancel_all(self):
+        """
+        Cancel every queued and running ExportJob
+        """
+        for job in self.get_jobs():
+            job.cancel()
+
+    def shutdown(self, wait=True):
+        """
+        Cancel every ExportJob and stop the worker thread
+
+        Parameters:
+          * wait (optional) - Boolean indicating whether to wait for the worker thread to stop
+        """
+        self.cancel_all()
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None:
+            self._queue.put(None)
+            if wait:
+                thread.join()
+
+    def _run_jobs(self):
+        """
+        Worker thread loop; runs queued jobs until shutdown
+        """
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            job.run()
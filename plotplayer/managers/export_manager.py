@@ -0,0 +1,977 @@
+"""
+PlotPlayer specific Export Manager Methods and Classes
+
+Public Constants:
+  * DEFAULT_FFMPEG_PATH - Default ffmpeg executable
+  * DEFAULT_VIDEO_CODEC - Default ffmpeg video codec
+  * LIVE_EXPORT_WARNING - Warning issued when an export falls back to the player figure
+  * BLANK_EXPORT_MESSAGE - Error message for background exports which render nothing
+
+Public Classes:
+  * ExportManager - Exports animations by rendering frames on a headless Agg canvas and streaming
+      the raw pixels into an ffmpeg process or base64 encoded images into HTML documents
+
+Public Methods:
+  * export_video_frames - Renders a range of frames on a headless canvas and encodes them with
+      ffmpeg
+  * split_frame_range - Splits a range of frames into contiguous segments
+  * concat_video_segments - Joins encoded video segments without re-encoding
+  * encode_video_segments - Joins losslessly encoded video segments into a single encoded video
+  * export_video_chunk - Encodes a checkpointed chunk of frames into a checkpoint directory
+  * get_checkpoint_directory - Returns the checkpoint directory of a chunked export
+"""
+
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import warnings
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from ..helpers import file_helper, headless_helper, html_helper
+from ..validators import type_validation
+
+DEFAULT_FFMPEG_PATH = 'ffmpeg'
+DEFAULT_VIDEO_CODEC = 'libx264'
+
+_SEGMENT_DIRECTORY_PREFIX = '.plotplayer_segments_'
+_SEGMENT_FILE_NAME = 'segment_{:05d}{}'
+# Parallel segments are stored losslessly and intra-only so the final encode sees exact frames
+_SEGMENT_EXTENSION = '.mov'
+_SEGMENT_CODEC = 'png'
+_PROGRESS_POLL_INTERVAL = 0.1
+_SEGMENT_LIST_FILE_NAME = 'segments.txt'
+_SEGMENT_LIST_ENTRY = "file '{}'\n"
+
+_HTML_VIDEO_DIRECTORY_PREFIX = '.plotplayer_html_'
+_HTML_VIDEO_FILE_NAME = 'video.mp4'
+_WRITE_TEXT_MODE = 'w'
+_READ_BINARY_MODE = 'rb'
+
+_CHECKPOINT_DIRECTORY_SUFFIX = '.chunks'
+_CHUNK_FILE_NAME = 'chunk_{:09d}_{:09d}{}'
+_PARTIAL_CHUNK_PREFIX = 'partial_'
+_MANIFEST_FILE_NAME = 'manifest.json'
+_MANIFEST_VERSION = 1
+
+LIVE_EXPORT_WARNING = ('draw_func drew nothing onto the headless export axes it was given, so the '
+                       'animation is exported from the player figure instead; draw_func must '
+                       'draw onto the axes it is given')
+BLANK_EXPORT_MESSAGE = ('draw_func drew nothing onto the headless export axes it was given; '
+                        'draw_func must draw onto the axes it is given')
+
+# Progress queue and cancel event of the export worker processes
+_WORKER_STATE = {}
+
+class _ExportCancelled(Exception):
+    """
+    Raised in an export worker process to abort its export once the export is cancelled
+    """
+
+class _RenderSnapshot(object):
+    """
+    Render function and canvas parameters captured from a RenderManager; stands in for the
+      RenderManager so an export is unaffected by the player being re-initialized
+    """
+
+    def __init__(self, render_func, canvas_params):
+        self._render_func = render_func
+        self._canvas_params = canvas_params
+
+    def get_render_func(self):
+        """
+        Returns the captured render function
+        """
+        return self._render_func
+
+    def get_canvas_params(self):
+        """
+        Returns the captured CanvasParams
+        """
+        return self._canvas_params
+
+    @staticmethod
+    def get_animation_axes():
+        """
+        Returns None; background exports never draw on the player figure
+        """
+        return None
+
+# yuv420p requires even frame dimensions
+_EVEN_DIMENSIONS_FILTER = 'pad=ceil(iw/2)*2:ceil(ih/2)*2'
+
+def _get_ffmpeg_command(file_name, width, height, frame_rate, ffmpeg_path, codec, extra_args):
+    """
+    Returns the ffmpeg command line encoding raw RGBA frames read from stdin
+    """
+    command = _get_ffmpeg_input(width, height, frame_rate, ffmpeg_path)
+    command.extend(_get_encoder_args(codec, extra_args))
+    command.append(file_name)
+    return command
+
+def _get_lossless_ffmpeg_command(file_name, width, height, frame_rate, ffmpeg_path):
+    """
+    Returns the ffmpeg command line storing raw RGBA frames read from stdin as lossless, intra-only
+      PNG frames
+    """
+    command = _get_ffmpeg_input(width, height, frame_rate, ffmpeg_path)
+    command.extend(['-an', '-c:v', _SEGMENT_CODEC, '-pix_fmt', 'rgba', file_name])
+    return command
+
+def _get_ffmpeg_input(width, height, frame_rate, ffmpeg_path):
+    """
+    Returns the start of an ffmpeg command line reading raw RGBA frames from stdin
+    """
+    return [ffmpeg_path, '-y', '-loglevel', 'error',
+            '-f', 'rawvideo', '-pix_fmt', 'rgba', '-s', '{}x{}'.format(width, height),
+            '-r', str(frame_rate), '-i', '-']
+
+def _get_encoder_args(codec, extra_args):
+    """
+    Returns the ffmpeg output arguments encoding RGBA frames with a codec
+    """
+    return (['-an', '-vf', _EVEN_DIMENSIONS_FILTER, '-c:v', codec, '-pix_fmt', 'yuv420p'] +
+            list(extra_args))
+
+#pylint: disable=too-many-arguments
+def export_video_frames(file_name, canvas_params, render_func, frame_nums, frame_rate,
+                        ffmpeg_path=DEFAULT_FFMPEG_PATH, codec=DEFAULT_VIDEO_CODEC, extra_args=(),
+                        frame_callback=None, pixel_callback=None):
+    """
+    Render frames on a headless canvas and stream their raw pixels into ffmpeg
+
+    Each frame is drawn into the Agg buffer and the buffer is written to the ffmpeg stdin as is;
+    no image files or per-frame copies are produced.
+
+    Parameters:
+      * file_name - The file name to write the video to
+      * canvas_params - Instance of CanvasParams describing the canvas to render on
+      * render_func - The external render function
+      * frame_nums - An iterable of the frame numbers to render in order
+      * frame_rate - Frame rate of the video
+      * ffmpeg_path (optional) - The ffmpeg executable
+      * codec (optional) - The ffmpeg video codec
+      * extra_args (optional) - Additional ffmpeg output arguments
+      * frame_callback (optional) - Callable receiving the number of frames just written; an
+          exception raised by it aborts the export
+      * pixel_callback (optional) - Callable receiving the raw RGBA buffer of each frame after it
+          is written
+
+    Returns the number of frames written
+    """
+    figure, animation_axes = headless_helper.create_headless_figure(canvas_params)
+    width, height = figure.canvas.get_width_height()
+    command = _get_ffmpeg_command(file_name, width, height, frame_rate, ffmpeg_path, codec,
+                                  extra_args)
+    return _write_headless_frames(command, figure, animation_axes, render_func, frame_nums,
+                                  frame_callback, pixel_callback)
+
+#pylint: disable=too-many-arguments
+def _write_headless_frames(command, figure, animation_axes, render_func, frame_nums,
+                           frame_callback=None, pixel_callback=None):
+    """
+    Render frames on a headless canvas and stream their raw pixels into an ffmpeg command; see
+      export_video_frames
+
+    Returns the number of frames written
+    """
+    def render_headless_frame(frame_num):
+        """
+        Render a frame onto the headless canvas
+        """
+        headless_helper.render_frame(figure, animation_axes, render_func, frame_num)
+
+    return _write_video_frames(command, figure.canvas, render_headless_frame, frame_nums,
+                               frame_callback, pixel_callback)
+
+def _write_video_frames(command, canvas, render_canvas_frame, frame_nums, frame_callback=None,
+                        pixel_callback=None):
+    """
+    Render frames onto an Agg based canvas and stream its raw pixels into an ffmpeg command
+      reading raw RGBA frames from stdin; see export_video_frames
+
+    Parameters:
+      * command - The ffmpeg command line
+      * canvas - The Agg based canvas the frames are rendered onto
+      * render_canvas_frame - Callable drawing a frame number onto the canvas
+
+    Returns the number of frames written
+    """
+    frames_written = 0
+    process = subprocess.Popen(command, stdin=subprocess.PIPE)
+    try:
+        for frame_num in frame_nums:
+            render_canvas_frame(frame_num)
+            process.stdin.write(canvas.buffer_rgba())
+            frames_written += 1
+            if pixel_callback is not None:
+                pixel_callback(canvas.buffer_rgba())
+            if frame_callback is not None:
+                frame_callback(1)
+    finally:
+        process.stdin.close()
+        return_code = process.wait()
+
+    if return_code != 0:
+        raise subprocess.CalledProcessError(return_code, command)
+    return frames_written
+
+def split_frame_range(frame_nums, segment_count):
+    """
+    Split a range of frame numbers into contiguous, nearly equal sized segments
+
+    Parameters:
+      * frame_nums - A range of frame numbers
+      * segment_count - The maximum number of segments
+
+    Returns a list of ranges covering frame_nums in order
+    """
+    total_frames = len(frame_nums)
+    segment_count = max(min(segment_count, total_frames), 1)
+    segment_size, remainder = divmod(total_frames, segment_count)
+
+    segments = []
+    start = 0
+    for segment_index in range(segment_count):
+        end = start + segment_size + (1 if segment_index < remainder else 0)
+        segments.append(frame_nums[start:end])
+        start = end
+    return segments
+
+def concat_video_segments(segment_file_names, file_name, ffmpeg_path=DEFAULT_FFMPEG_PATH):
+    """
+    Join encoded video segments in order using the ffmpeg concat demuxer; packets are copied
+      without re-encoding
+
+    Parameters:
+      * segment_file_names - A list of segment file names in playback order
+      * file_name - The file name to write the joined video to
+      * ffmpeg_path (optional) - The ffmpeg executable
+    """
+    command = _get_concat_input(segment_file_names, ffmpeg_path)
+    command.extend(['-c', 'copy', file_name])
+    subprocess.check_call(command)
+
+#pylint: disable=too-many-arguments
+def encode_video_segments(segment_file_names, file_name, frame_rate,
+                          ffmpeg_path=DEFAULT_FFMPEG_PATH, codec=DEFAULT_VIDEO_CODEC,
+                          extra_args=()):
+    """
+    Join losslessly encoded video segments in order using the ffmpeg concat demuxer and encode
+      them in a single pass; the encoder sees exactly the frames a serial export streams into it,
+      so the video is identical to a serial export
+
+    Parameters:
+      * segment_file_names - A list of segment file names in playback order
+      * file_name - The file name to write the video to
+      * frame_rate - Frame rate of the video
+      * ffmpeg_path (optional) - The ffmpeg executable
+      * codec (optional) - The ffmpeg video codec
+      * extra_args (optional) - Additional ffmpeg output arguments
+    """
+    command = _get_concat_input(segment_file_names, ffmpeg_path)
+    command.extend(['-r', str(frame_rate)])
+    command.extend(_get_encoder_args(codec, extra_args))
+    command.append(file_name)
+    subprocess.check_call(command)
+
+def _get_concat_input(segment_file_names, ffmpeg_path):
+    """
+    Write the ffmpeg concat list of a set of segments next to the first segment
+
+    Returns the start of an ffmpeg command line reading the segments through the concat demuxer
+    """
+    list_file_name = os.path.join(os.path.dirname(os.path.abspath(segment_file_names[0])),
+                                  _SEGMENT_LIST_FILE_NAME)
+    with open(list_file_name, 'w') as list_file:
+        for segment_file_name in segment_file_names:
+            escaped_file_name = os.path.abspath(segment_file_name).replace("'", "'\\''")
+            list_file.write(_SEGMENT_LIST_ENTRY.format(escaped_file_name))
+
+    return [ffmpeg_path, '-y', '-loglevel', 'error', '-f', 'concat', '-safe', '0',
+            '-i', list_file_name]
+
+def _init_export_worker(progress_queue, cancel_event):
+    """
+    Export worker process initializer; keeps the progress queue and cancel event shared with
+      the exporting process
+    """
+    _WORKER_STATE['progress_queue'] = progress_queue
+    _WORKER_STATE['cancel_event'] = cancel_event
+
+def _report_worker_frames(frame_count):
+    """
+    Frame callback of export worker processes; reports written frames to the exporting process
+      and aborts the export once it is cancelled
+    """
+    if _WORKER_STATE['cancel_event'].is_set():
+        raise _ExportCancelled()
+    _WORKER_STATE['progress_queue'].put(frame_count)
+
+def _export_segment_worker(file_name, canvas_params, render_func, frame_nums, frame_rate,
+                           ffmpeg_path):
+    """
+    Render a segment of frames in an export worker process and store them losslessly
+
+    Returns the number of frames written
+    """
+    figure, animation_axes = headless_helper.create_headless_figure(canvas_params)
+    width, height = figure.canvas.get_width_height()
+    command = _get_lossless_ffmpeg_command(file_name, width, height, frame_rate, ffmpeg_path)
+    return _write_headless_frames(command, figure, animation_axes, render_func, frame_nums,
+                                  _report_worker_frames)
+
+def _run_export_workers(max_workers, worker, worker_args, frame_callback=None,
+                        result_callback=None):
+    """
+    Run export workers in a process pool; the frames written by every worker are reported to the
+      frame callback as they are written, and an exception raised by the frame callback or a
+      worker cancels the remaining workers before their next frame
+
+    Parameters:
+      * max_workers - Number of worker processes
+      * worker - Picklable export worker function returning either the number of frames written
+          or a chunk manifest entry
+      * worker_args - A list of argument tuples, one per worker call
+      * frame_callback (optional) - Callable receiving the number of frames just written
+      * result_callback (optional) - Callable receiving the result of each worker call as soon as
+          it finishes
+
+    Returns a list of the worker results in the order of worker_args
+    """
+    progress_queue = multiprocessing.Queue()
+    cancel_event = multiprocessing.Event()
+
+    def report_frames(block):
+        """
+        Pass the frame counts queued by the workers on to the frame callback
+        """
+        frames_reported = 0
+        while True:
+            try:
+                frame_count = progress_queue.get(block, _PROGRESS_POLL_INTERVAL)
+            except queue.Empty:
+                return frames_reported
+            frames_reported += frame_count
+            if frame_callback is not None:
+                frame_callback(frame_count)
+            block = False
+
+    with ProcessPoolExecutor(max_workers, initializer=_init_export_worker,
+                             initargs=(progress_queue, cancel_event)) as executor:
+        futures = [executor.submit(worker, *args) for args in worker_args]
+        try:
+            frames_reported = 0
+            pending = futures
+            while pending:
+                done, pending = wait(pending, _PROGRESS_POLL_INTERVAL, FIRST_COMPLETED)
+                frames_reported += report_frames(False)
+                for future in done:
+                    if result_callback is not None:
+                        result_callback(future.result())
+
+            results = [future.result() for future in futures]
+            frames_written = sum(result if isinstance(result, int) else result['frames']
+                                 for result in results)
+            # Frame counts may still be in transit after the last worker returned
+            while frames_reported < frames_written:
+                frames_reported += report_frames(True)
+        except BaseException:
+            cancel_event.set()
+            raise
+        finally:
+            for future in futures:
+                future.cancel()
+
+    return results
+
+def get_checkpoint_directory(file_name):
+    """
+    Returns the directory holding the checkpointed chunks and manifest of a chunked export
+    """
+    return file_name + _CHECKPOINT_DIRECTORY_SUFFIX
+
+#pylint: disable=too-many-arguments
+def export_video_chunk(checkpoint_directory, canvas_params, render_func, frame_nums, frame_rate,
+                       ffmpeg_path=DEFAULT_FFMPEG_PATH, codec=DEFAULT_VIDEO_CODEC, extra_args=(),
+                       extension=str(), frame_callback=None):
+    """
+    Render a chunk of frames and encode them into the checkpoint directory; the chunk is written
+      under a partial name and renamed once ffmpeg finishes, so an interrupted chunk is never
+      mistaken for a complete one
+
+    Parameters:
+      * checkpoint_directory - The directory to write the chunk to
+      * canvas_params - Instance of CanvasParams describing the canvas to render on
+      * render_func - The external render function
+      * frame_nums - A range of the frame numbers of the chunk
+      * frame_rate - Frame rate of the video
+      * ffmpeg_path (optional) - The ffmpeg executable
+      * codec (optional) - The ffmpeg video codec
+      * extra_args (optional) - Additional ffmpeg output arguments
+      * extension (optional) - File extension of the video selecting its container format
+      * frame_callback (optional) - Callable receiving the number of frames just written; an
+          exception raised by it aborts the chunk
+
+    Returns the manifest entry of the chunk; a dictionary of its frame range, file name, SHA-256
+      of the file and SHA-256 of the pixels of its first and last frames
+    """
+    chunk_file_name = _CHUNK_FILE_NAME.format(frame_nums[0], frame_nums[-1], extension)
+    chunk_path = os.path.join(checkpoint_directory, chunk_file_name)
+    partial_path = os.path.join(checkpoint_directory, _PARTIAL_CHUNK_PREFIX + chunk_file_name)
+
+    frame_hashes = {}
+    def hash_boundary_frames(pixels):
+        """
+        Record the SHA-256 of the pixels of the first and last frames of the chunk
+        """
+        frame_index = frame_hashes.setdefault('count', 0)
+        if frame_index in (0, len(frame_nums) - 1):
+            frame_hashes[frame_nums[frame_index]] = hashlib.sha256(pixels).hexdigest()
+        frame_hashes['count'] = frame_index + 1
+
+    frames_written = export_video_frames(partial_path, canvas_params, render_func, frame_nums,
+                                         frame_rate, ffmpeg_path, codec, extra_args,
+                                         frame_callback, hash_boundary_frames)
+    os.replace(partial_path, chunk_path)
+
+    return {'first_frame': frame_nums[0], 'last_frame': frame_nums[-1],
+            'frames': frames_written, 'file_name': chunk_file_name,
+            'sha256': file_helper.get_file_sha256(chunk_path),
+            'first_frame_sha256': frame_hashes[frame_nums[0]],
+            'last_frame_sha256': frame_hashes[frame_nums[-1]]}
+
+def _get_checkpoint_settings(animation_params, canvas_params, codec, extra_args, chunk_frames):
+    """
+    Returns a JSON compatible dictionary of every setting the encoded chunks depend on; a
+      manifest written with different settings is discarded
+    """
+    def get_limits(limits):
+        """
+        Returns axis limits as a list of floats
+        """
+        return None if limits is None else [float(limit) for limit in limits]
+
+    return {'min_frame_number': animation_params.min_frame_number,
+            'max_frame_number': animation_params.max_frame_number,
+            'frame_rate': animation_params.frame_rate,
+            'codec': codec,
+            'extra_args': [str(arg) for arg in extra_args],
+            'chunk_frames': chunk_frames,
+            'figure_size': [float(size) for size in canvas_params.figure_size],
+            'dpi': float(canvas_params.dpi),
+            'animation_axes_rect': [float(value) for value in canvas_params.animation_axes_rect],
+            'animation_x_limits': get_limits(canvas_params.animation_x_limits),
+            'animation_y_limits': get_limits(canvas_params.animation_y_limits),
+            'axis_visible': bool(canvas_params.axis_visible)}
+
+def _load_manifest(checkpoint_directory, settings):
+    """
+    Returns the manifest of a checkpoint directory; a fresh manifest is returned and the
+      directory is emptied if the manifest is missing, unreadable or written with other settings
+    """
+    manifest_file_name = os.path.join(checkpoint_directory, _MANIFEST_FILE_NAME)
+    try:
+        with open(manifest_file_name) as manifest_file:
+            manifest = json.load(manifest_file)
+        if manifest.get('version') == _MANIFEST_VERSION and manifest.get('settings') == settings:
+            return manifest
+    except (OSError, ValueError):
+        pass
+
+    shutil.rmtree(checkpoint_directory, ignore_errors=True)
+    return {'version': _MANIFEST_VERSION, 'settings': settings, 'chunks': []}
+
+def _save_manifest(checkpoint_directory, manifest):
+    """
+    Atomically replace the manifest of a checkpoint directory
+    """
+    file_helper.save_file_atomic(os.path.join(checkpoint_directory, _MANIFEST_FILE_NAME),
+                                 json.dumps(manifest, indent=1, sort_keys=True))
+
+class ExportManager(object):
+    """
+    Export Manager for PlotPlayer AnimationManagers
+
+    The whole animation is rendered on a headless Agg canvas built from the RenderManager
+    CanvasParams, independent of the player window and its playback state.  The external render
+    function must draw onto the axes it is given.  Each export first renders its first frame on a
+    headless canvas; if nothing was drawn onto the axes the render function only draws on the
+    player figure, so the export falls back to rendering every frame through the RenderManager
+    on the player figure with a warning.  Background exports cannot draw on the player figure
+    and fail instead.
+
+    With more than one worker the frame range is split into contiguous segments which are rendered
+    by separate worker processes and stored as lossless, intra-only PNG frames.  The segments are
+    then encoded in a single pass, so the encoder sees exactly the frames of a serial export and
+    the video is identical to it whatever the codec.  The external render function must then be
+    picklable and must only depend on the frame number it is given.  Workers report every frame
+    written and stop before their next frame once the frame callback raises.
+
+    With a chunk size set, video is encoded in checkpointed chunks of that many frames next to
+    the output file.  A manifest records the frame range, file hash and first and last frame pixel
+    hashes of every complete chunk; a rerun of an interrupted export verifies the recorded chunks,
+    renders only the missing ranges and joins the chunks, so the result is identical to an
+    uninterrupted export.
+
+    Public Methods:
+      * save_video - Renders every frame of an animation and encodes them to a video file
+      * write_html - Writes an animation to a text file as an HTML5 video tag
+      * save_html - Saves an animation to file as an HTML5 video tag
+      * write_javascript - Writes an animation to a text file as a Javascript player
+      * save_javascript - Saves an animation to file as a Javascript player
+      * get_snapshot - Returns a copy exporting the current render function and canvas
+      * get_animation - Returns a Matplotlib FuncAnimation of an animation on a headless canvas
+      * get_used_player_figure - Returns whether the last export rendered on the player figure
+      * get_max_workers - Returns the number of worker processes used to export
+      * set_max_workers - Sets the number of worker processes used to export
+      * get_ffmpeg_path - Returns the ffmpeg executable
+      * set_ffmpeg_path - Sets the ffmpeg executable
+      * get_codec - Returns the ffmpeg video codec
+      * set_codec - Sets the ffmpeg video codec
+      * get_chunk_frames - Returns the number of frames per checkpointed chunk
+      * set_chunk_frames - Sets the number of frames per checkpointed chunk
+    """
+
+    _render_handler = None
+    _ffmpeg_path = None
+    _codec = None
+    _extra_args = None
+    _max_workers = 1
+    _chunk_frames = None
+    _used_player_figure = False
+
+    #pylint: disable=too-many-arguments
+    def __init__(self, render_handler, ffmpeg_path=DEFAULT_FFMPEG_PATH, codec=DEFAULT_VIDEO_CODEC,
+                 extra_args=(), max_workers=1, chunk_frames=None):
+        """
+        Constructor
+
+        Parameters:
+          * render_handler - Instance of RenderManager providing the render function and canvas
+          * ffmpeg_path (optional) - The ffmpeg executable
+          * codec (optional) - The ffmpeg video codec
+          * extra_args (optional) - Additional ffmpeg output arguments (ie. ['-crf', '18'])
+          * max_workers (optional) - Number of worker processes rendering segments in parallel;
+              None uses the CPU count
+          * chunk_frames (optional) - Number of frames per checkpointed chunk of a resumable video
+              export; None encodes video without checkpoints
+        """
+        self._render_handler = render_handler
+        self._ffmpeg_path = ffmpeg_path
+        self._codec = codec
+        self._extra_args = list(extra_args)
+        self._max_workers = max_workers
+        self._chunk_frames = chunk_frames
+
+    def save_video(self, file_name, animation_params, frame_callback=None, resume_callback=None):
+        """
+        Render every frame of an animation and encode them to a video file
+
+        Parameters:
+          * file_name - The file name to write the video to
+          * animation_params - Instance of AnimationParams describing the frame range and rate
+          * frame_callback (optional) - Callable receiving the number of frames just written;
+              worker processes report every frame.  An exception raised by it aborts the export
+          * resume_callback (optional) - Callable receiving the number of frames of a chunked
+              export taken over from the verified chunks of an earlier run; these frames are
+              reported to the frame callback instead if omitted
+
+        Returns the number of frames written
+        """
+        frame_nums = range(animation_params.min_frame_number,
+                           animation_params.max_frame_number + 1)
+        canvas_params = self._render_handler.get_canvas_params()
+        render_func = self._render_handler.get_render_func()
+
+        live_render = self._get_live_render(canvas_params, render_func, animation_params)
+        if live_render is not None:
+            canvas, render_canvas_frame = live_render
+            # The player canvas buffer holds physical pixels on HiDPI displays
+            width, height = canvas.get_width_height(physical=True)
+            command = _get_ffmpeg_command(file_name, width, height, animation_params.frame_rate,
+                                          self._ffmpeg_path, self._codec, self._extra_args)
+            return _write_video_frames(command, canvas, render_canvas_frame, frame_nums,
+                                       frame_callback)
+
+        if self._chunk_frames is not None:
+            return self._save_video_chunks(file_name, animation_params, frame_callback,
+                                           resume_callback)
+
+        max_workers = self._get_worker_count()
+        if max_workers <= 1 or len(frame_nums) <= 1:
+            return export_video_frames(file_name, canvas_params, render_func, frame_nums,
+                                       animation_params.frame_rate, self._ffmpeg_path, self._codec,
+                                       self._extra_args, frame_callback)
+
+        type_validation.assert_is_picklable(render_func, 'render_func')
+        segments = split_frame_range(frame_nums, max_workers)
+        segment_directory = tempfile.mkdtemp(prefix=_SEGMENT_DIRECTORY_PREFIX,
+                                             dir=os.path.dirname(os.path.abspath(file_name)))
+        try:
+            segment_file_names = [os.path.join(segment_directory,
+                                               _SEGMENT_FILE_NAME.format(index,
+                                                                         _SEGMENT_EXTENSION))
+                                  for index in range(len(segments))]
+            worker_args = [(segment_file_name, canvas_params, render_func, segment,
+                            animation_params.frame_rate, self._ffmpeg_path)
+                           for segment_file_name, segment in zip(segment_file_names, segments)]
+            frames_written = sum(_run_export_workers(len(segments), _export_segment_worker,
+                                                     worker_args, frame_callback))
+
+            encode_video_segments(segment_file_names, file_name, animation_params.frame_rate,
+                                  self._ffmpeg_path, self._codec, self._extra_args)
+        finally:
+            shutil.rmtree(segment_directory, ignore_errors=True)
+
+        return frames_written
+
+    def _save_video_chunks(self, file_name, animation_params, frame_callback=None,
+                           resume_callback=None):
+        """
+        Encode a video in checkpointed chunks, resuming from the chunks recorded in the manifest
+          of an earlier interrupted export, and join the chunks into the video file; the
+          checkpoint directory is removed once the video is written
+
+        Returns the number of frames in the video
+        """
+        frame_nums = range(animation_params.min_frame_number,
+                           animation_params.max_frame_number + 1)
+        canvas_params = self._render_handler.get_canvas_params()
+        render_func = self._render_handler.get_render_func()
+        extension = os.path.splitext(file_name)[1]
+
+        checkpoint_directory = get_checkpoint_directory(file_name)
+        settings = _get_checkpoint_settings(animation_params, canvas_params, self._codec,
+                                            self._extra_args, self._chunk_frames)
+        manifest = _load_manifest(checkpoint_directory, settings)
+        os.makedirs(checkpoint_directory, exist_ok=True)
+
+        chunks = [frame_nums[start:start + self._chunk_frames]
+                  for start in range(0, len(frame_nums), self._chunk_frames)]
+        completed = self._verify_chunks(checkpoint_directory, manifest['chunks'], chunks,
+                                        canvas_params, render_func)
+        manifest['chunks'] = [completed[first_frame] for first_frame in sorted(completed)]
+        _save_manifest(checkpoint_directory, manifest)
+
+        resumed_frames = sum(entry['frames'] for entry in completed.values())
+        if resume_callback is None:
+            resume_callback = frame_callback
+        if resume_callback is not None and resumed_frames > 0:
+            resume_callback(resumed_frames)
+
+        def record_chunk(entry):
+            """
+            Add a complete chunk to the manifest as soon as it is written
+            """
+            completed[entry['first_frame']] = entry
+            manifest['chunks'] = [completed[first_frame] for first_frame in sorted(completed)]
+            _save_manifest(checkpoint_directory, manifest)
+
+        missing_chunks = [chunk for chunk in chunks if chunk[0] not in completed]
+        max_workers = min(self._get_worker_count(), len(missing_chunks))
+        if max_workers <= 1:
+            for chunk in missing_chunks:
+                record_chunk(export_video_chunk(checkpoint_directory, canvas_params, render_func,
+                                                chunk, animation_params.frame_rate,
+                                                self._ffmpeg_path, self._codec, self._extra_args,
+                                                extension, frame_callback))
+        else:
+            type_validation.assert_is_picklable(render_func, 'render_func')
+            worker_args = [(checkpoint_directory, canvas_params, render_func, chunk,
+                            animation_params.frame_rate, self._ffmpeg_path, self._codec,
+                            self._extra_args, extension, _report_worker_frames)
+                           for chunk in missing_chunks]
+            _run_export_workers(max_workers, export_video_chunk, worker_args, frame_callback,
+                                record_chunk)
+
+        chunk_file_names = [os.path.join(checkpoint_directory, completed[chunk[0]]['file_name'])
+                            for chunk in chunks]
+        concat_video_segments(chunk_file_names, file_name, self._ffmpeg_path)
+        shutil.rmtree(checkpoint_directory, ignore_errors=True)
+
+        return len(frame_nums)
+
+    #pylint: disable=too-many-arguments
+    @staticmethod
+    def _verify_chunks(checkpoint_directory, entries, chunks, canvas_params, render_func):
+        """
+        Verify the chunks recorded in a manifest; a chunk is kept only if it covers one of the
+          expected frame ranges, its file matches the recorded SHA-256 and its first and last
+          frames still render to the recorded pixels
+
+        Returns a dictionary of the verified manifest entries keyed by first frame number
+        """
+        expected_ranges = {chunk[0]: chunk[-1] for chunk in chunks}
+        figure = animation_axes = None
+
+        completed = {}
+        for entry in entries:
+            first_frame = entry['first_frame']
+            if expected_ranges.get(first_frame) != entry['last_frame']:
+                continue
+            chunk_path = os.path.join(checkpoint_directory, entry['file_name'])
+            if (not os.path.isfile(chunk_path) or
+                    file_helper.get_file_sha256(chunk_path) != entry['sha256']):
+                continue
+
+            if figure is None:
+                figure, animation_axes = headless_helper.create_headless_figure(canvas_params)
+            frames_match = True
+            for frame_num, frame_hash_key in ((first_frame, 'first_frame_sha256'),
+                                              (entry['last_frame'], 'last_frame_sha256')):
+                headless_helper.render_frame(figure, animation_axes, render_func, frame_num)
+                frame_hash = hashlib.sha256(figure.canvas.buffer_rgba()).hexdigest()
+                frames_match = frames_match and frame_hash == entry[frame_hash_key]
+            if frames_match:
+                completed[first_frame] = entry
+        return completed
+
+    def _get_live_render(self, canvas_params, render_func, animation_params):
+        """
+        Render the first frame on a headless canvas to check the render function draws onto the
+          axes it is given
+
+        Parameters:
+          * canvas_params - Instance of CanvasParams describing the export canvas
+          * render_func - The external render function
+          * animation_params - Instance of AnimationParams describing the frame range
+
+        Returns None if the render function drew onto the headless axes; otherwise a tuple of the
+          player canvas and a callable rendering a frame number onto it through the RenderManager
+        """
+        self._used_player_figure = False
+        figure, animation_axes = headless_helper.create_headless_figure(canvas_params)
+        headless_helper.render_frame(figure, animation_axes, render_func,
+                                     animation_params.min_frame_number)
+        if headless_helper.has_drawn_artists(animation_axes):
+            return None
+
+        player_axes = self._render_handler.get_animation_axes()
+        if player_axes is None:
+            raise ValueError(BLANK_EXPORT_MESSAGE)
+        warnings.warn(LIVE_EXPORT_WARNING)
+        self._used_player_figure = True
+
+        total_frames = animation_params.max_frame_number - animation_params.min_frame_number
+        def render_player_frame(frame_num):
+            """
+            Render a frame onto the player figure through the RenderManager
+            """
+            self._render_handler.render(frame_num, total_frames, force_draw=True)
+
+        return player_axes.figure.canvas, render_player_frame
+
+    def _get_worker_count(self):
+        """
+        Returns the number of worker processes to export with
+        """
+        if self._max_workers is None:
+            return os.cpu_count() or 1
+        return self._max_workers
+
+    def get_snapshot(self):
+        """
+        Returns a copy of the ExportManager bound to the current render function and canvas
+          parameters; used to export in the background while the player keeps changing
+        """
+        render_snapshot = _RenderSnapshot(self._render_handler.get_render_func(),
+                                          self._render_handler.get_canvas_params())
+        return ExportManager(render_snapshot, self._ffmpeg_path, self._codec, self._extra_args,
+                             self._max_workers, self._chunk_frames)
+
+    def write_html(self, output_file, animation_params, frame_callback=None):
+        """
+        Encode an animation to a temporary video file and write an HTML5 video tag embedding it;
+          the video is base64 encoded and written in chunks so memory use does not grow with the
+          animation length
+
+        Parameters:
+          * output_file - Text file object to write the HTML to
+          * animation_params - Instance of AnimationParams describing the frame range and rate
+          * frame_callback (optional) - Callable receiving the number of frames just written; an
+              exception raised by it aborts the export
+
+        Returns the number of frames written
+        """
+        canvas_params = self._render_handler.get_canvas_params()
+        width = int(round(canvas_params.figure_size[0] * canvas_params.dpi))
+        height = int(round(canvas_params.figure_size[1] * canvas_params.dpi))
+
+        video_directory = tempfile.mkdtemp(prefix=_HTML_VIDEO_DIRECTORY_PREFIX)
+        try:
+            video_file_name = os.path.join(video_directory, _HTML_VIDEO_FILE_NAME)
+            frames_written = self.save_video(video_file_name, animation_params, frame_callback)
+            with open(video_file_name, _READ_BINARY_MODE) as video_file:
+                html_helper.write_html_video(output_file, video_file, width, height)
+        finally:
+            shutil.rmtree(video_directory, ignore_errors=True)
+
+        return frames_written
+
+    def save_html(self, file_name, animation_params, frame_callback=None):
+        """
+        Save an animation to file as an HTML5 video tag; see write_html
+
+        Parameters:
+          * file_name - The file name to write the HTML to
+          * animation_params - Instance of AnimationParams describing the frame range and rate
+          * frame_callback (optional) - Callable receiving the number of frames just written
+
+        Returns the number of frames written
+        """
+        with open(file_name, _WRITE_TEXT_MODE) as html_file:
+            return self.write_html(html_file, animation_params, frame_callback)
+
+    def write_javascript(self, output_file, animation_params, frame_callback=None):
+        """
+        Write an animation as a Javascript player; each frame is rendered on a headless canvas,
+          encoded as PNG and appended to the output before the next frame is rendered so memory
+          use does not grow with the animation length
+
+        Parameters:
+          * output_file - Text file object to write the HTML to
+          * animation_params - Instance of AnimationParams describing the frame range and rate
+          * frame_callback (optional) - Callable receiving the number of frames just written; an
+              exception raised by it aborts the export
+
+        Returns the number of frames written
+        """
+        canvas_params = self._render_handler.get_canvas_params()
+        render_func = self._render_handler.get_render_func()
+        live_render = self._get_live_render(canvas_params, render_func, animation_params)
+        if live_render is None:
+            figure, animation_axes = headless_helper.create_headless_figure(canvas_params)
+            canvas = figure.canvas
+
+            def render_canvas_frame(frame_num):
+                """
+                Render a frame onto the headless canvas
+                """
+                headless_helper.render_frame(figure, animation_axes, render_func, frame_num)
+        else:
+            canvas, render_canvas_frame = live_render
+        width, height = canvas.get_width_height()
+
+        frames_written = 0
+        png_file = io.BytesIO()
+        player_id = html_helper.get_player_id()
+        html_helper.write_javascript_header(output_file, width, height, player_id)
+        for frame_num in range(animation_params.min_frame_number,
+                               animation_params.max_frame_number + 1):
+            png_file.seek(0)
+            png_file.truncate()
+            render_canvas_frame(frame_num)
+            headless_helper.write_canvas_png(canvas, png_file)
+            html_helper.write_javascript_frame(output_file, png_file.getvalue(), player_id)
+            frames_written += 1
+            if frame_callback is not None:
+                frame_callback(1)
+        html_helper.write_javascript_footer(output_file, animation_params.frame_rate, player_id)
+
+        return frames_written
+
+    def save_javascript(self, file_name, animation_params, frame_callback=None):
+        """
+        Save an animation to file as a Javascript player; see write_javascript
+
+        Parameters:
+          * file_name - The file name to write the HTML to
+          * animation_params - Instance of AnimationParams describing the frame range and rate
+          * frame_callback (optional) - Callable receiving the number of frames just written
+
+        Returns the number of frames written
+        """
+        with open(file_name, _WRITE_TEXT_MODE) as html_file:
+            return self.write_javascript(html_file, animation_params, frame_callback)
+
+    def get_animation(self, animation_params):
+        """
+        Returns a Matplotlib FuncAnimation covering every frame of an animation; the animation is
+          drawn on a headless canvas so it never drives or redraws the player window
+
+        Parameters:
+          * animation_params - Instance of AnimationParams describing the frame range and rate
+        """
+        # Imported on first use; matplotlib.animation is only needed for HTML/Javascript export
+        from matplotlib.animation import FuncAnimation
+
+        figure, animation_axes = headless_helper.create_headless_figure(
+            self._render_handler.get_canvas_params())
+        render_func = self._render_handler.get_render_func()
+
+        def render_animation_frame(frame_num):
+            """
+            Render a frame of the FuncAnimation onto the headless Animation Axes
+            """
+            render_func(frame_num, animation_axes)
+
+        frame_nums = range(animation_params.min_frame_number,
+                           animation_params.max_frame_number + 1)
+        interval = max(int(1000 / animation_params.frame_rate), 1)
+        return FuncAnimation(figure, render_animation_frame, frame_nums, interval=interval,
+                             repeat=False)
+
+    def get_used_player_figure(self):
+        """
+        Returns a boolean indicating whether the last export fell back to rendering every frame
+          on the player figure, leaving its last frame displayed
+        """
+        return self._used_player_figure
+
+    def get_max_workers(self):
+        """
+        Returns the number of worker processes used to export
+        """
+        return self._max_workers
+
+    def set_max_workers(self, max_workers):
+        """
+        Set the number of worker processes used to export; None uses the CPU count
+        """
+        self._max_workers = max_workers
+
+    def get_ffmpeg_path(self):
+        """
+        Returns the ffmpeg executable
+        """
+        return self._ffmpeg_path
+
+    def set_ffmpeg_path(self, ffmpeg_path):
+        """
+        Set the ffmpeg executable
+        """
+        self._ffmpeg_path = ffmpeg_path
+
+    def get_codec(self):
+        """
+        Returns the ffmpeg video codec
+        """
+        return self._codec
+
+    def set_codec(self, codec):
+        """
+        Set the ffmpeg video codec
+        """
+        self._codec = codec
+
+    def get_chunk_frames(self):
+        """
+        Returns the number of frames per checkpointed chunk; None if video is encoded without
+          checkpoints
+        """
+        return self._chunk_frames
+
+    def set_chunk_frames(self, chunk_frames):
+        """
+        Set the number of frames per checkpointed chunk of a resumable video export; None encodes
+          video without checkpoints
+        """
+        if chunk_frames is not None:
+            type_validation.assert_is_int(chunk_frames, 'chunk_frames')
+        self._chunk_frames = chunk_frames
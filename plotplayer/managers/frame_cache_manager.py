@@ -0,0 +1,153 @@
+"""
+PlotPlayer specific Frame Cache Methods and Classes
+
+Public Constants:
+  * DEFAULT_CACHE_BYTES - Default byte budget for a FrameCacheManager
+
+Public Classes:
+  * FrameCacheManager - Bounded LRU cache of rendered Animation Axes pixels keyed by frame number
+"""
+
+from collections import OrderedDict
+
+from ..data_models.cache_stats import CacheStats
+
+DEFAULT_CACHE_BYTES = 512 * 1024 * 1024
+
+class FrameCacheManager(object):
+    """
+    Frame Cache Manager for PlotPlayer RenderManagers
+
+    Cached frames are only valid for the figure size, DPI and axis limits they were rendered with;
+    the RenderManager reports these through set_signature and the cache is cleared whenever they
+    change.
+
+    Public Methods:
+      * get - Returns the cached pixels for a frame number or None
+      * put - Stores the pixels for a frame number, evicting least recently used frames as needed
+      * contains - Returns a boolean indicating whether a frame number is cached
+      * clear - Removes all cached frames
+      * set_signature - Sets the render signature the cached frames belong to
+      * get_max_bytes - Returns the byte budget
+      * set_max_bytes - Sets the byte budget, evicting frames as needed
+      * get_stats - Returns a CacheStats instance describing cache usage
+      * reset_stats - Resets the hit, miss and eviction counters
+    """
+
+    _max_bytes = None
+    _frames = None
+    _size_bytes = 0
+    _signature = None
+
+    _hits = 0
+    _misses = 0
+    _evictions = 0
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        """
+        Constructor
+
+        Parameters:
+          * max_bytes (optional) - Maximum number of pixel bytes held by the cache
+        """
+        self._max_bytes = max_bytes
+        self._frames = OrderedDict()
+        self._size_bytes = 0
+        self._signature = None
+        self.reset_stats()
+
+    def get(self, frame_num):
+        """
+        Returns the cached pixels for a frame number or None if it is not cached
+
+        Parameters:
+          * frame_num - The frame number to look up
+        """
+        pixels = self._frames.get(frame_num)
+        if pixels is None:
+            self._misses += 1
+            return None
+
+        self._frames.move_to_end(frame_num)
+        self._hits += 1
+        return pixels
+
+    def put(self, frame_num, pixels):
+        """
+        Store the pixels for a frame number
+
+        Parameters:
+          * frame_num - The frame number the pixels belong to
+          * pixels - A numpy array containing the rendered pixels
+        """
+        if pixels.nbytes > self._max_bytes:
+            return
+
+        previous = self._frames.pop(frame_num, None)
+        if previous is not None:
+            self._size_bytes -= previous.nbytes
+
+        self._frames[frame_num] = pixels
+        self._size_bytes += pixels.nbytes
+        self._evict()
+
+    def contains(self, frame_num):
+        """
+        Returns a boolean indicating whether a frame number is cached
+        """
+        return frame_num in self._frames
+
+    def clear(self):
+        """
+        Remove all cached frames
+        """
+        self._frames.clear()
+        self._size_bytes = 0
+
+    def set_signature(self, signature):
+        """
+        Set the render signature the cached frames belong to; clears the cache if it changed
+
+        Parameters:
+          * signature - A hashable value describing figure size, DPI and axis limits
+        """
+        if signature != self._signature:
+            self.clear()
+            self._signature = signature
+
+    def get_max_bytes(self):
+        """
+        Returns the byte budget of the cache
+        """
+        return self._max_bytes
+
+    def set_max_bytes(self, max_bytes):
+        """
+        Set the byte budget of the cache, evicting least recently used frames as needed
+        """
+        self._max_bytes = max_bytes
+        self._evict()
+
+    def get_stats(self):
+        """
+        Returns a CacheStats instance describing cache usage
+        """
+        return CacheStats(self._hits, self._misses, self._evictions, len(self._frames),
+                          self._size_bytes, self._max_bytes)
+
+    def reset_stats(self):
+        """
+        Reset the hit, miss and eviction counters
+        """
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def _evict(self):
+        """
+        Remove least recently used frames until the cache fits within its byte budget
+        """
+        while self._size_bytes > self._max_bytes and self._frames:
+            _, pixels = self._frames.popitem(last=False)
+            self._size_bytes -= pixels.nbytes
+            self._evictions += 1
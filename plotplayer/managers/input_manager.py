@@ -2,7 +2,8 @@
 PlotPlayer specific Input Manager Methods and Classes
 
 Notes :
-  * This manager overrides the default Matplotlib Keyboard Shortcuts for the following :
+  * This manager overrides the default Matplotlib Keyboard Shortcuts for the following once the
+      first InputManager is created :
     - Forward -> Right Directional Button
     - Back -> Left Directional Button
     - Home -> Home Button
@@ -11,12 +12,17 @@ Public Classes :
   * InputManager - Attaches to appropriate input events and handles their events.
 
 Private Methods :
+  * _override_matplotlib_keymaps - Removes PlotPlayer keys from the Matplotlib keymaps
   * _handle_save_key_combo - Handles Save key combo mappings
   * _handle_navigation_keys - Handles Navigation key mappings
+  * _handle_playback_rate_keys - Handles Playback Rate key mappings
   * _handle_visibility_keys - Handles Visibility key mappings
 """
 
-from matplotlib.pyplot import rcParams
+from matplotlib import rcParams
+
+from .animation_manager import SEEK_ORIGIN_USER
+from .export_job_manager import EXPORT_HTML, EXPORT_JAVASCRIPT, EXPORT_VIDEO
 
 SKIP_BACK_BUTTON = 'left'
 SKIP_AHEAD_BUTTON = 'right'
@@ -27,10 +33,16 @@ GOTO_BEGINNING_BUTTON = 'home'
 GOTO_END_BUTTON = 'end'
 TOGGLE_SLIDER_BUTTON = 't'
 TOGGLE_TOOLBAR_BUTTON = 'm'
+TOGGLE_STATS_BUTTON = 'i'
 SAVE_BUTTON = 'd'
 SAVE_VIDEO_BUTTON = 'v'
 SAVE_HTML_BUTTON = 'h'
 SAVE_JAVASCRIPT_BUTTON = 'j'
+CANCEL_EXPORTS_BUTTON = 'c'
+FASTER_BUTTON = ']'
+SLOWER_BUTTON = '['
+REVERSE_BUTTON = 'R'
+NORMAL_SPEED_BUTTON = '='
 
 KEYS_TRIGGER_STOP = [SKIP_BACK_BUTTON, SKIP_AHEAD_BUTTON, JUMP_BACK_BUTTON, JUMP_AHEAD_BUTTON,
                      GOTO_BEGINNING_BUTTON, GOTO_END_BUTTON]
@@ -43,13 +55,22 @@ MATPLOTLIB_FORWARD_MAPPING = 'keymap.forward'
 MATPLOTLIB_BACK_MAPPING = 'keymap.back'
 MATPLOTLIB_HOME_MAPPING = 'keymap.home'
 
-rcParams[MATPLOTLIB_FORWARD_MAPPING].remove(SKIP_AHEAD_BUTTON)
-rcParams[MATPLOTLIB_BACK_MAPPING].remove(SKIP_BACK_BUTTON)
-rcParams[MATPLOTLIB_HOME_MAPPING].remove(GOTO_BEGINNING_BUTTON)
+OVERRIDDEN_KEYMAPS = [(MATPLOTLIB_FORWARD_MAPPING, SKIP_AHEAD_BUTTON),
+                      (MATPLOTLIB_BACK_MAPPING, SKIP_BACK_BUTTON),
+                      (MATPLOTLIB_HOME_MAPPING, GOTO_BEGINNING_BUTTON)]
+
+def _override_matplotlib_keymaps():
+    """
+    Remove the PlotPlayer keys from the default Matplotlib keymaps; done when the first
+      InputManager is created instead of on import so importing PlotPlayer leaves rcParams intact
+    """
+    for keymap_name, key in OVERRIDDEN_KEYMAPS:
+        if key in rcParams[keymap_name]:
+            rcParams[keymap_name].remove(key)
 
 def _handle_save_key_combo(key, animation_handler):
     """
-    Handle save key inputs
+    Handle save key inputs; exports are queued as background jobs so the player stays responsive
 
     Parmeters:
       * key - A string representation of the pressed key
@@ -61,11 +82,13 @@ def _handle_save_key_combo(key, animation_handler):
     handled = True
 
     if key == SAVE_VIDEO_BUTTON:
-        animation_handler.save_video()
+        animation_handler.submit_export(EXPORT_VIDEO)
     elif key == SAVE_HTML_BUTTON:
-        animation_handler.save_html()
+        animation_handler.submit_export(EXPORT_HTML)
     elif key == SAVE_JAVASCRIPT_BUTTON:
-        animation_handler.save_javascript()
+        animation_handler.submit_export(EXPORT_JAVASCRIPT)
+    elif key == CANCEL_EXPORTS_BUTTON:
+        animation_handler.cancel_exports()
     else:
         handled = False
 
@@ -89,19 +112,22 @@ def _handle_navigation_keys(key, animation_handler, skip_size, jump_size):
     if key in KEYS_TRIGGER_STOP:
         animation_handler.stop()
 
-    current_frame_num = animation_handler.get_frame_number()
+    # Relative seeks build on any pending seek so held keys keep advancing between renders
+    current_frame_num = animation_handler.get_target_frame_number()
+    min_frame_num = animation_handler.get_min_frame_number()
+    max_frame_num = animation_handler.get_max_frame_number()
     if key == SKIP_BACK_BUTTON:
-        animation_handler.render(current_frame_num - skip_size)
+        animation_handler.request_seek(max(current_frame_num - skip_size, min_frame_num))
     elif key == SKIP_AHEAD_BUTTON:
-        animation_handler.render(current_frame_num + skip_size)
+        animation_handler.request_seek(min(current_frame_num + skip_size, max_frame_num))
     elif key == JUMP_BACK_BUTTON:
-        animation_handler.render(current_frame_num - jump_size)
+        animation_handler.request_seek(max(current_frame_num - jump_size, min_frame_num))
     elif key == JUMP_AHEAD_BUTTON:
-        animation_handler.render(current_frame_num + jump_size)
+        animation_handler.request_seek(min(current_frame_num + jump_size, max_frame_num))
     elif key == GOTO_BEGINNING_BUTTON:
-        animation_handler.render(animation_handler.get_min_frame_number())
+        animation_handler.request_seek(min_frame_num)
     elif key == GOTO_END_BUTTON:
-        animation_handler.render(animation_handler.get_max_frame_number() - 1)
+        animation_handler.request_seek(max_frame_num - 1)
     elif key in TOGGLE_PLAY_BUTTON:
         animation_handler.toggle_playback()
     else:
@@ -109,13 +135,41 @@ def _handle_navigation_keys(key, animation_handler, skip_size, jump_size):
 
     return handled
 
-def _handle_visibility_keys(key, window_handler, render_handler):
+def _handle_playback_rate_keys(key, animation_handler):
+    """
+    Handle playback rate key inputs; the rate changes while playback continues
+
+    Parameters:
+      * key - A string representation of the pressed key
+      * animation_handler - An instance of AnimationManager class to be called based on the key
+          inputs
+
+    Returns a boolean indicating whether they key press is handled
+    """
+    handled = True
+
+    if key == FASTER_BUTTON:
+        animation_handler.faster()
+    elif key == SLOWER_BUTTON:
+        animation_handler.slower()
+    elif key == REVERSE_BUTTON:
+        animation_handler.reverse()
+    elif key == NORMAL_SPEED_BUTTON:
+        animation_handler.set_playback_rate(1.0)
+    else:
+        handled = False
+
+    return handled
+
+def _handle_visibility_keys(key, window_handler, render_handler, animation_handler):
     """
     Handle visibility toggle key inputs
 
     Parameters:
       * window_handler - An instance of WindowManager class to be called based on key inputs
       * render_handler - An instance of RenderManager class to be called based on key inputs
+      * animation_handler - An instance of AnimationManager class to be called based on key
+          inputs
 
     Returns a boolean indicating whether they key press is handled
     """
@@ -125,6 +179,8 @@ def _handle_visibility_keys(key, window_handler, render_handler):
         render_handler.toggle_slider()
     elif key == TOGGLE_TOOLBAR_BUTTON:
         window_handler.toggle_toolbar()
+    elif key == TOGGLE_STATS_BUTTON:
+        animation_handler.toggle_stats_hud()
     else:
         handled = False
 
@@ -149,6 +205,10 @@ class InputManager(object):
           key_release_event.
       * _handle_mouse_button_down - Method to handle mouse button down events; attached to
           Matplotlib button_press_event.
+      * _handle_mouse_release - Method to handle mouse button up events; attached to Matplotlib
+          button_release_event.
+      * _handle_mouse_motion - Method to handle mouse motion events; attached to Matplotlib
+          motion_notify_event.
 
     Overriding Default Keymappings:
       * Provide a method as key_press_handler parameter in constructor; this method will be called
@@ -169,6 +229,7 @@ class InputManager(object):
 
     _handler_enabled = False
     _save_button_pressed = False
+    _scrub_frame_num = None
 
     #pylint: disable=too-many-arguments
     def __init__(self, window_handler, render_handler, animation_handler,
@@ -201,10 +262,13 @@ class InputManager(object):
         self._key_release_handlers = []
         self._mouse_press_handlers = []
 
+        _override_matplotlib_keymaps()
         self.set_enabled(enabled)
 
         figure = self._window_handler.get_figure()
         figure.canvas.mpl_connect('button_press_event', self._handle_mouse_press)
+        figure.canvas.mpl_connect('button_release_event', self._handle_mouse_release)
+        figure.canvas.mpl_connect('motion_notify_event', self._handle_mouse_motion)
         figure.canvas.mpl_connect('key_press_event', self._handle_key_press)
         figure.canvas.mpl_connect('key_release_event', self._handle_key_release)
 
@@ -325,7 +389,11 @@ class InputManager(object):
         if _handle_navigation_keys(key, self._animation_handler, self._skip_size, self._jump_size):
             return
 
-        if _handle_visibility_keys(key, self._window_handler, self._render_handler):
+        if _handle_playback_rate_keys(key, self._animation_handler):
+            return
+
+        if _handle_visibility_keys(key, self._window_handler, self._render_handler,
+                                   self._animation_handler):
             return
 
         if key == SAVE_BUTTON:
@@ -367,6 +435,44 @@ class InputManager(object):
         if event_data.inaxes == self._render_handler.get_slider_axes():
             self._animation_handler.stop()
 
+    def _handle_mouse_release(self, event_data):
+        """
+        Handle Matplotlib button_release_event for WindowManager Instance; renders the frame a
+          thumbnail previewed scrub ended on
+
+        Parameters:
+          * event_data - An object representing the mouse release event data
+        """
+        if self._scrub_frame_num is None:
+            return
+
+        frame_num = self._scrub_frame_num
+        self._scrub_frame_num = None
+        self._animation_handler.get_thumbnail_manager().hide_thumbnail()
+        if self._handler_enabled:
+            self._animation_handler.request_seek(frame_num, SEEK_ORIGIN_USER)
+
+    def _handle_mouse_motion(self, event_data):
+        """
+        Handle Matplotlib motion_notify_event for WindowManager Instance; previews the frame
+          under the pointer while hovering over the Scrubber Slider
+
+        Parameters:
+          * event_data - An object representing the mouse motion event data
+        """
+        thumbnail_handler = self._animation_handler.get_thumbnail_manager()
+        if not self._handler_enabled or thumbnail_handler is None:
+            return
+        if self._render_handler.get_slider().drag_active:
+            # Dragging is previewed from the slider changed events
+            return
+
+        if (event_data.inaxes == self._render_handler.get_slider_axes() and
+                event_data.xdata is not None):
+            thumbnail_handler.show_thumbnail(self._get_slider_frame_number(event_data.xdata))
+        else:
+            thumbnail_handler.hide_thumbnail()
+
     def _handle_slider_changed(self, slider_val):
         """
         Handle Scrubber slider changed event
@@ -377,8 +483,25 @@ class InputManager(object):
         if not self._handler_enabled:
             return
 
+        frame_num = self._get_slider_frame_number(slider_val)
+
+        # While dragging, a thumbnail stands in for the frame until the mouse button is released
+        thumbnail_handler = self._animation_handler.get_thumbnail_manager()
+        if (thumbnail_handler is not None and self._render_handler.get_slider().drag_active and
+                thumbnail_handler.show_thumbnail(frame_num)):
+            self._scrub_frame_num = frame_num
+            return
+
+        self._scrub_frame_num = None
+        self._animation_handler.request_seek(frame_num, SEEK_ORIGIN_USER)
+
+    def _get_slider_frame_number(self, slider_val):
+        """
+        Returns the frame number at a Scrubber Slider value
+
+        Parameters:
+          * slider_val - A number representing the slider value
+        """
         min_frame_num = self._animation_handler.get_min_frame_number()
         total_frame_count = self._animation_handler.get_total_frames()
-        frame_num = slider_val * total_frame_count + min_frame_num
-
-        self._animation_handler.render(frame_num)
+        return slider_val * total_frame_count + min_frame_num
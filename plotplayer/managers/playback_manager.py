@@ -0,0 +1,387 @@
+"""
+PlotPlayer specific Playback Manager Methods and Classes
+
+Public Constants:
+  * SEEK_INTERVAL - Milliseconds between renders of coalesced seek requests
+  * SEEK_ORIGIN_USER - Seek requested by user input (keys, scrubber slider)
+  * SEEK_ORIGIN_PLAYBACK - Seek requested by the playback timer
+  * SEEK_ORIGIN_API - Seek requested programmatically
+  * MIN_PLAYBACK_RATE - Slowest playback speed multiplier
+  * MAX_PLAYBACK_RATE - Fastest playback speed multiplier
+
+Public Classes:
+  * PlaybackManager - Drives wall clock playback and coalesces seek requests of an
+      AnimationManager or PlayerGroup
+
+Public Methods:
+  * get_playback_position - Returns the fractional frame position playback has reached
+  * get_playback_frame_number - Returns the frame number to display at a playback position
+  * get_playback_stride - Returns the number of frames playback advances per timer tick
+  * get_end_frame_number - Returns the frame number playback stops at in its direction
+"""
+
+import math
+import time
+from collections import deque
+
+from ..data_models.playback_stats import PlaybackStats
+from ..helpers import ui_helper
+
+SEEK_ORIGIN_USER = 'user'
+SEEK_ORIGIN_PLAYBACK = 'playback'
+SEEK_ORIGIN_API = 'api'
+SEEK_ORIGINS = [SEEK_ORIGIN_USER, SEEK_ORIGIN_PLAYBACK, SEEK_ORIGIN_API]
+
+# Coalesced seeks are rendered at most once per display refresh (60 Hz)
+SEEK_INTERVAL = 16
+SEEK_LATENCY_SAMPLES = 100
+
+MIN_PLAYBACK_RATE = 0.1
+MAX_PLAYBACK_RATE = 16.0
+PLAYBACK_RATE_MESSAGE = 'playback_rate magnitude must be between {} and {}'.format(
+    MIN_PLAYBACK_RATE, MAX_PLAYBACK_RATE)
+
+#pylint: disable=too-many-arguments
+def get_playback_position(play_start_frame_num, play_start_time, play_position, now, frame_rate,
+                          playback_rate, drop_frames):
+    """
+    Returns the fractional frame position playback has reached at a timer tick
+
+    Parameters:
+      * play_start_frame_num - The frame number the playback clock was anchored at
+      * play_start_time - The time the playback clock was anchored at
+      * play_position - The position reached at the previous tick
+      * now - The current time
+      * frame_rate - The frame rate of the animation
+      * playback_rate - The playback speed multiplier; negative values play in reverse
+      * drop_frames - Boolean indicating whether playback follows the wall clock, skipping frames
+          which can no longer be shown on time, instead of advancing once per tick
+    """
+    if drop_frames:
+        return play_start_frame_num + (now - play_start_time) * frame_rate * playback_rate
+    return play_position + playback_rate
+
+def get_playback_frame_number(play_position, playback_rate, min_frame_num, max_frame_num):
+    """
+    Returns the frame number to display at a playback position; the position is truncated toward
+      the start frame so a frame is only shown once its time has come
+    """
+    if playback_rate > 0:
+        frame_num = int(math.floor(play_position))
+    else:
+        frame_num = int(math.ceil(play_position))
+    return min(max(frame_num, min_frame_num), max_frame_num)
+
+def get_playback_stride(playback_rate):
+    """
+    Returns the number of frames playback advances per timer tick rounded to a whole number of at
+      least one; negative while playing in reverse
+    """
+    stride = max(int(round(abs(playback_rate))), 1)
+    return stride if playback_rate > 0 else -stride
+
+def get_end_frame_number(playback_rate, min_frame_num, max_frame_num):
+    """
+    Returns the frame number playback stops at in the direction of the playback rate
+    """
+    return max_frame_num if playback_rate > 0 else min_frame_num
+
+class PlaybackManager(object):
+    """
+    Playback Manager for PlotPlayer AnimationManagers and PlayerGroups
+
+    Playback is driven by the wall clock; each timer tick displays the frame which should be on
+    screen at that time, skipping frames which can no longer be shown on time unless frame
+    dropping is disabled.  The timer ticks at the frame rate whatever the playback rate, so faster
+    playback advances several frames per tick instead of rendering every frame.  Seek requests
+    made before the next display refresh replace each other so only the most recent frame is
+    rendered.
+
+    The driven player provides get_frame_number, get_min_frame_number, get_max_frame_number,
+    get_frame_rate and render(frame_num, origin, force_draw); its render method passes every
+    rendered frame to handle_render.
+
+    Public Methods:
+      * play - Start the playback timer; returns the frame number playback starts from
+      * stop - Stop the playback timer
+      * is_playing - Returns whether playback is running
+      * tick - Render the frame which should be displayed now
+      * handle_render - Continue playback from sought frames and stop it at the end frame
+      * request_seek - Request a frame to be rendered on the next display refresh; only the most
+          recent request is rendered
+      * cancel_seek - Discard the pending seek request
+      * get_target_frame_number - Returns the frame number of the pending seek request or the
+          current frame number
+      * get_seek_latency - Returns the latency from the last rendered seek request to its display
+      * get_seek_latencies - Returns the recent seek request latencies
+      * get_playback_rate - Returns the playback speed multiplier
+      * set_playback_rate - Sets the playback speed multiplier; negative plays in reverse
+      * get_playback_stride - Returns the number of frames playback advances per timer tick
+      * get_end_frame_number - Returns the frame number playback stops at
+      * get_drop_frames - Returns whether frames are dropped to keep up with wall clock time
+      * set_drop_frames - Sets whether frames are dropped to keep up with wall clock time
+      * get_playback_stats - Returns the achieved and target frame rates and dropped frames
+    """
+
+    _player = None
+    _get_canvas = None
+    _playing = False
+    _timer = None
+    _playback_rate = 1.0
+    _drop_frames = True
+    _play_start_time = None
+    _play_start_frame_num = None
+    _play_position = None
+    _displayed_frames = 0
+    _dropped_frames = 0
+    _last_tick_time = None
+    _seek_timer = None
+    _pending_seek = None
+    _seek_latencies = None
+
+    def __init__(self, player, get_canvas, drop_frames=True):
+        """
+        Constructor
+
+        Parameters:
+          * player - The AnimationManager or PlayerGroup whose frames are played
+          * get_canvas - Callable returning the canvas which owns the playback and seek timers
+          * drop_frames (optional) - Boolean indicating whether frames which can no longer be
+              shown on time are skipped during playback; False shows every frame
+        """
+        self._player = player
+        self._get_canvas = get_canvas
+        self._drop_frames = drop_frames
+        self._seek_latencies = deque(maxlen=SEEK_LATENCY_SAMPLES)
+
+    def play(self):
+        """
+        Start the playback timer from the current frame; playback restarts from the beginning if
+          at the end, or from the end if at the beginning while playing in reverse
+
+        Returns the frame number playback starts from
+        """
+        frame_num = self._player.get_frame_number()
+        if self._playing:
+            return frame_num
+
+        if frame_num == self.get_end_frame_number():
+            if self._playback_rate > 0:
+                frame_num = self._player.get_min_frame_number()
+            else:
+                frame_num = self._player.get_max_frame_number()
+
+        self._anchor_clock(frame_num)
+        self._last_tick_time = self._play_start_time
+        self._displayed_frames = 0
+        self._dropped_frames = 0
+
+        interval = max(int(1000 / self._player.get_frame_rate()), 1)
+        self._timer = self._get_canvas().new_timer(interval=interval)
+        self._timer.add_callback(self.tick)
+
+        self._playing = True
+        self._timer.start()
+        return frame_num
+
+    def stop(self):
+        """
+        Stop the playback timer at the current frame
+        """
+        self._playing = False
+        if self._timer is not None:
+            self._timer.stop()
+            self._timer = None
+
+    def is_playing(self):
+        """
+        Returns a boolean indicating whether playback is running
+        """
+        return self._playing
+
+    def tick(self):
+        """
+        Render the frame which should be displayed now; called by the playback timer, and by
+          players on canvases without an event loop since those never fire timers
+        """
+        if not self._playing:
+            self.stop()
+            return
+
+        now = time.perf_counter()
+        self._play_position = get_playback_position(self._play_start_frame_num,
+                                                    self._play_start_time, self._play_position,
+                                                    now, self._player.get_frame_rate(),
+                                                    self._playback_rate, self._drop_frames)
+        frame_num = self._player.get_frame_number()
+        next_frame_num = get_playback_frame_number(self._play_position, self._playback_rate,
+                                                   self._player.get_min_frame_number(),
+                                                   self._player.get_max_frame_number())
+        if next_frame_num == frame_num:
+            # Slow playback has not reached the next frame yet
+            return
+
+        # Frames skipped by the playback stride are intended; only those beyond it are dropped
+        stride = abs(self.get_playback_stride())
+        self._dropped_frames += max(abs(next_frame_num - frame_num) - stride, 0)
+        self._player.render(next_frame_num, SEEK_ORIGIN_PLAYBACK)
+        self._displayed_frames += 1
+        self._last_tick_time = now
+
+    def handle_render(self, frame_num, origin):
+        """
+        Update playback for a frame rendered by the player; playback continues from frames
+          sought during playback and stops once the end frame is rendered
+
+        Parameters:
+          * frame_num - The frame number rendered
+          * origin - One of the SEEK_ORIGIN constants describing what requested the frame
+        """
+        if not self._playing:
+            return
+
+        if origin != SEEK_ORIGIN_PLAYBACK:
+            self._anchor_clock(frame_num)
+        if frame_num == self.get_end_frame_number():
+            self.stop()
+
+    def request_seek(self, frame_num, origin=SEEK_ORIGIN_USER):
+        """
+        Request a frame to be rendered on the next display refresh; requests made before then
+          replace each other so only the most recent frame is rendered
+
+        Parameters:
+          * frame_num - The frame number to render
+          * origin (optional) - One of the SEEK_ORIGIN constants describing what requested the
+              frame
+        """
+        self._pending_seek = (frame_num, origin, time.perf_counter())
+
+        if self._seek_timer is None:
+            seek_timer = self._get_canvas().new_timer(interval=SEEK_INTERVAL)
+            if not ui_helper.is_event_loop_timer(seek_timer):
+                # Canvases without an event loop never fire timers; render immediately
+                self._render_pending_seek()
+                return
+
+            seek_timer.single_shot = True
+            seek_timer.add_callback(self._render_pending_seek)
+            self._seek_timer = seek_timer
+            seek_timer.start()
+
+    def cancel_seek(self):
+        """
+        Discard the pending seek request
+        """
+        self._pending_seek = None
+
+    def get_target_frame_number(self):
+        """
+        Returns the frame number of the pending seek request or the current frame number if no
+          seek is pending
+        """
+        if self._pending_seek is not None:
+            return self._pending_seek[0]
+        return self._player.get_frame_number()
+
+    def get_seek_latency(self):
+        """
+        Returns the seconds between the last rendered seek request and its display; None if no
+          seek request has been rendered
+        """
+        if not self._seek_latencies:
+            return None
+        return self._seek_latencies[-1]
+
+    def get_seek_latencies(self):
+        """
+        Returns a list of the recent seek request latencies in seconds
+        """
+        return list(self._seek_latencies)
+
+    def get_playback_rate(self):
+        """
+        Returns the playback speed multiplier; negative values play in reverse
+        """
+        return self._playback_rate
+
+    def set_playback_rate(self, playback_rate):
+        """
+        Set the playback speed multiplier; the playback clock is re-anchored at the current frame
+          so the change applies from the next timer tick without restarting the timer
+
+        Parameters:
+          * playback_rate - Speed multiplier whose magnitude is between MIN_PLAYBACK_RATE and
+              MAX_PLAYBACK_RATE; negative values play in reverse
+        """
+        assert MIN_PLAYBACK_RATE <= abs(playback_rate) <= MAX_PLAYBACK_RATE, PLAYBACK_RATE_MESSAGE
+
+        self._playback_rate = float(playback_rate)
+        if self._playing:
+            self._anchor_clock(self._player.get_frame_number())
+
+    def get_playback_stride(self):
+        """
+        Returns the number of frames playback advances per timer tick rounded to a whole number
+          of at least one; negative while playing in reverse
+        """
+        return get_playback_stride(self._playback_rate)
+
+    def get_end_frame_number(self):
+        """
+        Returns the frame number playback stops at in the current direction
+        """
+        return get_end_frame_number(self._playback_rate, self._player.get_min_frame_number(),
+                                    self._player.get_max_frame_number())
+
+    def get_drop_frames(self):
+        """
+        Returns a boolean indicating whether frames are dropped to keep up with wall clock time
+        """
+        return self._drop_frames
+
+    def set_drop_frames(self, drop_frames):
+        """
+        Set whether frames which can no longer be shown on time are skipped during playback
+
+        Parameters:
+          * drop_frames - Boolean; False shows every frame for frame exact review
+        """
+        self._drop_frames = drop_frames
+        if self._playing:
+            self._anchor_clock(self._player.get_frame_number())
+
+    def get_playback_stats(self):
+        """
+        Returns a PlaybackStats instance for the current or last playback
+        """
+        target_fps = float(self._player.get_frame_rate())
+        achieved_fps = 0.0
+        if self._play_start_time is not None and self._displayed_frames > 0:
+            elapsed = self._last_tick_time - self._play_start_time
+            if elapsed > 0:
+                achieved_fps = self._displayed_frames / elapsed
+
+        return PlaybackStats(target_fps, achieved_fps, self._displayed_frames,
+                             self._dropped_frames, self._playback_rate)
+
+    def _anchor_clock(self, frame_num):
+        """
+        Restart the playback clock at a frame number and the current time
+        """
+        self._play_start_time = time.perf_counter()
+        self._play_start_frame_num = frame_num
+        self._play_position = float(frame_num)
+
+    def _render_pending_seek(self):
+        """
+        Render the most recent seek request and record its latency
+        """
+        self._seek_timer = None
+        if self._pending_seek is None:
+            return
+
+        frame_num, origin, request_time = self._pending_seek
+        self._pending_seek = None
+        self._player.render(frame_num, origin, True)
+        self._seek_latencies.append(time.perf_counter() - request_time)
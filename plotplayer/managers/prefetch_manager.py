@@ -0,0 +1,175 @@
+"""
+PlotPlayer specific Prefetch Manager Methods and Classes
+
+Public Constants:
+  * DEFAULT_LOOKAHEAD - Default number of frames rendered ahead of the playhead
+
+Public Classes:
+  * PrefetchManager - Renders upcoming frames in worker processes and hands their pixels to the
+      RenderManager Frame Cache
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+from ..helpers import headless_helper
+from ..validators import type_validation
+from .frame_cache_manager import FrameCacheManager
+
+DEFAULT_LOOKAHEAD = 8
+
+class PrefetchManager(object):
+    """
+    Prefetch Manager for PlotPlayer AnimationManagers
+
+    Frames ahead of the playhead are rendered in worker processes on headless Agg canvases built
+    from the RenderManager CanvasParams.  Finished pixels are placed in the RenderManager Frame
+    Cache so they are displayed without calling the external render function on the GUI thread.
+    The external render function must be picklable (ie. a module level function) and must draw
+    onto the axes it is given.  It is sent to each worker process once, together with the canvas
+    parameters, when the worker pool is started; the pool is started again when the render
+    function or the render signature changes.
+
+    Public Methods:
+      * update - Collect finished frames and schedule the frames ahead of the playhead
+      * cancel - Cancel all scheduled frames
+      * shutdown - Cancel all scheduled frames and stop the worker processes
+      * get_lookahead - Returns the number of frames rendered ahead of the playhead
+      * set_lookahead - Sets the number of frames rendered ahead of the playhead
+    """
+
+    _render_handler = None
+    _lookahead = None
+    _max_workers = None
+    _executor = None
+    _worker_render_func = None
+    _worker_signature = None
+    _pending = None
+
+    def __init__(self, render_handler, lookahead=DEFAULT_LOOKAHEAD, max_workers=None):
+        """
+        Constructor
+
+        Parameters:
+          * render_handler - Instance of RenderManager whose frames are prefetched; a
+              FrameCacheManager is attached if it has none
+          * lookahead (optional) - Number of frames rendered ahead of the playhead
+          * max_workers (optional) - Number of worker processes; defaults to the CPU count
+        """
+        self._render_handler = render_handler
+        self._lookahead = lookahead
+        self._max_workers = max_workers
+        self._executor = None
+        self._pending = {}
+
+        if render_handler.get_frame_cache() is None:
+            render_handler.set_frame_cache(FrameCacheManager())
+
+    def update(self, frame_num, direction, min_frame_num, max_frame_num):
+        """
+        Collect finished frames into the Frame Cache and schedule the frames ahead of the
+          playhead; scheduled frames outside the new window are cancelled
+
+        Parameters:
+          * frame_num - The frame number about to be displayed
+          * direction - 1 for forward playback, -1 for reverse playback; larger magnitudes
+              prefetch every n-th frame
+          * min_frame_num - The minimum frame number in the animation
+          * max_frame_num - The maximum frame number in the animation
+        """
+        render_func = self._render_handler.get_render_func()
+        if render_func is None:
+            return
+
+        frame_cache = self._render_handler.get_frame_cache()
+        signature = self._render_handler.get_render_signature()
+        frame_cache.set_signature(signature)
+        self._collect(frame_cache, signature)
+        if render_func is not self._worker_render_func or signature != self._worker_signature:
+            # The workers render with the render function and canvas they were started with
+            self.shutdown()
+
+        wanted_frames = []
+        for step in range(1, self._lookahead + 1):
+            wanted_frame = frame_num + step * direction
+            if wanted_frame < min_frame_num or wanted_frame > max_frame_num:
+                break
+            wanted_frames.append(wanted_frame)
+
+        for pending_frame in list(self._pending):
+            if pending_frame not in wanted_frames and self._pending[pending_frame][0].cancel():
+                del self._pending[pending_frame]
+
+        for wanted_frame in wanted_frames:
+            if wanted_frame in self._pending or frame_cache.contains(wanted_frame):
+                continue
+
+            future = self._get_executor(render_func, signature).submit(
+                headless_helper.render_worker_frame, wanted_frame)
+            self._pending[wanted_frame] = (future, signature)
+
+    def cancel(self):
+        """
+        Cancel all scheduled frames which have not started rendering
+        """
+        for future, _ in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+
+    def shutdown(self):
+        """
+        Cancel all scheduled frames and stop the worker processes
+        """
+        self.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def get_lookahead(self):
+        """
+        Returns the number of frames rendered ahead of the playhead
+        """
+        return self._lookahead
+
+    def set_lookahead(self, lookahead):
+        """
+        Set the number of frames rendered ahead of the playhead
+        """
+        self._lookahead = lookahead
+
+    def _collect(self, frame_cache, signature):
+        """
+        Move finished frames rendered for the current signature into the Frame Cache
+
+        Parameters:
+          * frame_cache - Instance of FrameCacheManager to store finished frames in
+          * signature - The current render signature of the RenderManager
+        """
+        for frame_num, (future, frame_signature) in list(self._pending.items()):
+            if not future.done():
+                continue
+
+            del self._pending[frame_num]
+            if future.cancelled() or future.exception() is not None:
+                continue
+            if frame_signature == signature:
+                frame_cache.put(frame_num, future.result())
+
+    def _get_executor(self, render_func, signature):
+        """
+        Returns the worker process pool, starting it on first use with the render function and
+          the current canvas parameters; the render function is checked to be picklable once
+
+        Parameters:
+          * render_func - The external render function
+          * signature - The current render signature of the RenderManager
+        """
+        if self._executor is None:
+            if render_func is not self._worker_render_func:
+                type_validation.assert_is_picklable(render_func, 'render_func')
+            canvas_params = self._render_handler.get_canvas_params()
+            self._executor = ProcessPoolExecutor(self._max_workers,
+                                                 initializer=headless_helper.initialize_worker,
+                                                 initargs=(canvas_params, render_func))
+            self._worker_render_func = render_func
+            self._worker_signature = signature
+        return self._executor
@@ -6,10 +6,15 @@ Public Classes:
       external render function that renders the animation frames
 """
 
-from matplotlib.widgets import Slider
+import functools
+import time
+from collections import Counter
 
+from ..data_models.canvas_params import CanvasParams
 from ..data_models.render_axes_params import RenderAxesParams
 from ..data_models.slider_params import SliderParams
+from ..helpers import raster_helper
+from .stats_manager import StatsManager, STAGE_DRAW_FUNC, STAGE_SLIDER, STAGE_CANVAS
 
 IMAGE_AXES_RECT = [0, 0.03, 1, 0.97]  # [ x, y, width, height ] in percentage of window size
 SLIDER_AXES_RECT = [0, 0, 1, 0.03]  # [ x, y, width, height ] in percentage of window size
@@ -21,8 +26,19 @@ class RenderManager(object):
     Public Methods:
       * initialize - Initializes the Render Manager for rendering
       * render - Render a specific frame from the external render function
+      * draw_deferred - Draw the canvas of a frame rendered with defer_draw
       * set_slider_visible - Method to hide/show the Scrubber Slider
       * toggle_slider - Method to toggle the Scribber Slider between shown and hidden
+      * get_render_func - Returns the external render function
+      * get_canvas_params - Returns the CanvasParams needed to rebuild the Animation canvas
+      * get_render_signature - Returns a hashable value describing what rendered pixels depend on
+      * get_render_count - Returns the number of times a frame was rendered by the external
+          render function
+      * get_render_counts - Returns a Counter of external render function calls per frame number
+      * reset_render_counts - Resets the external render function call counters
+      * get_frame_cache - Returns the FrameCacheManager used to cache rendered frames
+      * set_frame_cache - Sets the FrameCacheManager used to cache rendered frames
+      * get_stats_manager - Returns the StatsManager recording render stage timings
       * get_animation_axes - Returns the Animation Axes
       * get_slider_axes - Returns the Slider Axes
       * get_slider - Returns the Scrubber Slider
@@ -33,8 +49,18 @@ class RenderManager(object):
     _render_func = None
     _slider = None
     _slider_visible = False
-
-    def __init__(self, figure, render_axes_params=None, scrubber_slider_params=None):
+    _frame_cache = None
+    _cached_frame_num = None
+    _blit_artists = None
+    _background = None
+    _render_counts = None
+    _stats_handler = None
+    _hud_deferred = False
+    _deferred_draw = None
+
+    #pylint: disable=too-many-arguments
+    def __init__(self, figure, render_axes_params=None, scrubber_slider_params=None,
+                 frame_cache=None, stats_handler=None):
         """
         Constructor
 
@@ -42,8 +68,18 @@ class RenderManager(object):
           * figure - Instance of Pyplot figure associated with the draw canvas
           * render_axes_params (optional) - Instance of RenderAxesParams
           * scrubber_slider_params (optional) - Instance of SliderParams
+          * frame_cache (optional) - Instance of FrameCacheManager used to cache rendered frames
+          * stats_handler (optional) - Instance of StatsManager recording render stage timings
         """
+        from matplotlib.widgets import Slider
+
         self._figure = figure
+        self._frame_cache = frame_cache
+        if stats_handler is None:
+            stats_handler = StatsManager(figure)
+        self._stats_handler = stats_handler
+        self._blit_artists = []
+        self._render_counts = Counter()
 
         if render_axes_params is None:
             render_axes_params = RenderAxesParams(None, None)
@@ -67,12 +103,15 @@ class RenderManager(object):
         self.set_slider_visible(scrubber_slider_params.slider_visible)
         self.initialize(None, True)
 
+        self._figure.canvas.mpl_connect('draw_event', self._handle_draw_event)
+
     def initialize(self, render_func, clear_animation=False):
         """
         Initialize the Render Manager for rendering
 
         Parameters:
-          * render_func - The function to perform the render
+          * render_func - The function to perform the render; returning an iterable of the
+              artists it updated enables blitting of only those artists
         """
         if clear_animation:
             animation_axes = self.get_animation_axes()
@@ -81,6 +120,10 @@ class RenderManager(object):
             self.enforce_limits()
 
         self._render_func = render_func
+        self._cached_frame_num = None
+        self._set_blit_artists(None)
+        if self._frame_cache is not None:
+            self._frame_cache.clear()
 
     def set_limits(self, animation_x_limits=None, animation_y_limits=None):
         """
@@ -91,27 +134,63 @@ class RenderManager(object):
 
         self.enforce_limits()
 
-    def render(self, frame_num, total_frames, force_draw=False):
+    def render(self, frame_num, total_frames, force_draw=False, defer_draw=False):
         """
         Render a specific frame from a total set of frames
 
         Parameters:
           * frame_num - The frame number to render
           * total_frames - The total number of frames that could be rendered
+          * force_draw (optional) - Boolean indicating whether the canvas is drawn immediately
+              instead of when the GUI is idle
+          * defer_draw (optional) - Boolean indicating whether drawing the canvas is left to
+              draw_deferred so several canvases can be rendered before any of them is drawn
         """
+        self._deferred_draw = None
         if frame_num < 0 or frame_num > total_frames:
             return
 
         slider_val = frame_num / total_frames
-        self._render_frame(frame_num)
-        self._render_slider(slider_val)
-
-        if force_draw:
-            self._figure.canvas.draw()
+        draw = None
+        if self._frame_cache is not None:
+            self._frame_cache.set_signature(self.get_render_signature())
+            draw = self._render_cached_frame(frame_num, slider_val)
+
+        if draw is None:
+            self._cached_frame_num = None
+            artists = self._render_frame(frame_num)
+            self._set_blit_artists(artists)
+
+            blitting = self._blit_artists and self._background is not None
+            start_time = time.perf_counter()
+            if blitting:
+                self._update_slider(slider_val)
+            else:
+                self._render_slider(slider_val)
+            self._stats_handler.record(STAGE_SLIDER, time.perf_counter() - start_time)
+            draw = functools.partial(self._draw_frame, frame_num, blitting, force_draw)
+
+        if defer_draw:
+            self._deferred_draw = draw
         else:
-            self._figure.canvas.draw_idle()
+            draw()
+
+    def draw_deferred(self):
+        """
+        Draw the canvas of the frame last rendered with defer_draw; does nothing if no frame is
+          waiting to be drawn
+        """
+        draw = self._deferred_draw
+        self._deferred_draw = None
+        if draw is not None:
+            draw()
 
     def enforce_limits(self):
+        """
+        Apply the Animation Axes X/Y Limits; autoscales if either limit is not set
+        """
+        self._background = None
+
         animation_axes = self.get_animation_axes()
         animation_x_limits = self._render_axes_params.animation_x_limits
         animation_y_limits = self._render_axes_params.animation_y_limits
@@ -140,6 +219,80 @@ class RenderManager(object):
         """
         self.set_slider_visible(not self._slider_visible)
 
+    def get_render_func(self):
+        """
+        Returns the external render function
+        """
+        return self._render_func
+
+    def get_canvas_params(self):
+        """
+        Returns a CanvasParams instance describing the figure size, DPI, Animation Axes position
+          and limits; used to rebuild the Animation canvas on headless figures
+        """
+        animation_axes = self.get_animation_axes()
+        animation_x_limits = None
+        animation_y_limits = None
+        if not animation_axes.get_autoscale_on():
+            animation_x_limits = tuple(animation_axes.get_xlim())
+            animation_y_limits = tuple(animation_axes.get_ylim())
+
+        return CanvasParams(self._figure.get_size_inches(), self._figure.dpi,
+                            animation_axes.get_position().bounds, animation_x_limits,
+                            animation_y_limits, animation_axes.axison)
+
+    def get_render_signature(self):
+        """
+        Returns a hashable value describing the figure size, DPI and animation axis limits which
+          rendered frame pixels depend on; autoscaled limits are decided by each frame itself
+        """
+        animation_axes = self.get_animation_axes()
+        signature = (tuple(self._figure.bbox.size), self._figure.dpi,
+                     tuple(animation_axes.bbox.bounds))
+        if not animation_axes.get_autoscale_on():
+            signature += (tuple(animation_axes.get_xlim()), tuple(animation_axes.get_ylim()))
+        return signature
+
+    def get_render_count(self, frame_num):
+        """
+        Returns the number of times a frame was rendered by the external render function
+        """
+        return self._render_counts[frame_num]
+
+    def get_render_counts(self):
+        """
+        Returns a Counter of external render function calls keyed by frame number
+        """
+        return Counter(self._render_counts)
+
+    def reset_render_counts(self):
+        """
+        Reset the external render function call counters
+        """
+        self._render_counts.clear()
+
+    def get_frame_cache(self):
+        """
+        Returns the FrameCacheManager used to cache rendered frames; None if caching is disabled
+        """
+        return self._frame_cache
+
+    def set_frame_cache(self, frame_cache):
+        """
+        Set the FrameCacheManager used to cache rendered frames
+
+        Parameters:
+          * frame_cache - Instance of FrameCacheManager; None disables caching
+        """
+        self._frame_cache = frame_cache
+        self._cached_frame_num = None
+
+    def get_stats_manager(self):
+        """
+        Returns the StatsManager recording render stage timings
+        """
+        return self._stats_handler
+
     def get_animation_axes(self):
         """
         Returns the Animation Axes
@@ -164,18 +317,213 @@ class RenderManager(object):
 
         Parameters:
           * frame_num - The frame number to render
+
+        Returns the value returned by the external render function
         """
         animation_axes = self.get_animation_axes()
 
         self._figure.sca(animation_axes)
-        self._render_func(frame_num, animation_axes)
+        self._render_counts[frame_num] += 1
+        start_time = time.perf_counter()
+        try:
+            return self._render_func(frame_num, animation_axes)
+        finally:
+            self._stats_handler.record(STAGE_DRAW_FUNC, time.perf_counter() - start_time)
 
     def _render_slider(self, new_slider_val):
         """
-        Render the Scrubber Slider
+        Render the Scrubber Slider; the Slider on_changed observers are not notified since the
+          frame is already being rendered
 
         Parameters:
           * new_sider_val - New value to render the Scrubber Slider with
         """
-        if self._slider.val != new_slider_val:
+        if self._slider.val == new_slider_val:
+            return
+
+        eventson = self._slider.eventson
+        self._slider.eventson = False
+        try:
             self._slider.set_val(new_slider_val)
+        finally:
+            self._slider.eventson = eventson
+
+    def _update_slider(self, new_slider_val):
+        """
+        Update the Scrubber Slider value without scheduling a full redraw, which would re-render
+          the whole figure
+
+        Parameters:
+          * new_sider_val - New value to update the Scrubber Slider with
+        """
+        drawon = self._slider.drawon
+        self._slider.drawon = False
+        try:
+            self._render_slider(new_slider_val)
+        finally:
+            self._slider.drawon = drawon
+
+    def _draw_frame(self, frame_num, blitting, force_draw):
+        """
+        Draw the canvas of a frame rendered by the external render function and cache its pixels
+
+        Parameters:
+          * frame_num - The frame number rendered
+          * blitting - Boolean indicating whether only the blitted artists are redrawn
+          * force_draw - Boolean indicating whether the canvas is drawn immediately instead of
+              when the GUI is idle
+        """
+        canvas = self._figure.canvas
+        start_time = time.perf_counter()
+
+        # The overlay is drawn after the frame pixels are cached so it is never cached itself
+        self._hud_deferred = True
+        try:
+            if blitting:
+                self._blit()
+            elif force_draw or self._blit_artists or self._frame_cache is not None:
+                canvas.draw()
+            else:
+                self._hud_deferred = False
+                canvas.draw_idle()
+        finally:
+            hud_deferred = self._hud_deferred
+            self._hud_deferred = False
+
+        if self._frame_cache is not None:
+            animation_bbox = self.get_animation_axes().bbox
+            self._frame_cache.put(frame_num, raster_helper.copy_region(canvas, animation_bbox))
+
+        if hud_deferred and self._draw_hud():
+            canvas.blit(self._figure.bbox)
+        self._stats_handler.record(STAGE_CANVAS, time.perf_counter() - start_time)
+
+    def _render_cached_frame(self, frame_num, slider_val):
+        """
+        Render a frame from the Frame Cache by copying its pixels back into the canvas without
+          calling the external render function
+
+        Parameters:
+          * frame_num - The frame number to render
+          * slider_val - New value to render the Scrubber Slider with
+
+        Returns a callable drawing the canvas of the cached frame; None if the frame was not
+          cached and must be rendered
+        """
+        pixels = self._frame_cache.get(frame_num)
+        if pixels is None:
+            return None
+
+        canvas = self._figure.canvas
+        start_time = time.perf_counter()
+        self._update_slider(slider_val)
+        slider_time = time.perf_counter()
+
+        # A failed paste falls through to a full render, which records its own slider stage
+        if not raster_helper.paste_region(canvas, self.get_animation_axes().bbox, pixels):
+            return None
+        self._cached_frame_num = frame_num
+        self._stats_handler.record(STAGE_SLIDER, slider_time - start_time)
+        return functools.partial(self._draw_cached_frame, time.perf_counter() - slider_time)
+
+    def _draw_cached_frame(self, paste_duration):
+        """
+        Draw the Slider Axes and statistics overlay over the pasted pixels of a cached frame and
+          blit the canvas
+
+        Parameters:
+          * paste_duration - Seconds spent pasting the cached pixels into the canvas
+        """
+        start_time = time.perf_counter()
+        self._draw_slider_axes()
+        self._draw_hud()
+        self._figure.canvas.blit(self._figure.bbox)
+        self._stats_handler.record(STAGE_CANVAS,
+                                   paste_duration + time.perf_counter() - start_time)
+
+    def _set_blit_artists(self, artists):
+        """
+        Set the artists returned by the external render function as the only artists redrawn
+          for each frame; the Slider Axes is also redrawn separately while blitting
+
+        Parameters:
+          * artists - An iterable of Matplotlib Artists or None to disable blitting
+        """
+        artists = [] if artists is None else list(artists)
+        if artists == self._blit_artists:
+            return
+
+        for artist in self._blit_artists:
+            if artist not in artists:
+                artist.set_animated(False)
+        for artist in artists:
+            artist.set_animated(True)
+
+        self.get_slider_axes().set_animated(bool(artists))
+        self._blit_artists = artists
+        self._background = None
+
+    def _blit(self):
+        """
+        Restore the cached static background and redraw only the blitted artists and Slider Axes
+        """
+        canvas = self._figure.canvas
+        canvas.restore_region(self._background)
+        self._draw_blit_artists()
+        canvas.blit(self._figure.bbox)
+
+    def _draw_blit_artists(self):
+        """
+        Draw the blitted artists and Slider Axes onto the canvas renderer
+        """
+        for artist in self._blit_artists:
+            self._figure.draw_artist(artist)
+        self._draw_slider_axes()
+
+    def _draw_slider_axes(self):
+        """
+        Draw the Slider Axes onto the canvas renderer if it is visible
+        """
+        if self._slider_visible:
+            self._figure.draw_artist(self.get_slider_axes())
+
+    def _draw_hud(self):
+        """
+        Draw the animated statistics overlay onto the canvas renderer if it is visible
+
+        Returns a boolean indicating whether the overlay was drawn
+        """
+        hud_artist = self._stats_handler.get_hud_artist()
+        if not hud_artist.get_visible():
+            return False
+        self._figure.draw_artist(hud_artist)
+        return True
+
+    def _handle_draw_event(self, event_data):
+        """
+        Handle Matplotlib draw_event; captures the static background used for blitting and
+          restores the cached pixels of the displayed frame after a full redraw so the animation
+          artists of a previous frame are not shown
+
+        Parameters:
+          * event_data - An object representing the draw event data
+        """
+        if self._blit_artists:
+            self._background = event_data.canvas.copy_from_bbox(self._figure.bbox)
+            self._draw_blit_artists()
+
+        if self._frame_cache is not None and self._cached_frame_num is not None:
+            frame_num = self._cached_frame_num
+            self._cached_frame_num = None
+            self._frame_cache.set_signature(self.get_render_signature())
+            pixels = self._frame_cache.get(frame_num)
+            if pixels is not None:
+                raster_helper.paste_region(event_data.canvas, self.get_animation_axes().bbox,
+                                           pixels)
+                self._cached_frame_num = frame_num
+            else:
+                self._render_frame(frame_num)
+                event_data.canvas.draw_idle()
+
+        if not self._hud_deferred:
+            self._draw_hud()
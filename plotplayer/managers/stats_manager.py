@@ -0,0 +1,169 @@
+"""
+PlotPlayer specific Stats Manager Methods and Classes
+
+Public Constants:
+  * STAGE_FRAME - A whole frame render requested through the AnimationManager
+  * STAGE_DRAW_FUNC - The external render function
+  * STAGE_SLIDER - Updating the Scrubber Slider
+  * STAGE_CANVAS - Drawing, blitting or pasting the frame onto the canvas
+  * DEFAULT_SAMPLE_COUNT - Default number of recent durations kept per stage
+
+Public Classes:
+  * StatsManager - Records per stage frame timings and manages the on canvas statistics overlay
+"""
+
+from collections import deque
+
+import numpy
+
+from ..data_models.timing_stats import TimingStats
+from ..validators import type_validation
+
+STAGE_FRAME = 'frame'
+STAGE_DRAW_FUNC = 'draw_func'
+STAGE_SLIDER = 'slider'
+STAGE_CANVAS = 'canvas'
+STAGES = [STAGE_FRAME, STAGE_DRAW_FUNC, STAGE_SLIDER, STAGE_CANVAS]
+
+DEFAULT_SAMPLE_COUNT = 240
+
+HUD_POSITION = (0.01, 0.99)  # [ x, y ] in percentage of window size
+HUD_FORMAT = '{:.1f} fps | {:g}x | p50 {:.1f} ms | p99 {:.1f} ms | dropped {}'
+HUD_TEXT_KWARGS = {'ha': 'left', 'va': 'top', 'family': 'monospace', 'fontsize': 9,
+                   'color': 'white', 'bbox': {'facecolor': 'black', 'alpha': 0.6, 'pad': 3}}
+
+MILLISECONDS = 1000.0
+
+class StatsManager(object):
+    """
+    Stats Manager for PlotPlayer Windows
+
+    Durations of every STAGE are kept in fixed size ring buffers so recording never allocates
+    during playback; summaries are computed only when requested.  The overlay is an animated
+    Figure text artist drawn by the RenderManager on top of each frame.
+
+    Public Methods:
+      * record - Record the duration of a render stage
+      * get_stage_stats - Returns a TimingStats summary of a render stage
+      * get_stats - Returns a dictionary of TimingStats summaries keyed by stage
+      * get_durations - Returns the recent durations of a render stage
+      * reset - Clear the recorded durations of every stage
+      * update_hud - Update the overlay text from the recorded durations and PlaybackStats
+      * get_hud_visible - Returns whether the statistics overlay is shown
+      * set_hud_visible - Hide/Show the statistics overlay
+      * toggle_hud - Toggle the statistics overlay between shown and hidden
+      * get_hud_artist - Returns the Text artist of the statistics overlay
+    """
+
+    _figure = None
+    _durations = None
+    _hud_artist = None
+
+    def __init__(self, figure, sample_count=DEFAULT_SAMPLE_COUNT):
+        """
+        Constructor
+
+        Parameters:
+          * figure - Instance of Pyplot figure the statistics overlay is drawn on
+          * sample_count (optional) - Number of recent durations kept per stage
+        """
+        self._figure = figure
+        self._durations = {stage: deque(maxlen=sample_count) for stage in STAGES}
+
+        self._hud_artist = figure.text(HUD_POSITION[0], HUD_POSITION[1], str(), visible=False,
+                                       animated=True, **HUD_TEXT_KWARGS)
+
+    def record(self, stage, duration):
+        """
+        Record the duration of a render stage
+
+        Parameters:
+          * stage - One of the STAGE constants
+          * duration - Duration in seconds
+        """
+        self._durations[stage].append(duration)
+
+    def get_stage_stats(self, stage):
+        """
+        Returns a TimingStats instance summarizing the recent durations of a render stage
+
+        Parameters:
+          * stage - One of the STAGE constants
+        """
+        type_validation.assert_is_in(stage, STAGES, 'stage')
+        durations = self._durations[stage]
+        if not durations:
+            return TimingStats(stage)
+
+        samples = numpy.fromiter(durations, float, len(durations))
+        p50, p90, p99 = numpy.percentile(samples, [50, 90, 99])
+        return TimingStats(stage, samples.shape[0], float(samples.mean()), float(p50),
+                           float(p90), float(p99), float(samples.max()))
+
+    def get_stats(self):
+        """
+        Returns a dictionary of TimingStats instances keyed by STAGE constant
+        """
+        return {stage: self.get_stage_stats(stage) for stage in STAGES}
+
+    def get_durations(self, stage):
+        """
+        Returns a list of the recent durations in seconds of a render stage
+
+        Parameters:
+          * stage - One of the STAGE constants
+        """
+        type_validation.assert_is_in(stage, STAGES, 'stage')
+        return list(self._durations[stage])
+
+    def reset(self):
+        """
+        Clear the recorded durations of every stage
+        """
+        for durations in self._durations.values():
+            durations.clear()
+
+    def update_hud(self, playback_stats):
+        """
+        Update the statistics overlay text; does nothing while the overlay is hidden
+
+        Parameters:
+          * playback_stats - Instance of PlaybackStats of the current or last playback
+        """
+        if not self._hud_artist.get_visible():
+            return
+
+        frame_stats = self.get_stage_stats(STAGE_FRAME)
+        self._hud_artist.set_text(HUD_FORMAT.format(playback_stats.achieved_fps,
+                                                    playback_stats.playback_rate,
+                                                    frame_stats.p50 * MILLISECONDS,
+                                                    frame_stats.p99 * MILLISECONDS,
+                                                    playback_stats.dropped_frames))
+
+    def get_hud_visible(self):
+        """
+        Returns a boolean indicating whether the statistics overlay is shown
+        """
+        return self._hud_artist.get_visible()
+
+    def set_hud_visible(self, visible):
+        """
+        Hide/Show the statistics overlay
+
+        Parameters:
+          * visible - Boolean specifying whether the overlay is visible
+        """
+        self._hud_artist.set_visible(visible)
+        self._figure.canvas.draw_idle()
+
+    def toggle_hud(self):
+        """
+        Toggle the statistics overlay between shown and hidden
+        """
+        self.set_hud_visible(not self.get_hud_visible())
+
+    def get_hud_artist(self):
+        """
+        Returns the Matplotlib Text artist of the statistics overlay
+        """
+        return self._hud_artist
@@ -0,0 +1,386 @@
+"""
+PlotPlayer specific Thumbnail Manager Methods and Classes
+
+Public Constants:
+  * DEFAULT_THUMBNAIL_COUNT - Default number of thumbnails spread over the animation
+  * DEFAULT_THUMBNAIL_SCALE - Default thumbnail DPI as a fraction of the figure DPI
+
+Public Classes:
+  * ThumbnailManager - Renders a track of low resolution frame previews in worker processes and
+      shows them above the Scrubber Slider
+
+Private Methods:
+  * _get_coarse_to_fine_order - Returns indices ordered so every prefix spreads over the range
+"""
+
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy
+
+from ..data_models.canvas_params import CanvasParams
+from ..helpers import headless_helper
+from ..validators import type_validation
+
+DEFAULT_THUMBNAIL_COUNT = 100
+DEFAULT_THUMBNAIL_SCALE = 0.2
+
+# Pixels between the top of the Slider Axes and the bottom of the thumbnail
+THUMBNAIL_MARGIN = 4
+THUMBNAIL_ZORDER = 10
+
+def _get_coarse_to_fine_order(count):
+    """
+    Returns the indices 0 to count - 1 ordered coarse to fine so the first thumbnails to finish
+      cover the whole animation and the track fills in between them
+    """
+    order = []
+    seen = set()
+    step = 1
+    while step * 2 < count:
+        step *= 2
+    while step >= 1:
+        for index in list(range(0, count, step)) + [count - 1]:
+            if 0 <= index and index not in seen:
+                seen.add(index)
+                order.append(index)
+        step //= 2
+    return order
+
+class ThumbnailManager(object):
+    """
+    Thumbnail Manager for PlotPlayer AnimationManagers
+
+    Thumbnails of frames at regular intervals are rendered in worker processes on headless Agg
+    canvases built from the RenderManager CanvasParams at a fraction of the figure DPI.  They are
+    collected by a callback of the worker pool, so rendering them never blocks the GUI thread.
+    While the pointer hovers over or drags the Scrubber Slider the nearest finished thumbnail is
+    blitted above it without calling the external render function.  The external render function
+    must be picklable (ie. a module level function) and must draw onto the axes it is given; it
+    is sent to each worker process once when the pool starts, together with the thumbnail canvas
+    parameters, so each thumbnail only sends its frame number.
+
+    Thumbnails belong to the figure size, DPI and animation axes position they were rendered for;
+    they are rendered again, by a new worker pool, when the window is resized.  Axis limits are left to the render
+    function since many animations change them from frame to frame.
+
+    Public Methods:
+      * initialize - Schedule the thumbnails of an animation
+      * show_thumbnail - Show the thumbnail nearest to a frame number above the Scrubber Slider
+      * hide_thumbnail - Hide the shown thumbnail
+      * get_preview_frame_number - Returns the frame number being previewed
+      * get_thumbnail - Returns the frame number and pixels of the thumbnail nearest to a frame
+      * get_thumbnail_frames - Returns the frame numbers of the finished thumbnails
+      * get_visible - Returns whether a thumbnail is shown
+      * get_thumbnail_count - Returns the number of thumbnails spread over the animation
+      * get_scale - Returns the thumbnail DPI as a fraction of the figure DPI
+      * cancel - Cancel all scheduled thumbnails
+      * shutdown - Cancel all scheduled thumbnails and stop the worker processes
+    """
+
+    _render_handler = None
+    _thumbnail_count = None
+    _scale = None
+    _max_workers = None
+    _executor = None
+    _worker_render_func = None
+    _worker_params = None
+    _lock = None
+    _generation = 0
+    _pending = None
+    _thumbnails = None
+    _layout = None
+    _min_frame_num = None
+    _max_frame_num = None
+    _image = None
+    _preview_frame_num = None
+    _shown_bbox = None
+    _underlay = None
+
+    def __init__(self, render_handler, thumbnail_count=DEFAULT_THUMBNAIL_COUNT,
+                 scale=DEFAULT_THUMBNAIL_SCALE, max_workers=None):
+        """
+        Constructor
+
+        Parameters:
+          * render_handler - Instance of RenderManager whose frames are previewed
+          * thumbnail_count (optional) - Number of thumbnails spread over the animation
+          * scale (optional) - Thumbnail DPI as a fraction of the figure DPI
+          * max_workers (optional) - Number of worker processes; defaults to the CPU count
+        """
+        from matplotlib.image import FigureImage
+
+        assert thumbnail_count > 1, 'thumbnail_count must be greater than 1'
+        assert 0 < scale <= 1, 'scale must be greater than 0 and at most 1'
+
+        self._render_handler = render_handler
+        self._thumbnail_count = thumbnail_count
+        self._scale = scale
+        self._max_workers = max_workers
+        self._lock = threading.Lock()
+        self._pending = []
+        self._thumbnails = {}
+
+        figure = render_handler.get_animation_axes().figure
+        # Not added to the figure so full redraws and the blitting background never include it
+        self._image = FigureImage(figure, origin='upper', zorder=THUMBNAIL_ZORDER)
+        self._image.set_visible(False)
+        figure.canvas.mpl_connect('draw_event', self._handle_draw_event)
+
+    def initialize(self, min_frame_num, max_frame_num):
+        """
+        Discard the current thumbnails and schedule the thumbnails of an animation
+
+        Parameters:
+          * min_frame_num - The minimum frame number in the animation
+          * max_frame_num - The maximum frame number in the animation
+        """
+        self.hide_thumbnail()
+        self._min_frame_num = min_frame_num
+        self._max_frame_num = max_frame_num
+        self._schedule()
+
+    def show_thumbnail(self, frame_num):
+        """
+        Show the finished thumbnail nearest to a frame number above the Scrubber Slider position
+          of that frame; schedules the thumbnails again if the window was resized
+
+        Parameters:
+          * frame_num - The frame number to preview
+
+        Returns a boolean indicating whether a thumbnail is shown
+        """
+        if self._min_frame_num is None:
+            return False
+        if self._get_layout() != self._layout:
+            self._schedule()
+
+        thumbnail = self.get_thumbnail(frame_num)
+        if thumbnail is None:
+            self.hide_thumbnail()
+            return False
+
+        self._erase()
+        self._image.set_data(thumbnail[1])
+        self._shown_bbox = self._place_image(frame_num, thumbnail[1].shape)
+        self._image.set_visible(True)
+        self._preview_frame_num = frame_num
+        self._draw_image()
+        self._image.figure.canvas.blit(self._image.figure.bbox)
+        return True
+
+    def hide_thumbnail(self, blit=True):
+        """
+        Hide the shown thumbnail, restoring the pixels it covered
+
+        Parameters:
+          * blit (optional) - Boolean indicating whether the restored pixels are blitted to the
+              screen; False when the canvas is about to be redrawn anyway
+        """
+        if not self._image.get_visible():
+            return
+
+        self._image.set_visible(False)
+        self._preview_frame_num = None
+        self._erase()
+        if blit:
+            self._image.figure.canvas.blit(self._image.figure.bbox)
+
+    def get_preview_frame_number(self):
+        """
+        Returns the frame number being previewed; None if no thumbnail is shown
+        """
+        return self._preview_frame_num
+
+    def get_thumbnail(self, frame_num):
+        """
+        Returns a tuple of the frame number and pixels of the finished thumbnail nearest to a
+          frame number or None if no thumbnail has finished rendering
+
+        Parameters:
+          * frame_num - The frame number to preview
+        """
+        with self._lock:
+            if not self._thumbnails:
+                return None
+            nearest_frame_num = min(self._thumbnails,
+                                    key=lambda thumbnail_frame: abs(thumbnail_frame - frame_num))
+            return nearest_frame_num, self._thumbnails[nearest_frame_num]
+
+    def get_thumbnail_frames(self):
+        """
+        Returns a sorted list of the frame numbers of the finished thumbnails
+        """
+        with self._lock:
+            return sorted(self._thumbnails)
+
+    def get_visible(self):
+        """
+        Returns a boolean indicating whether a thumbnail is shown
+        """
+        return self._image.get_visible()
+
+    def get_thumbnail_count(self):
+        """
+        Returns the number of thumbnails spread over the animation
+        """
+        return self._thumbnail_count
+
+    def get_scale(self):
+        """
+        Returns the thumbnail DPI as a fraction of the figure DPI
+        """
+        return self._scale
+
+    def cancel(self):
+        """
+        Cancel all scheduled thumbnails which have not started rendering; finished thumbnails
+          are kept
+        """
+        with self._lock:
+            self._generation += 1
+            pending = self._pending
+            self._pending = []
+        for future in pending:
+            future.cancel()
+
+    def shutdown(self):
+        """
+        Cancel all scheduled thumbnails and stop the worker processes
+        """
+        self.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _schedule(self):
+        """
+        Discard the current thumbnails and submit the thumbnails of the current animation and
+          window layout to the worker processes
+        """
+        self.cancel()
+        with self._lock:
+            self._thumbnails = {}
+        self._layout = self._get_layout()
+
+        render_func = self._render_handler.get_render_func()
+        if render_func is None:
+            return
+
+        canvas_params = self._render_handler.get_canvas_params()
+        thumbnail_params = CanvasParams(canvas_params.figure_size,
+                                        canvas_params.dpi * self._scale,
+                                        canvas_params.animation_axes_rect,
+                                        canvas_params.animation_x_limits,
+                                        canvas_params.animation_y_limits,
+                                        canvas_params.axis_visible)
+
+        if render_func is not self._worker_render_func or thumbnail_params != self._worker_params:
+            # The workers were started for another render function or window layout
+            self.shutdown()
+
+        frame_nums = numpy.unique(numpy.linspace(self._min_frame_num, self._max_frame_num,
+                                                 self._thumbnail_count).round().astype(int))
+        executor = self._get_executor(render_func, thumbnail_params)
+        with self._lock:
+            generation = self._generation
+        for index in _get_coarse_to_fine_order(len(frame_nums)):
+            frame_num = int(frame_nums[index])
+            future = executor.submit(headless_helper.render_worker_frame, frame_num)
+            with self._lock:
+                self._pending.append(future)
+            future.add_done_callback(
+                lambda done, frame_num=frame_num: self._collect(done, frame_num, generation))
+
+    def _collect(self, future, frame_num, generation):
+        """
+        Store a finished thumbnail; called from a thread of the worker pool
+
+        Parameters:
+          * future - The finished Future of the thumbnail
+          * frame_num - The frame number of the thumbnail
+          * generation - The scheduling generation the thumbnail was submitted in
+        """
+        if future.cancelled() or future.exception() is not None:
+            return
+
+        with self._lock:
+            if generation == self._generation:
+                self._thumbnails[frame_num] = future.result()
+
+    def _get_layout(self):
+        """
+        Returns a hashable value describing the figure size, DPI and animation axes position
+          which the thumbnail pixels depend on
+        """
+        figure = self._image.figure
+        return (tuple(figure.bbox.size), figure.dpi,
+                tuple(self._render_handler.get_animation_axes().bbox.bounds))
+
+    def _place_image(self, frame_num, thumbnail_shape):
+        """
+        Position the thumbnail centered above the Scrubber Slider position of a frame
+
+        Parameters:
+          * frame_num - The frame number previewed
+          * thumbnail_shape - Shape of the thumbnail pixels
+
+        Returns the display space bounding box covered by the thumbnail
+        """
+        from matplotlib.transforms import Bbox
+
+        figure = self._image.figure
+        slider_bbox = self._render_handler.get_slider_axes().bbox
+        height, width = thumbnail_shape[:2]
+
+        total_frames = max(self._max_frame_num - self._min_frame_num, 1)
+        fraction = (frame_num - self._min_frame_num) / total_frames
+        center_x = slider_bbox.x0 + fraction * slider_bbox.width
+        offset_x = int(round(min(max(center_x - width / 2, 0), figure.bbox.width - width)))
+        offset_y = int(round(slider_bbox.y1 + THUMBNAIL_MARGIN))
+
+        self._image.ox = offset_x
+        self._image.oy = offset_y
+        return Bbox.from_bounds(offset_x, offset_y, width, height)
+
+    def _draw_image(self):
+        """
+        Save the canvas pixels under the thumbnail and draw the thumbnail over them
+        """
+        self._underlay = self._image.figure.canvas.copy_from_bbox(self._shown_bbox)
+        self._image.figure.draw_artist(self._image)
+
+    def _erase(self):
+        """
+        Restore the canvas pixels under the last drawn thumbnail
+        """
+        if self._underlay is not None:
+            self._image.figure.canvas.restore_region(self._underlay)
+            self._underlay = None
+
+    def _get_executor(self, render_func, thumbnail_params):
+        """
+        Returns the worker process pool, starting it on first use with the render function and
+          thumbnail canvas parameters; the render function is checked to be picklable only when
+          it changes, so resizing the window never checks it again
+
+        Parameters:
+          * render_func - The external render function
+          * thumbnail_params - Instance of CanvasParams describing the low DPI canvas to render on
+        """
+        if self._executor is None:
+            if render_func is not self._worker_render_func:
+                type_validation.assert_is_picklable(render_func, 'render_func')
+            self._executor = ProcessPoolExecutor(self._max_workers,
+                                                 initializer=headless_helper.initialize_worker,
+                                                 initargs=(thumbnail_params, render_func))
+            self._worker_render_func = render_func
+            self._worker_params = thumbnail_params
+        return self._executor
+
+    def _handle_draw_event(self, _):
+        """
+        Handle Matplotlib draw_event; draws the shown thumbnail over the redrawn figure
+        """
+        if self._image.get_visible():
+            self._draw_image()
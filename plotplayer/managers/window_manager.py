@@ -5,9 +5,7 @@ Public Classes:
   * WindowManager - Manages a Matplotlib figure as a Window
 """
 
-from tkinter.constants import BOTTOM, X
-from matplotlib import pyplot
-
+from ..helpers import headless_helper, ui_helper
 from ..validators import type_validation
 
 # Aspect ratio (ie. 4:3, 16:9, 21:9) in relation to DPI; default is half 16:9 (8:4.5)
@@ -24,13 +22,16 @@ class WindowManager(object):
       * set_toolbar_visible - Method to hide/show the Matplotlib Navigation Toolbar
       * toggle_toolbar - Method to toggle the visibility of the Matplotlib Navigation Toolbar
       * get_figure - Returns the figure associated with the WindowManager
+      * is_headless - Returns whether the WindowManager has no window
     """
 
     _figure = None
     _toolbar_visible = False
+    _headless = False
 
+    #pylint: disable=too-many-arguments
     def __init__(self, window_size=_DEFAULT_WINDOW_SIZE, window_title=_DEFAULT_ANIMATION_NAME,
-                 figure=None, toolbar_visible=True):
+                 figure=None, toolbar_visible=True, headless=False):
         """
         Constructor
 
@@ -41,9 +42,14 @@ class WindowManager(object):
           * figure (optional) - A custom pre-built figure for a window
           * toolbar_visible (optional) - Boolean indicating whether the Matplotlib Navigation
               Toolbar is visible
+          * headless (optional) - Boolean indicating whether to render on an Agg Figure without a
+              window; pyplot and Tkinter are never loaded
         """
-        if figure is None:
-            figure = pyplot.figure(figsize=window_size)
+        self._headless = headless
+        if figure is None and headless:
+            figure = headless_helper.create_agg_figure(window_size)
+        elif figure is None:
+            figure = ui_helper.get_pyplot().figure(figsize=window_size)
         type_validation.assert_is_figure(figure, 'figure')
         self._figure = figure
 
@@ -56,7 +62,8 @@ class WindowManager(object):
         """
         if window_title is None:
             window_title = _DEFAULT_ANIMATION_NAME
-        self.get_figure().canvas.set_window_title(window_title)
+        if not self._headless:
+            self.get_figure().canvas.set_window_title(window_title)
 
     def get_toolbar_visible(self):
         """
@@ -66,12 +73,17 @@ class WindowManager(object):
 
     def set_toolbar_visible(self, visible):
         """
-        Method to hide/show the Matplotlib Navigation Toolbar
+        Method to hide/show the Matplotlib Navigation Toolbar; only records the visibility on
+          canvases without a toolbar (ie. headless canvases)
         """
-        if visible:
-            self._figure.canvas.toolbar.pack(side=BOTTOM, fill=X)
-        else:
-            self._figure.canvas.toolbar.pack_forget()
+        toolbar = getattr(self._figure.canvas, 'toolbar', None)
+        if toolbar is not None:
+            from tkinter.constants import BOTTOM, X
+
+            if visible:
+                toolbar.pack(side=BOTTOM, fill=X)
+            else:
+                toolbar.pack_forget()
 
         self._toolbar_visible = visible
 
@@ -86,3 +98,9 @@ class WindowManager(object):
         Returns the figure used for the Window
         """
         return self._figure
+
+    def is_headless(self):
+        """
+        Returns a boolean indicating whether the WindowManager renders without a window
+        """
+        return self._headless
@@ -0,0 +1,310 @@
+"""
+PlotPlayer Notebook Player - Plays a headless PlotPlayer in Jupyter through ipywidgets
+
+Notes :
+  * ipywidgets is an optional dependency; it is imported when the first NotebookPlayer is created
+  * Widget traits are only set on the tornado IOLoop of the kernel; frames rendered by the
+      renderer thread are handed to it with IOLoop.add_callback
+
+Public Constants:
+  * DEFAULT_CLIENT_CACHE_FRAMES - Default number of encoded frames kept by the front end
+
+Public Classes:
+  * NotebookPlayer - Renders frames on demand on the kernel and sends them to the front end as
+      binary widget buffers
+"""
+
+import functools
+import threading
+from collections import OrderedDict
+
+from .helpers import raster_helper
+from .managers.animation_manager import SEEK_ORIGIN_API, SEEK_ORIGIN_USER
+
+DEFAULT_CLIENT_CACHE_FRAMES = 32
+
+IPYWIDGETS_MISSING_MESSAGE = ('NotebookPlayer requires ipywidgets; install it with '
+                              'pip install ipywidgets')
+
+_HIDDEN_DISPLAY = 'none'
+_VISIBLE_DISPLAY = str()
+_SLIDER_DESCRIPTION = 'Frame'
+
+def _import_widgets():
+    """
+    Returns the ipywidgets module; raises an ImportError explaining how to install it if missing
+    """
+    try:
+        import ipywidgets
+    except ImportError as error:
+        raise ImportError(IPYWIDGETS_MISSING_MESSAGE) from error
+    return ipywidgets
+
+def _get_loop_callback():
+    """
+    Returns the thread safe add_callback method of the IOLoop of the calling thread; None if
+      tornado is not installed, in which case there is no kernel IOLoop to defer to
+    """
+    try:
+        from tornado.ioloop import IOLoop
+    except ImportError:
+        return None
+    return IOLoop.current().add_callback
+
+class NotebookPlayer(object):
+    """
+    Jupyter player for a headless PlotPlayer
+
+    Frames are rendered by the AnimationManager of the player only when they are requested, encoded
+    once and assigned to an ipywidgets Image; widget byte values travel to the front end as binary
+    buffers instead of base64 text.  The front end keeps a small pool of Image widgets holding the
+    most recently shown frames, so showing a frame which is still in the pool only switches which
+    image is visible and sends no image data.  Slider changes are coalesced by a renderer thread:
+    changes arriving while a frame renders replace each other and only the latest is rendered.
+    Widgets are not thread safe, so the renderer thread hands the new image and visibility to the
+    IOLoop of the kernel, captured when the player is created, instead of setting them itself.
+
+    The notebook only stores a reference to the widget, so its size does not depend on the number
+    of frames; the first frame is rendered before the widget is displayed.  The pool lives in the
+    widget models of the front end and is lost when the kernel restarts or the page is reloaded.
+
+    Public Methods:
+      * get_widget - Returns the ipywidgets widget of the player
+      * show_frame - Render and show a frame immediately
+      * request_frame - Request a frame to be shown; only the most recent request is rendered
+      * get_frame_number - Returns the frame number shown
+      * get_client_cache_frames - Returns the number of frames kept by the front end
+      * get_sent_frame_count - Returns the number of frames sent to the front end
+      * get_sent_bytes - Returns the number of encoded frame bytes sent to the front end
+      * get_request_count - Returns the number of frame requests received from the slider
+      * close - Stop the renderer thread and close the widgets
+    """
+
+    _player = None
+    _animation_handler = None
+    _render_handler = None
+    _image_format = None
+    _quality = None
+    _images = None
+    _slot_frames = None
+    _visible_slot = None
+    _signature = None
+    _slider = None
+    _play = None
+    _widget = None
+    _render_lock = None
+    _request_condition = None
+    _requested_frame = None
+    _renderer_thread = None
+    _loop_thread = None
+    _add_loop_callback = None
+    _closed = False
+    _frame_num = None
+    _sent_frames = 0
+    _sent_bytes = 0
+    _requests = 0
+
+    #pylint: disable=too-many-arguments
+    def __init__(self, player, image_format=raster_helper.IMAGE_FORMAT_PNG,
+                 quality=raster_helper.DEFAULT_JPEG_QUALITY,
+                 client_cache_frames=DEFAULT_CLIENT_CACHE_FRAMES):
+        """
+        Constructor
+
+        Parameters:
+          * player - An initialized headless PlotPlayer instance
+          * image_format (optional) - One of the IMAGE_FORMAT constants of the raster_helper
+          * quality (optional) - JPEG quality between 1 and 95
+          * client_cache_frames (optional) - Number of encoded frames kept by the front end
+        """
+        widgets = _import_widgets()
+
+        self._player = player
+        self._animation_handler = player.get_animation_manager()
+        self._render_handler = player.get_render_manager()
+        self._image_format = image_format
+        self._quality = quality
+        self._render_lock = threading.Lock()
+        self._request_condition = threading.Condition()
+        self._loop_thread = threading.current_thread()
+        self._add_loop_callback = _get_loop_callback()
+
+        width, height = player.get_window_manager().get_figure().canvas.get_width_height()
+        self._images = [widgets.Image(format=image_format, width=width, height=height,
+                                      layout=widgets.Layout(display=_HIDDEN_DISPLAY))
+                        for _ in range(max(client_cache_frames, 1))]
+        self._slot_frames = OrderedDict()
+
+        min_frame_num = self._animation_handler.get_min_frame_number()
+        max_frame_num = self._animation_handler.get_max_frame_number()
+        frame_num = self._animation_handler.get_frame_number()
+        interval = max(int(1000 / self._animation_handler.get_frame_rate()), 1)
+        self._slider = widgets.IntSlider(value=frame_num, min=min_frame_num, max=max_frame_num,
+                                         description=_SLIDER_DESCRIPTION)
+        self._play = widgets.Play(value=frame_num, min=min_frame_num, max=max_frame_num,
+                                  interval=interval)
+        # The Play widget advances the slider in the front end; no kernel timer is involved
+        widgets.jslink((self._play, 'value'), (self._slider, 'value'))
+        self._widget = widgets.VBox([widgets.Box(self._images),
+                                     widgets.HBox([self._play, self._slider])])
+
+        self.show_frame(frame_num, SEEK_ORIGIN_API)
+        self._slider.observe(self._handle_slider_change, names='value')
+        self._renderer_thread = threading.Thread(target=self._run_renderer, daemon=True)
+        self._renderer_thread.start()
+
+    def _ipython_display_(self):
+        """
+        Display the player widget in a notebook output
+        """
+        from IPython.display import display
+
+        display(self._widget)
+
+    def get_widget(self):
+        """
+        Returns the ipywidgets widget of the player
+        """
+        return self._widget
+
+    def show_frame(self, frame_num, origin=SEEK_ORIGIN_API):
+        """
+        Render and show a frame immediately; frames still held by the front end are shown without
+          rendering or sending them again
+
+        Parameters:
+          * frame_num - The frame number to show
+          * origin (optional) - One of the SEEK_ORIGIN constants describing what requested the
+              frame
+        """
+        with self._render_lock:
+            signature = self._render_handler.get_render_signature()
+            if signature != self._signature:
+                self._slot_frames.clear()
+                self._signature = signature
+
+            slot = self._slot_frames.get(frame_num)
+            if slot is None:
+                self._animation_handler.render(frame_num, origin, force_draw=True)
+                pixels = raster_helper.get_canvas_pixels(
+                    self._player.get_window_manager().get_figure().canvas)
+                encoded_frame = raster_helper.encode_image(pixels, self._image_format,
+                                                           self._quality)
+                slot = self._get_free_slot()
+                self._update_widget(self._images[slot], 'value', encoded_frame)
+                self._sent_frames += 1
+                self._sent_bytes += len(encoded_frame)
+
+            self._slot_frames[frame_num] = slot
+            self._slot_frames.move_to_end(frame_num)
+            self._show_slot(slot)
+            self._frame_num = frame_num
+
+    def request_frame(self, frame_num):
+        """
+        Request a frame to be shown by the renderer thread; requests made while a frame renders
+          replace each other so only the most recent frame is rendered
+
+        Parameters:
+          * frame_num - The frame number to show
+        """
+        with self._request_condition:
+            self._requests += 1
+            self._requested_frame = frame_num
+            self._request_condition.notify()
+
+    def get_frame_number(self):
+        """
+        Returns the frame number shown
+        """
+        return self._frame_num
+
+    def get_client_cache_frames(self):
+        """
+        Returns the number of encoded frames kept by the front end
+        """
+        return len(self._images)
+
+    def get_sent_frame_count(self):
+        """
+        Returns the number of frames sent to the front end
+        """
+        return self._sent_frames
+
+    def get_sent_bytes(self):
+        """
+        Returns the number of encoded frame bytes sent to the front end
+        """
+        return self._sent_bytes
+
+    def get_request_count(self):
+        """
+        Returns the number of frame requests received
+        """
+        return self._requests
+
+    def close(self):
+        """
+        Stop the renderer thread and close the widgets
+        """
+        with self._request_condition:
+            self._closed = True
+            self._request_condition.notify()
+        self._renderer_thread.join()
+        self._widget.close_all()
+
+    def _get_free_slot(self):
+        """
+        Returns the index of an unused Image widget or of the least recently shown one
+        """
+        if len(self._slot_frames) < len(self._images):
+            used_slots = set(self._slot_frames.values())
+            return next(slot for slot in range(len(self._images)) if slot not in used_slots)
+
+        _, slot = self._slot_frames.popitem(last=False)
+        return slot
+
+    def _show_slot(self, slot):
+        """
+        Make one Image widget visible and hide the previously visible one
+        """
+        if slot == self._visible_slot:
+            return
+
+        if self._visible_slot is not None:
+            self._update_widget(self._images[self._visible_slot].layout, 'display',
+                                _HIDDEN_DISPLAY)
+        self._update_widget(self._images[slot].layout, 'display', _VISIBLE_DISPLAY)
+        self._visible_slot = slot
+
+    def _update_widget(self, widget, name, value):
+        """
+        Set a widget trait on the IOLoop thread; updates from other threads are queued on the
+          IOLoop in order
+        """
+        if (self._add_loop_callback is None or
+                threading.current_thread() is self._loop_thread):
+            setattr(widget, name, value)
+        else:
+            self._add_loop_callback(functools.partial(setattr, widget, name, value))
+
+    def _handle_slider_change(self, change):
+        """
+        Handle slider and Play widget value changes
+        """
+        self.request_frame(change['new'])
+
+    def _run_renderer(self):
+        """
+        Renderer thread; shows the most recently requested frame
+        """
+        while True:
+            with self._request_condition:
+                while self._requested_frame is None and not self._closed:
+                    self._request_condition.wait()
+                if self._closed:
+                    return
+                frame_num = self._requested_frame
+                self._requested_frame = None
+
+            self.show_frame(frame_num, SEEK_ORIGIN_USER)
@@ -0,0 +1,281 @@
+"""
+PlotPlayer Player Group - Drives several PlotPlayers from a single clock
+
+Public Classes:
+  * PlayerGroup - Plays, stops and seeks several PlotPlayer instances as one
+"""
+
+from .managers.playback_manager import SEEK_ORIGIN_API, SEEK_ORIGIN_USER, PlaybackManager
+
+EMPTY_GROUP_MESSAGE = 'PlayerGroup contains no players'
+
+class PlayerGroup(object):
+    """
+    Group of PlotPlayer instances sharing one playback timer and frame index
+
+    The shared timer and seek requests are driven by the same PlaybackManager as a single
+    AnimationManager, so ticks follow the same wall clock, playback rate, direction, stride and
+    frame dropping rules.  Every frame
+    is rendered on every player before any canvas is drawn, then each canvas is drawn or blitted
+    once, so the players repaint together instead of once per player timer.  Play, stop, seek,
+    scrubber and playback rate requests of any player in the group act on the whole group; seeks
+    during playback continue playback from the sought frame.  Players with fewer frames hold their last frame.
+
+    Public Methods:
+      * add_player - Add a PlotPlayer to the group
+      * remove_player - Remove a PlotPlayer from the group
+      * get_players - Returns the PlotPlayers in the group
+      * play - Begin playback of every player from the shared frame index
+      * stop - Stop playback of every player
+      * toggle_playback - Toggle between play and stop states
+      * is_playing - Returns whether the group is playing
+      * render - Render a frame on every player immediately
+      * request_seek - Request a frame to be rendered on every player on the next display refresh
+      * get_target_frame_number - Returns the frame number of the pending seek request or the
+          shared frame number
+      * get_frame_number - Returns the shared frame number
+      * get_min_frame_number - Returns the smallest minimum frame number of the players
+      * get_max_frame_number - Returns the largest maximum frame number of the players
+      * get_frame_rate - Returns the frame rate of the shared timer
+      * set_frame_rate - Sets the frame rate of the shared timer
+      * get_playback_rate - Returns the shared playback speed multiplier
+      * set_playback_rate - Sets the shared playback speed multiplier; negative plays in reverse
+      * get_drop_frames - Returns whether frames are dropped to keep up with wall clock time
+      * set_drop_frames - Sets whether frames are dropped to keep up with wall clock time
+      * get_playback_stats - Returns the achieved and target frame rates and dropped frames
+      * get_playback_manager - Returns the PlaybackManager driving the shared timer and seeks
+    """
+
+    _players = None
+    _frame_num = 0
+    _frame_rate = None
+    _playback_handler = None
+
+    def __init__(self, players=None, frame_rate=None):
+        """
+        Constructor
+
+        Parameters:
+          * players (optional) - List of PlotPlayer instances to drive
+          * frame_rate (optional) - Frame rate of the shared timer; defaults to the frame rate of
+              the first player
+        """
+        self._players = []
+        self._frame_rate = frame_rate
+        self._playback_handler = PlaybackManager(self, self._get_canvas)
+        for player in players if players is not None else []:
+            self.add_player(player)
+
+    def add_player(self, player):
+        """
+        Add a PlotPlayer to the group; its own playback is stopped and it is moved to the shared
+          frame number
+
+        Parameters:
+          * player - An initialized PlotPlayer instance
+        """
+        if player in self._players:
+            return
+
+        animation_handler = player.get_animation_manager()
+        animation_handler.set_player_group(self)
+        if not self._players:
+            self._frame_num = animation_handler.get_frame_number()
+            self._playback_handler.set_playback_rate(animation_handler.get_playback_rate())
+            self._playback_handler.set_drop_frames(animation_handler.get_drop_frames())
+        self._players.append(player)
+        animation_handler.set_playback_rate(self.get_playback_rate())
+        animation_handler.set_drop_frames(self.get_drop_frames())
+        animation_handler.render(self._frame_num, SEEK_ORIGIN_API)
+
+    def remove_player(self, player):
+        """
+        Remove a PlotPlayer from the group; the player keeps its current frame
+
+        Parameters:
+          * player - A PlotPlayer instance in the group
+        """
+        if player not in self._players:
+            return
+
+        self._players.remove(player)
+        player.get_animation_manager().set_player_group(None)
+        if not self._players:
+            self.stop()
+
+    def get_players(self):
+        """
+        Returns a list of the PlotPlayer instances in the group
+        """
+        return list(self._players)
+
+    def play(self):
+        """
+        Begin playback of every player from the shared frame number; restart playback from the
+          beginning if every player is at its last frame, or from the end if every player is at
+          its first frame while playing in reverse
+        """
+        assert self._players, EMPTY_GROUP_MESSAGE
+        self._frame_num = self._playback_handler.play()
+
+    def stop(self):
+        """
+        Stop playback of every player at the shared frame number
+        """
+        self._playback_handler.stop()
+
+    def toggle_playback(self):
+        """
+        Toggle between play and stop states
+        """
+        if self.is_playing():
+            self.stop()
+        else:
+            self.play()
+
+    def is_playing(self):
+        """
+        Returns a boolean indicating whether the group is playing
+        """
+        return self._playback_handler.is_playing()
+
+    def render(self, frame_num, origin=SEEK_ORIGIN_API, force_draw=False):
+        """
+        Render a frame on every player, then draw each canvas once
+
+        Parameters:
+          * frame_num - The shared frame number to render
+          * origin (optional) - One of the SEEK_ORIGIN constants describing what requested the
+              frame
+          * force_draw (optional) - Boolean indicating whether the canvases are drawn immediately
+              instead of when the GUI is idle
+        """
+        frame_num = min(max(int(round(frame_num)), self.get_min_frame_number()),
+                        self.get_max_frame_number())
+        self._frame_num = frame_num
+        self._playback_handler.handle_render(frame_num, origin)
+
+        animation_handlers = [player.get_animation_manager() for player in self._players]
+        for animation_handler in animation_handlers:
+            animation_handler.render(frame_num, origin, force_draw, defer_draw=True)
+        for animation_handler in animation_handlers:
+            animation_handler.draw_deferred()
+
+    def request_seek(self, frame_num, origin=SEEK_ORIGIN_USER):
+        """
+        Request a frame to be rendered on every player on the next display refresh; requests made
+          before then replace each other so only the most recent frame is rendered
+
+        Parameters:
+          * frame_num - The shared frame number to render
+          * origin (optional) - One of the SEEK_ORIGIN constants describing what requested the
+              frame
+        """
+        self._playback_handler.request_seek(frame_num, origin)
+
+    def get_target_frame_number(self):
+        """
+        Returns the frame number of the pending seek request or the shared frame number if no
+          seek is pending
+        """
+        return self._playback_handler.get_target_frame_number()
+
+    def get_frame_number(self):
+        """
+        Returns the shared frame number
+        """
+        return self._frame_num
+
+    def get_min_frame_number(self):
+        """
+        Returns the smallest minimum frame number of the players
+        """
+        return min(player.get_animation_manager().get_min_frame_number()
+                   for player in self._players)
+
+    def get_max_frame_number(self):
+        """
+        Returns the largest maximum frame number of the players
+        """
+        return max(player.get_animation_manager().get_max_frame_number()
+                   for player in self._players)
+
+    def get_frame_rate(self):
+        """
+        Returns the frame rate of the shared timer
+        """
+        if self._frame_rate is None:
+            assert self._players, EMPTY_GROUP_MESSAGE
+            return self._players[0].get_animation_manager().get_frame_rate()
+        return self._frame_rate
+
+    def set_frame_rate(self, frame_rate):
+        """
+        Set the frame rate of the shared timer; None follows the frame rate of the first player
+        """
+        playing = self.is_playing()
+        self.stop()
+        self._frame_rate = frame_rate
+        if playing:
+            self.play()
+
+    def get_playback_rate(self):
+        """
+        Returns the shared playback speed multiplier; negative values play in reverse
+        """
+        return self._playback_handler.get_playback_rate()
+
+    def set_playback_rate(self, playback_rate):
+        """
+        Set the playback speed multiplier of every player; the shared playback clock is
+          re-anchored at the shared frame number so the change applies from the next tick
+
+        Parameters:
+          * playback_rate - Speed multiplier whose magnitude is between MIN_PLAYBACK_RATE and
+              MAX_PLAYBACK_RATE; negative values play in reverse
+        """
+        if float(playback_rate) == self.get_playback_rate():
+            return
+
+        self._playback_handler.set_playback_rate(playback_rate)
+        for player in self._players:
+            player.get_animation_manager().set_playback_rate(playback_rate)
+
+    def get_drop_frames(self):
+        """
+        Returns a boolean indicating whether frames are dropped to keep up with wall clock time
+        """
+        return self._playback_handler.get_drop_frames()
+
+    def set_drop_frames(self, drop_frames):
+        """
+        Set whether every player skips frames which can no longer be shown on time
+
+        Parameters:
+          * drop_frames - Boolean; False shows every frame for frame exact review
+        """
+        if drop_frames == self.get_drop_frames():
+            return
+
+        self._playback_handler.set_drop_frames(drop_frames)
+        for player in self._players:
+            player.get_animation_manager().set_drop_frames(drop_frames)
+
+    def get_playback_stats(self):
+        """
+        Returns a PlaybackStats instance for the current or last group playback
+        """
+        return self._playback_handler.get_playback_stats()
+
+    def get_playback_manager(self):
+        """
+        Returns the PlaybackManager driving the shared timer and coalescing seek requests
+        """
+        return self._playback_handler
+
+    def _get_canvas(self):
+        """
+        Returns the canvas of the first player; it owns the shared timers
+        """
+        assert self._players, EMPTY_GROUP_MESSAGE
+        return self._players[0].get_window_manager().get_figure().canvas
@@ -6,6 +6,9 @@ Public Classes:
 """
 from .helpers import ui_helper
 from .data_models.animation_params import AnimationParams
+from .data_models.series_params import SeriesParams
+from .frame_sources.array_frame_source import ArrayFrameSource
+from .frame_sources.image_frame_source import ImageFrameSource
 from .managers import window_manager, render_manager, animation_manager, input_manager
 
 class PlotPlayer(object):
@@ -17,6 +20,9 @@ class PlotPlayer(object):
 
     Public Methods:
       * initialize - Initialize the PlotPlayer instance for animation playback
+      * initialize_from_source - Initialize the PlotPlayer instance for playback of a frame source
+      * initialize_from_arrays - Initialize the PlotPlayer instance for playback of stacked arrays
+      * initialize_from_images - Initialize the PlotPlayer instance for playback of an image stack
       * play - Begin playback
       * stop - Stop playback
       * get_window_manager - Returns the WindowManager for the PlotPlayer Instance
@@ -30,8 +36,9 @@ class PlotPlayer(object):
     _animation_handler = None
     _input_handler = None
 
+    #pylint: disable=too-many-arguments
     def __init__(self, window_handler=None, render_handler=None, animation_handler=None,
-                 input_handler=None):
+                 input_handler=None, headless=False):
         """
         Constructor
 
@@ -40,9 +47,11 @@ class PlotPlayer(object):
           * render_handler (optional) - Pre-setup RenderManager instance
           * animation_handler (optional) - Pre-setup AnimationManager instance
           * input_handler (optional) - Pre-setup InputManager instance
+          * headless (optional) - Boolean indicating whether the default WindowManager renders on
+              an Agg Figure without a window, pyplot or Tkinter
         """
         if window_handler is None:
-            window_handler = window_manager.WindowManager()
+            window_handler = window_manager.WindowManager(headless=headless)
         self._window_handler = window_handler
         figure = self._window_handler.get_figure()
 
@@ -65,7 +74,9 @@ class PlotPlayer(object):
 
         Parameters:
           * total_frames - The total frame count in the animation
-          * draw_func - The external render method to call for reach frame rendering
+          * draw_func - The external render method to call for reach frame rendering; called as
+              draw_func(frame_num, axes), it must draw onto the axes it is given since exports
+              and previews call it with axes of separate headless figures
           * animation_name (optional) - The name for the current animation
         """
         self.stop()
@@ -77,6 +88,51 @@ class PlotPlayer(object):
         self._input_handler.set_enabled(True)
         self.get_animation_manager().render(0)
 
+    def initialize_from_source(self, frame_source, animation_name=None):
+        """
+        Initialize the PlotPlayer instance for playback of a frame source; the total frame count
+          and axis limits are taken from the frame source
+
+        Parameters:
+          * frame_source - A frame source instance (ie. ArrayFrameSource)
+          * animation_name (optional) - The name for the current animation
+        """
+        animation_x_limits, animation_y_limits = frame_source.get_limits()
+        self._render_handler.set_limits(animation_x_limits, animation_y_limits)
+        self.initialize(frame_source.get_total_frames(), frame_source, animation_name)
+
+    def initialize_from_arrays(self, series, animation_name=None):
+        """
+        Initialize the PlotPlayer instance for playback of stacked per frame arrays; artists are
+          created once and updated with views of the arrays for each frame
+
+        Parameters:
+          * series - Instance of SeriesParams, a list of SeriesParams instances or an array of
+              shape (frames, points) containing the y values of a single line
+          * animation_name (optional) - The name for the current animation
+        """
+        if not isinstance(series, (list, tuple, SeriesParams)):
+            series = SeriesParams(series)
+        self.initialize_from_source(ArrayFrameSource(series), animation_name)
+
+    #pylint: disable=too-many-arguments
+    def initialize_from_images(self, images, animation_name=None, vmin=None, vmax=None,
+                               extent=None):
+        """
+        Initialize the PlotPlayer instance for playback of an image stack; a single AxesImage is
+          created and updated with views of the image stack for each frame
+
+        Parameters:
+          * images - Array or numpy.memmap of shape (frames, rows, columns) or
+              (frames, rows, columns, 3 or 4)
+          * animation_name (optional) - The name for the current animation
+          * vmin (optional) - Value mapped to the bottom of the colormap
+          * vmax (optional) - Value mapped to the top of the colormap
+          * extent (optional) - [ left, right, bottom, top ] of the image in data coordinates
+        """
+        frame_source = ImageFrameSource(images, vmin, vmax, extent)
+        self.initialize_from_source(frame_source, animation_name)
+
     def play(self):
         """
         Method to begin playback
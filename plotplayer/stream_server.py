@@ -0,0 +1,561 @@
+"""
+PlotPlayer Stream Server - Serves the frames of a headless PlotPlayer to browsers over HTTP
+
+Public Constants:
+  * DEFAULT_HOST - Default address the server listens on; the loopback interface
+  * DEFAULT_STREAM_CACHE_BYTES - Default byte budget of the encoded frame cache
+  * COMMAND_PLAY - Command beginning playback
+  * COMMAND_STOP - Command stopping playback
+  * COMMAND_TOGGLE - Command toggling between play and stop states
+  * COMMAND_SEEK - Command showing a frame number
+  * COMMAND_STEP - Command moving a number of frames from the current frame
+
+Public Classes:
+  * StreamServer - Renders a PlotPlayer on its headless Agg canvas and streams the frames to any
+      number of browsers
+"""
+
+import contextlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from .helpers import html_helper, raster_helper
+from .managers.animation_manager import SEEK_ORIGIN_API, SEEK_ORIGIN_PLAYBACK, SEEK_ORIGIN_USER
+from .managers.frame_cache_manager import FrameCacheManager
+from .validators import type_validation
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_STREAM_CACHE_BYTES = 64 * 1024 * 1024
+
+COMMAND_PLAY = 'play'
+COMMAND_STOP = 'stop'
+COMMAND_TOGGLE = 'toggle'
+COMMAND_SEEK = 'seek'
+COMMAND_STEP = 'step'
+COMMANDS = [COMMAND_PLAY, COMMAND_STOP, COMMAND_TOGGLE, COMMAND_SEEK, COMMAND_STEP]
+
+PAGE_TITLE = 'PlotPlayer'
+PAGE_PATH = '/'
+STREAM_PATH = '/stream'
+FRAME_PATH = '/frame'
+STATE_PATH = '/state'
+COMMAND_PATH = '/command'
+
+ACTION_PARAMETER = 'action'
+VALUE_PARAMETER = 'value'
+FRAME_PARAMETER = 'number'
+
+_MULTIPART_BOUNDARY = 'plotplayerframe'
+_MULTIPART_CONTENT_TYPE = 'multipart/x-mixed-replace; boundary={}'.format(_MULTIPART_BOUNDARY)
+_MULTIPART_HEADER = ('--{}\r\nContent-Type: {}\r\nContent-Length: {}\r\n'
+                     'X-Frame-Number: {}\r\n\r\n')
+_HTML_CONTENT_TYPE = 'text/html; charset=utf-8'
+_JSON_CONTENT_TYPE = 'application/json'
+
+# Stream connections wake at least this often to notice the server shutting down
+_CLIENT_POLL_SECONDS = 0.5
+
+class StreamServer(object):
+    """
+    HTTP server streaming the frames of a headless PlotPlayer
+
+    Frames are rendered by the AnimationManager of the player on its Agg canvas, encoded once and
+    published to every connected viewer, so one render serves any number of viewers.  Encoded
+    frames are kept in a FrameCacheManager shared by all connections, so seeking back and forth or
+    requesting single frames does not render a frame twice while it is cached.  Playback is
+    driven by a clock thread of the server since a headless canvas has no event loop to fire
+    timers; renders are serialized by a lock so the render function is only ever called by one
+    thread at a time.
+
+    Endpoints:
+      * / - HTML page showing the stream with a slider and playback buttons
+      * /stream - MJPEG (multipart/x-mixed-replace) stream of the published frames
+      * /frame?number=N - A single encoded frame; the current frame if the number is omitted
+      * /state - JSON playback state
+      * /command?action=A&value=V - Runs one of the COMMAND constants and returns the JSON state
+
+    Public Methods:
+      * start - Begin serving on a background thread
+      * shutdown - Stop serving and close every connection
+      * get_address - Returns the host and port the server listens on
+      * get_url - Returns the URL of the viewer page
+      * play - Begin playback from the current frame
+      * stop - Stop playback at the current frame
+      * toggle_playback - Toggle between play and stop states
+      * seek - Show a frame number
+      * run_command - Run one of the COMMAND constants
+      * is_playing - Returns whether the server is playing
+      * get_frame_number - Returns the frame number of the last published frame
+      * get_state - Returns a dictionary describing the playback state
+      * get_frame_bytes - Returns a frame encoded as an image, rendering it if it is not cached
+      * iterate_frames - Yields every published frame until the server shuts down
+      * get_frame_size - Returns the width and height of the frames in pixels
+      * get_image_format - Returns the IMAGE_FORMAT constant frames are encoded with
+      * is_running - Returns whether the server is serving
+      * get_client_count - Returns the number of connected stream viewers
+      * get_cache_manager - Returns the FrameCacheManager holding encoded frames
+    """
+
+    _player = None
+    _animation_handler = None
+    _render_handler = None
+    _image_format = None
+    _quality = None
+    _frame_cache = None
+    _http_server = None
+    _serve_thread = None
+    _clock_thread = None
+    _render_lock = None
+    _frame_condition = None
+    _wake_event = None
+    _running = False
+    _playing = False
+    _play_start_time = None
+    _play_start_frame_num = None
+    _frame_num = None
+    _published_frame = None
+    _published_sequence = 0
+    _client_count = 0
+
+    #pylint: disable=too-many-arguments
+    def __init__(self, player, host=DEFAULT_HOST, port=0,
+                 image_format=raster_helper.IMAGE_FORMAT_JPEG,
+                 quality=raster_helper.DEFAULT_JPEG_QUALITY,
+                 cache_bytes=DEFAULT_STREAM_CACHE_BYTES):
+        """
+        Constructor
+
+        Parameters:
+          * player - An initialized PlotPlayer instance; a headless player is expected since
+              frames are rendered on its canvas from server threads
+          * host (optional) - Address to listen on; the loopback interface by default
+          * port (optional) - Port to listen on; 0 selects a free port
+          * image_format (optional) - One of the IMAGE_FORMAT constants of the raster_helper used
+              for streamed and single frames; browsers show multipart streams of either format
+          * quality (optional) - JPEG quality between 1 and 95
+          * cache_bytes (optional) - Byte budget of the encoded frame cache
+        """
+        type_validation.assert_is_in(image_format, raster_helper.IMAGE_FORMATS, 'image_format')
+
+        self._player = player
+        self._animation_handler = player.get_animation_manager()
+        self._render_handler = player.get_render_manager()
+        self._image_format = image_format
+        self._quality = quality
+        self._frame_cache = FrameCacheManager(cache_bytes)
+
+        self._render_lock = threading.Lock()
+        self._frame_condition = threading.Condition()
+        self._wake_event = threading.Event()
+        self._frame_num = self._animation_handler.get_frame_number()
+
+        self._http_server = ThreadingHTTPServer((host, port), _StreamRequestHandler)
+        self._http_server.daemon_threads = True
+        self._http_server.stream_server = self
+
+    def start(self):
+        """
+        Begin serving on a background thread; returns immediately
+        """
+        if self._running:
+            return
+
+        self._running = True
+        self._publish(self._frame_num)
+        self._serve_thread = threading.Thread(target=self._http_server.serve_forever,
+                                              daemon=True)
+        self._clock_thread = threading.Thread(target=self._run_clock, daemon=True)
+        self._serve_thread.start()
+        self._clock_thread.start()
+
+    def shutdown(self):
+        """
+        Stop serving; open stream connections are closed
+        """
+        if not self._running:
+            return
+
+        self._running = False
+        self._playing = False
+        self._wake_event.set()
+        with self._frame_condition:
+            self._frame_condition.notify_all()
+
+        self._http_server.shutdown()
+        self._http_server.server_close()
+        self._serve_thread.join()
+        self._clock_thread.join()
+
+    def get_address(self):
+        """
+        Returns a tuple of the host and port the server listens on
+        """
+        return self._http_server.server_address[:2]
+
+    def get_url(self):
+        """
+        Returns the URL of the viewer page
+        """
+        host, port = self.get_address()
+        return 'http://{}:{}{}'.format(host, port, PAGE_PATH)
+
+    def play(self):
+        """
+        Begin playback from the current frame; restarts from the beginning at the last frame
+        """
+        max_frame_num = self._animation_handler.get_max_frame_number()
+        with self._frame_condition:
+            frame_num = self._frame_num
+            if frame_num >= max_frame_num:
+                frame_num = self._animation_handler.get_min_frame_number()
+            self._play_start_time = time.perf_counter()
+            self._play_start_frame_num = frame_num
+            self._playing = True
+        self._wake_event.set()
+
+    def stop(self):
+        """
+        Stop playback at the current frame
+        """
+        self._playing = False
+        self._wake_event.set()
+
+    def toggle_playback(self):
+        """
+        Toggle between play and stop states
+        """
+        if self._playing:
+            self.stop()
+        else:
+            self.play()
+
+    def seek(self, frame_num, origin=SEEK_ORIGIN_USER):
+        """
+        Render and publish a frame number; playback continues from it if the server is playing
+
+        Parameters:
+          * frame_num - The frame number to show
+          * origin (optional) - One of the SEEK_ORIGIN constants describing what requested the
+              frame
+        """
+        frame_num = self._clamp_frame_number(frame_num)
+        with self._frame_condition:
+            self._play_start_time = time.perf_counter()
+            self._play_start_frame_num = frame_num
+        self._publish(frame_num, origin)
+
+    def run_command(self, action, value=None):
+        """
+        Run a playback command
+
+        Parameters:
+          * action - One of the COMMAND constants
+          * value (optional) - Frame number of COMMAND_SEEK or frame count of COMMAND_STEP
+
+        Returns a dictionary describing the playback state after the command
+        """
+        type_validation.assert_is_in(action, COMMANDS, ACTION_PARAMETER)
+
+        if action == COMMAND_PLAY:
+            self.play()
+        elif action == COMMAND_STOP:
+            self.stop()
+        elif action == COMMAND_TOGGLE:
+            self.toggle_playback()
+        elif action == COMMAND_SEEK:
+            self.seek(int(value))
+        else:
+            self.stop()
+            self.seek(self._frame_num + int(value if value is not None else 1))
+
+        return self.get_state()
+
+    def is_playing(self):
+        """
+        Returns a boolean indicating whether the server is playing
+        """
+        return self._playing
+
+    def get_frame_number(self):
+        """
+        Returns the frame number of the last published frame
+        """
+        return self._frame_num
+
+    def get_state(self):
+        """
+        Returns a JSON compatible dictionary of the frame number, frame range, frame rate,
+          playing state and connected viewer count
+        """
+        return {'frame_number': self._frame_num,
+                'min_frame_number': self._animation_handler.get_min_frame_number(),
+                'max_frame_number': self._animation_handler.get_max_frame_number(),
+                'frame_rate': self._animation_handler.get_frame_rate(),
+                'playing': self._playing,
+                'clients': self._client_count}
+
+    def get_frame_bytes(self, frame_num, origin=SEEK_ORIGIN_API):
+        """
+        Returns a frame encoded in the image format of the server; the frame is rendered on the
+          player canvas only if it is not in the encoded frame cache
+
+        Parameters:
+          * frame_num - The frame number to encode
+          * origin (optional) - One of the SEEK_ORIGIN constants describing what requested the
+              frame
+        """
+        frame_num = self._clamp_frame_number(frame_num)
+        with self._render_lock:
+            self._frame_cache.set_signature(self._render_handler.get_render_signature())
+            encoded_frame = self._frame_cache.get(frame_num)
+            if encoded_frame is None:
+                self._animation_handler.render(frame_num, origin, force_draw=True)
+                pixels = raster_helper.get_canvas_pixels(
+                    self._player.get_window_manager().get_figure().canvas)
+                encoded_frame = memoryview(raster_helper.encode_image(pixels,
+                                                                      self._image_format,
+                                                                      self._quality))
+                self._frame_cache.put(frame_num, encoded_frame)
+        return encoded_frame
+
+    def get_frame_size(self):
+        """
+        Returns a tuple of the width and height of the frames in pixels
+        """
+        return self._player.get_window_manager().get_figure().canvas.get_width_height()
+
+    def is_running(self):
+        """
+        Returns a boolean indicating whether the server is serving
+        """
+        return self._running
+
+    def iterate_frames(self):
+        """
+        Generator yielding a tuple of the frame number and encoded frame for the current frame and
+          then every newly published frame until the server shuts down; frames published while
+          the consumer is busy are skipped so slow viewers never fall behind.  The consumer is
+          counted as a connected viewer until the generator is closed
+        """
+        self._add_client(1)
+        try:
+            sequence = 0
+            while self._running:
+                sequence, frame_num, encoded_frame = self._wait_for_frame(sequence)
+                if encoded_frame is not None:
+                    yield frame_num, encoded_frame
+        finally:
+            self._add_client(-1)
+
+    def get_client_count(self):
+        """
+        Returns the number of connected stream viewers
+        """
+        return self._client_count
+
+    def get_cache_manager(self):
+        """
+        Returns the FrameCacheManager holding the encoded frames shared by every viewer
+        """
+        return self._frame_cache
+
+    def get_image_format(self):
+        """
+        Returns the IMAGE_FORMAT constant frames are encoded with
+        """
+        return self._image_format
+
+    def _wait_for_frame(self, sequence, timeout=_CLIENT_POLL_SECONDS):
+        """
+        Block until a frame newer than a publication sequence number is published
+
+        Parameters:
+          * sequence - Sequence number of the last frame received; 0 receives the current frame
+          * timeout (optional) - Maximum number of seconds to wait
+
+        Returns a tuple of the sequence number, frame number and encoded frame; the frame is
+          None if no newer frame was published in time or the server is shutting down
+        """
+        with self._frame_condition:
+            if self._published_sequence <= sequence and self._running:
+                self._frame_condition.wait(timeout)
+            if self._published_sequence <= sequence or not self._running:
+                return sequence, self._frame_num, None
+            return self._published_sequence, self._frame_num, self._published_frame
+
+    def _add_client(self, count):
+        """
+        Update the number of connected stream viewers
+        """
+        with self._frame_condition:
+            self._client_count += count
+
+    def _clamp_frame_number(self, frame_num):
+        """
+        Returns a frame number limited to the frame range of the animation
+        """
+        return min(max(int(round(frame_num)), self._animation_handler.get_min_frame_number()),
+                   self._animation_handler.get_max_frame_number())
+
+    def _publish(self, frame_num, origin=SEEK_ORIGIN_API):
+        """
+        Encode a frame and hand it to every stream viewer
+        """
+        encoded_frame = self.get_frame_bytes(frame_num, origin)
+        with self._frame_condition:
+            self._frame_num = frame_num
+            self._published_frame = encoded_frame
+            self._published_sequence += 1
+            self._frame_condition.notify_all()
+
+    def _run_clock(self):
+        """
+        Clock thread; publishes the frame which should be shown now while playing, dropping frames
+          which can no longer be shown on time
+        """
+        while self._running:
+            if not self._playing:
+                self._wake_event.wait()
+                self._wake_event.clear()
+                continue
+
+            frame_rate = self._animation_handler.get_frame_rate()
+            max_frame_num = self._animation_handler.get_max_frame_number()
+            with self._frame_condition:
+                elapsed_frames = int((time.perf_counter() - self._play_start_time) * frame_rate)
+                next_frame_num = min(self._play_start_frame_num + elapsed_frames, max_frame_num)
+                frame_num = self._frame_num
+
+            if next_frame_num != frame_num:
+                self._publish(next_frame_num, SEEK_ORIGIN_PLAYBACK)
+            if next_frame_num >= max_frame_num:
+                self._playing = False
+
+            self._wake_event.wait(1.0 / frame_rate)
+            self._wake_event.clear()
+
+class _StreamRequestHandler(BaseHTTPRequestHandler):
+    """
+    Request handler of the StreamServer endpoints; the StreamServer is reached through the HTTP
+      server instance
+    """
+
+    def do_GET(self):
+        """
+        Handle GET requests
+        """
+        url = urlparse(self.path)
+        parameters = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        stream_server = self.server.stream_server
+
+        if url.path == PAGE_PATH:
+            self._send_page(stream_server)
+        elif url.path == STREAM_PATH:
+            self._send_stream(stream_server)
+        elif url.path == FRAME_PATH:
+            self._send_frame(stream_server, parameters)
+        elif url.path == STATE_PATH:
+            self._send_json(stream_server.get_state())
+        elif url.path == COMMAND_PATH:
+            self._run_command(stream_server, parameters)
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        """
+        Handle POST requests; only commands are accepted
+        """
+        url = urlparse(self.path)
+        if url.path != COMMAND_PATH:
+            self.send_error(404)
+            return
+
+        parameters = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        self._run_command(self.server.stream_server, parameters)
+
+    #pylint: disable=redefined-builtin
+    def log_message(self, format, *args):
+        """
+        Silence the request log; every stream frame would otherwise be logged
+        """
+
+    def _run_command(self, stream_server, parameters):
+        """
+        Run a playback command and respond with the playback state
+        """
+        action = parameters.get(ACTION_PARAMETER)
+        if action not in COMMANDS:
+            self.send_error(400, 'Unknown action: {}'.format(action))
+            return
+
+        try:
+            state = stream_server.run_command(action, parameters.get(VALUE_PARAMETER))
+        except (TypeError, ValueError):
+            self.send_error(400, 'Invalid value for action: {}'.format(action))
+            return
+        self._send_json(state)
+
+    def _send_frame(self, stream_server, parameters):
+        """
+        Respond with a single encoded frame; the current frame if no frame number is given
+        """
+        try:
+            frame_num = int(parameters.get(FRAME_PARAMETER, stream_server.get_frame_number()))
+        except ValueError:
+            self.send_error(400, 'Invalid frame number: {}'.format(
+                parameters.get(FRAME_PARAMETER)))
+            return
+        self._send_body(raster_helper.IMAGE_MIME_TYPES[stream_server.get_image_format()],
+                        stream_server.get_frame_bytes(frame_num))
+
+    def _send_page(self, stream_server):
+        """
+        Respond with the viewer page
+        """
+        width, height = stream_server.get_frame_size()
+        state = stream_server.get_state()
+        page = html_helper.get_stream_page(PAGE_TITLE, width, height,
+                                           state['min_frame_number'], state['max_frame_number'],
+                                           STREAM_PATH, COMMAND_PATH, STATE_PATH)
+        self._send_body(_HTML_CONTENT_TYPE, page.encode('utf-8'))
+
+    def _send_stream(self, stream_server):
+        """
+        Respond with an MJPEG stream of the published frames until the viewer disconnects
+        """
+        mime_type = raster_helper.IMAGE_MIME_TYPES[stream_server.get_image_format()]
+        self.send_response(200)
+        self.send_header('Content-Type', _MULTIPART_CONTENT_TYPE)
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+
+        try:
+            with contextlib.closing(stream_server.iterate_frames()) as frames:
+                for frame_num, encoded_frame in frames:
+                    header = _MULTIPART_HEADER.format(_MULTIPART_BOUNDARY, mime_type,
+                                                      len(encoded_frame), frame_num)
+                    self.wfile.write(header.encode('ascii'))
+                    self.wfile.write(encoded_frame)
+                    self.wfile.write(b'\r\n')
+                    self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _send_json(self, value):
+        """
+        Respond with a JSON document
+        """
+        self._send_body(_JSON_CONTENT_TYPE, json.dumps(value).encode('utf-8'))
+
+    def _send_body(self, content_type, body):
+        """
+        Respond with a complete body
+        """
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
@@ -2,15 +2,18 @@
 Simple type validation methods
 """
 
-from matplotlib.figure import Figure
+import pickle
 
 INSTANCE_MESSAGE = '{} must be an instance of {}'
 CALLABLE_MESSAGE = '{} must be a callable object'
+MEMBER_MESSAGE = '{} must be one of {}'
+PICKLABLE_MESSAGE = '{} must be picklable to be used by worker processes'
 
 def assert_is_figure(value, variable_name):
     """
     Asserts that a value is a Matplotlib Figure
     """
+    from matplotlib.figure import Figure
     assert isinstance(value, Figure), INSTANCE_MESSAGE.format(variable_name, str(Figure))
 
 def assert_is_int(value, variable_name):
@@ -24,3 +27,20 @@ def assert_is_callable(value, variable_name):
     Asserts that a value is a callable function
     """
     assert callable(value), CALLABLE_MESSAGE.format(variable_name)
+
+def assert_is_in(value, allowed_values, variable_name):
+    """
+    Asserts that a value is one of a collection of allowed values
+    """
+    assert value in allowed_values, MEMBER_MESSAGE.format(variable_name, allowed_values)
+
+def assert_is_picklable(value, variable_name):
+    """
+    Asserts that a value can be pickled and sent to worker processes
+    """
+    try:
+        pickle.dumps(value)
+        picklable = True
+    except (pickle.PicklingError, AttributeError, TypeError):
+        picklable = False
+    assert picklable, PICKLABLE_MESSAGE.format(variable_name)
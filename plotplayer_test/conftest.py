@@ -0,0 +1,10 @@
+"""
+pytest configuration for the plotplayer tests; the interactive demo and benchmark scripts are not
+  test modules
+"""
+
+import matplotlib
+
+matplotlib.use('Agg')
+
+collect_ignore = ['plotplayer_test.py', 'plotplayer_benchmark.py']
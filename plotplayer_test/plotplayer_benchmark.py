@@ -0,0 +1,441 @@
+"""
+PlotPlayer Headless Benchmark Suite
+
+Measures sustained playback frame rate, random and sequential seek latency, export frame rate and
+peak memory of synthetic workloads on the Agg backend; no display is required.  Import time and
+worker process startup time are measured in fresh interpreters.  Results are
+written as JSON and may be compared against the results of a previous release.
+
+Usage:
+  python plotplayer_benchmark.py --output results.json
+  python plotplayer_benchmark.py --quick --workloads lines images
+  python plotplayer_benchmark.py --output new.json --baseline old.json --tolerance 0.2
+"""
+
+import argparse
+import importlib
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+import numpy
+
+from plotplayer.plotplayer import PlotPlayer
+from plotplayer.data_models.animation_params import AnimationParams
+from plotplayer.data_models.series_params import SeriesParams, SERIES_SCATTER
+from plotplayer.frame_sources.array_frame_source import ArrayFrameSource
+from plotplayer.frame_sources.image_frame_source import ImageFrameSource
+from plotplayer.helpers import headless_helper
+from plotplayer.managers.animation_manager import SEEK_ORIGIN_PLAYBACK
+from plotplayer.managers.export_manager import ExportManager, DEFAULT_FFMPEG_PATH
+from plotplayer.managers.window_manager import WindowManager
+
+RESULTS_VERSION = 1
+
+FIGURE_SIZE = (8, 4.5)
+FIGURE_DPI = 100
+FRAME_RATE = 30
+RANDOM_SEED = 0
+
+DEFAULT_PLAYBACK_FRAMES = 300
+DEFAULT_SEEK_COUNT = 200
+DEFAULT_EXPORT_FRAMES = 120
+DEFAULT_MEMORY_FRAMES = 30
+QUICK_DIVISOR = 10
+DEFAULT_TOLERANCE = 0.2
+STARTUP_REPEATS = 5
+
+PLAYER_MODULE = 'plotplayer.plotplayer'
+WORKER_MODULE = 'plotplayer.managers.prefetch_manager'
+IMPORT_TIME_SCRIPT = ('import time; start_time = time.perf_counter(); import {}; '
+                      'print(time.perf_counter() - start_time)')
+
+# Metrics where larger values are better; every other compared metric should shrink
+HIGHER_IS_BETTER = ['playback_fps', 'export_fps']
+COMPARED_METRICS = ['playback_fps', 'sequential_seek_p50', 'sequential_seek_p99',
+                    'random_seek_p50', 'random_seek_p99', 'export_fps', 'peak_memory_bytes']
+STARTUP_METRICS = ['player_import_seconds', 'worker_import_seconds', 'worker_startup_seconds']
+
+class ManyArtistsRenderer(object):
+    """
+    Render function updating many independent Line2D artists every frame
+    """
+
+    def __init__(self, artist_count=200, point_count=50):
+        """
+        Constructor
+
+        Parameters:
+          * artist_count (optional) - Number of Line2D artists updated every frame
+          * point_count (optional) - Number of points of each Line2D artist
+        """
+        self._artist_count = artist_count
+        self._x_data = numpy.linspace(0, 1, point_count)
+        self._offsets = numpy.linspace(0, 1, artist_count)
+        self._artists = {}
+
+    def __call__(self, frame_num, axes):
+        """
+        Render a frame onto an axes; returns the updated artists
+        """
+        phase = frame_num * 0.05
+        lines = self._artists.get(axes)
+        if lines is None:
+            lines = [axes.plot(self._x_data, self._x_data, lw=0.5)[0]
+                     for _ in range(self._artist_count)]
+            self._artists[axes] = lines
+
+        for line, offset in zip(lines, self._offsets):
+            line.set_ydata(offset + 0.02 * numpy.sin(self._x_data * 12 + phase + offset * 6))
+        return lines
+
+class ProceduralLineRenderer(object):
+    """
+    Render function computing each frame of a very long animation from its frame number
+    """
+
+    def __init__(self, point_count=1000):
+        """
+        Constructor
+
+        Parameters:
+          * point_count (optional) - Number of points of the Line2D artist
+        """
+        self._x_data = numpy.linspace(0, 1, point_count)
+        self._artists = {}
+
+    def __call__(self, frame_num, axes):
+        """
+        Render a frame onto an axes; returns the updated artist
+        """
+        y_data = numpy.sin(self._x_data * 20 + frame_num * 1e-3)
+        line = self._artists.get(axes)
+        if line is None:
+            line, = axes.plot(self._x_data, y_data)
+            self._artists[axes] = line
+        else:
+            line.set_ydata(y_data)
+        return [line]
+
+def _create_lines_workload():
+    """
+    Returns the render function, total frames and limits of ten stacked 1000 point line series
+    """
+    x_data = numpy.linspace(0, 1, 1000)
+    phases = numpy.arange(500)[:, None] * 0.05
+    series = [SeriesParams(numpy.sin(x_data[None, :] * 12 + phases + index), x_data)
+              for index in range(10)]
+    frame_source = ArrayFrameSource(series)
+    return frame_source, frame_source.get_total_frames(), frame_source.get_limits()
+
+def _create_scatter_workload():
+    """
+    Returns the render function, total frames and limits of a stacked 5000 point scatter series
+    """
+    offsets = numpy.random.RandomState(RANDOM_SEED).rand(500, 5000, 2).astype(numpy.float32)
+    frame_source = ArrayFrameSource(SeriesParams(offsets, series_type=SERIES_SCATTER,
+                                                 plot_kwargs={'s': 2}))
+    return frame_source, frame_source.get_total_frames(), frame_source.get_limits()
+
+def _create_images_workload():
+    """
+    Returns the render function, total frames and limits of a stack of 256x256 uint8 images
+    """
+    images = numpy.random.RandomState(RANDOM_SEED).randint(0, 256, (300, 256, 256), numpy.uint8)
+    frame_source = ImageFrameSource(images)
+    return frame_source, frame_source.get_total_frames(), frame_source.get_limits()
+
+def _create_many_artists_workload():
+    """
+    Returns the render function, total frames and limits of 200 independently updated lines
+    """
+    return ManyArtistsRenderer(), 1000, ([0, 1], [-0.05, 1.05])
+
+def _create_million_frames_workload():
+    """
+    Returns the render function, total frames and limits of a computed 10^6 frame animation
+    """
+    return ProceduralLineRenderer(), 10 ** 6, ([0, 1], [-1.05, 1.05])
+
+WORKLOADS = {
+    'lines': _create_lines_workload,
+    'scatter': _create_scatter_workload,
+    'images': _create_images_workload,
+    'many_artists': _create_many_artists_workload,
+    'million_frames': _create_million_frames_workload,
+}
+
+def _create_player(workload):
+    """
+    Returns a RenderManager and AnimationManager rendering a workload on a headless Agg figure
+    """
+    render_func, total_frames, limits = WORKLOADS[workload]()
+    window_handler = WindowManager(FIGURE_SIZE, headless=True)
+    window_handler.get_figure().set_dpi(FIGURE_DPI)
+
+    player = PlotPlayer(window_handler)
+    player.get_render_manager().set_limits(*limits)
+    player.initialize(total_frames, render_func, workload)
+    return player.get_render_manager(), player.get_animation_manager()
+
+def _get_percentiles(durations):
+    """
+    Returns a dictionary of the mean, p50 and p99 of durations in seconds
+    """
+    samples = numpy.asarray(durations, float)
+    p50, p99 = numpy.percentile(samples, [50, 99])
+    return {'mean': float(samples.mean()), 'p50': float(p50), 'p99': float(p99)}
+
+def _measure_playback(animation_handler, frame_count):
+    """
+    Returns the sustained frame rate of rendering consecutive frames like the playback timer
+    """
+    frame_count = min(frame_count, animation_handler.get_max_frame_number())
+    animation_handler.render(0, force_draw=True)
+    start_time = time.perf_counter()
+    for frame_num in range(1, frame_count + 1):
+        animation_handler.render(frame_num, SEEK_ORIGIN_PLAYBACK, force_draw=True)
+    return frame_count / (time.perf_counter() - start_time)
+
+def _measure_seeks(animation_handler, frame_nums):
+    """
+    Returns the percentiles of seek latencies for a sequence of seek requests
+    """
+    latencies = []
+    for frame_num in frame_nums:
+        animation_handler.request_seek(int(frame_num))
+        latencies.append(animation_handler.get_seek_latency())
+    return _get_percentiles(latencies)
+
+def _measure_export(render_handler, animation_handler, frame_count, ffmpeg_path):
+    """
+    Returns the export frame rate and whether ffmpeg encoded the frames; without ffmpeg only the
+      headless rendering of the exported frames is measured
+    """
+    frame_count = min(frame_count, animation_handler.get_max_frame_number())
+    if shutil.which(ffmpeg_path) is not None:
+        export_handler = ExportManager(render_handler, ffmpeg_path)
+        export_directory = tempfile.mkdtemp()
+        try:
+            start_time = time.perf_counter()
+            # Frames 0 to frame_count - 1, matching the frames rendered without ffmpeg
+            export_handler.save_video(os.path.join(export_directory, 'benchmark.mp4'),
+                                      AnimationParams(frame_count - 1, frame_rate=FRAME_RATE))
+            return frame_count / (time.perf_counter() - start_time), True
+        finally:
+            shutil.rmtree(export_directory, ignore_errors=True)
+
+    canvas_params = render_handler.get_canvas_params()
+    render_func = render_handler.get_render_func()
+    figure, animation_axes = headless_helper.create_headless_figure(canvas_params)
+    start_time = time.perf_counter()
+    for frame_num in range(frame_count):
+        headless_helper.render_frame_pixels(figure, animation_axes, render_func, frame_num)
+    return frame_count / (time.perf_counter() - start_time), False
+
+def _measure_peak_memory(workload, frame_count):
+    """
+    Returns the peak bytes allocated while building a workload and rendering frames of it
+    """
+    tracemalloc.start()
+    try:
+        _, animation_handler = _create_player(workload)
+        for frame_num in range(frame_count):
+            animation_handler.render(frame_num, force_draw=True)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def run_workload(workload, playback_frames=DEFAULT_PLAYBACK_FRAMES, seek_count=DEFAULT_SEEK_COUNT,
+                 export_frames=DEFAULT_EXPORT_FRAMES, memory_frames=DEFAULT_MEMORY_FRAMES,
+                 ffmpeg_path=DEFAULT_FFMPEG_PATH):
+    """
+    Returns a dictionary of the benchmark results of a workload
+
+    Parameters:
+      * workload - Name of one of the WORKLOADS
+      * playback_frames (optional) - Number of consecutive frames rendered to measure playback
+      * seek_count (optional) - Number of sequential and random seek requests measured
+      * export_frames (optional) - Number of frames exported to measure export throughput
+      * memory_frames (optional) - Number of frames rendered while tracing memory allocations
+      * ffmpeg_path (optional) - Path to the ffmpeg executable used for export
+    """
+    render_handler, animation_handler = _create_player(workload)
+    max_frame_num = animation_handler.get_max_frame_number()
+    results = {'total_frames': max_frame_num}
+
+    results['playback_fps'] = _measure_playback(animation_handler, playback_frames)
+
+    sequential_frames = numpy.arange(seek_count) % max_frame_num
+    for name, value in _measure_seeks(animation_handler, sequential_frames).items():
+        results['sequential_seek_' + name] = value
+
+    random_frames = numpy.random.RandomState(RANDOM_SEED).randint(0, max_frame_num, seek_count)
+    for name, value in _measure_seeks(animation_handler, random_frames).items():
+        results['random_seek_' + name] = value
+
+    export_fps, encoded = _measure_export(render_handler, animation_handler, export_frames,
+                                          ffmpeg_path)
+    results['export_fps'] = export_fps
+    results['export_encoded'] = encoded
+
+    results['peak_memory_bytes'] = _measure_peak_memory(workload, memory_frames)
+    return results
+
+def _import_module(module_name):
+    """
+    Import a module in a worker process; returns nothing so the result is trivially picklable
+    """
+    importlib.import_module(module_name)
+
+def _measure_import_time(module_name, repeats):
+    """
+    Returns the shortest time in seconds taken to import a module in a fresh interpreter
+    """
+    durations = []
+    for _ in range(repeats):
+        output = subprocess.check_output([sys.executable, '-c',
+                                           IMPORT_TIME_SCRIPT.format(module_name)])
+        durations.append(float(output.decode().strip().splitlines()[-1]))
+    return min(durations)
+
+def _measure_worker_startup(module_name, repeats):
+    """
+    Returns the shortest time in seconds taken to start a spawned worker process and import a
+      module in it, as happens for every prefetch and export worker on spawning platforms
+    """
+    durations = []
+    spawn_context = multiprocessing.get_context('spawn')
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        with ProcessPoolExecutor(1, mp_context=spawn_context) as executor:
+            executor.submit(_import_module, module_name).result()
+            durations.append(time.perf_counter() - start_time)
+    return min(durations)
+
+def run_startup(repeats=STARTUP_REPEATS):
+    """
+    Returns a dictionary of the import and worker startup times in seconds
+
+    Parameters:
+      * repeats (optional) - Number of fresh interpreters measured; the shortest time is kept
+    """
+    return {
+        'player_import_seconds': _measure_import_time(PLAYER_MODULE, repeats),
+        'worker_import_seconds': _measure_import_time(WORKER_MODULE, repeats),
+        'worker_startup_seconds': _measure_worker_startup(WORKER_MODULE, repeats),
+    }
+
+def get_environment():
+    """
+    Returns a dictionary describing the interpreter, libraries and machine the benchmark ran on
+    """
+    return {
+        'python': platform.python_version(),
+        'matplotlib': matplotlib.__version__,
+        'numpy': numpy.__version__,
+        'backend': matplotlib.get_backend(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+def compare_results(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Returns a list of messages describing metrics which regressed beyond a tolerance
+
+    Parameters:
+      * results - Benchmark results dictionary
+      * baseline - Benchmark results dictionary of a previous release
+      * tolerance (optional) - Allowed relative change before a metric counts as regressed
+    """
+    compared_sections = [('startup', results.get('startup', {}),
+                          baseline.get('startup', {}), STARTUP_METRICS)]
+    for workload, workload_results in results['workloads'].items():
+        compared_sections.append((workload, workload_results,
+                                  baseline.get('workloads', {}).get(workload, {}),
+                                  COMPARED_METRICS))
+
+    regressions = []
+    for section, section_results, baseline_results, metrics in compared_sections:
+        for metric in metrics:
+            value = section_results.get(metric)
+            baseline_value = baseline_results.get(metric)
+            if not value or not baseline_value:
+                continue
+
+            change = (value - baseline_value) / baseline_value
+            if metric in HIGHER_IS_BETTER:
+                change = -change
+            if change > tolerance:
+                regressions.append('{}.{}: {:.6g} -> {:.6g} ({:+.0%})'.format(
+                    section, metric, baseline_value, value, change))
+    return regressions
+
+def _parse_arguments(arguments):
+    """
+    Returns the parsed command line arguments
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--output', help='File name to write the JSON results to')
+    parser.add_argument('--label', help='Label stored with the results (ie. a release version)')
+    parser.add_argument('--workloads', nargs='+', choices=sorted(WORKLOADS),
+                        default=sorted(WORKLOADS), help='Workloads to run')
+    parser.add_argument('--quick', action='store_true',
+                        help='Measure a tenth of the frames and seeks')
+    parser.add_argument('--skip-startup', action='store_true',
+                        help='Do not measure import and worker startup times')
+    parser.add_argument('--ffmpeg', default=DEFAULT_FFMPEG_PATH,
+                        help='Path to the ffmpeg executable used for export')
+    parser.add_argument('--baseline', help='JSON results of a previous run to compare against')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='Allowed relative change before a metric counts as regressed')
+    return parser.parse_args(arguments)
+
+def main(arguments=None):
+    """
+    Run the benchmark suite from the command line; returns 1 if any metric regressed against the
+      baseline and 0 otherwise
+    """
+    arguments = _parse_arguments(arguments)
+    divisor = QUICK_DIVISOR if arguments.quick else 1
+
+    results = {'version': RESULTS_VERSION, 'label': arguments.label, 'timestamp': time.time(),
+               'environment': get_environment(), 'workloads': {}}
+    if not arguments.skip_startup:
+        print('Running startup...', file=sys.stderr)
+        results['startup'] = run_startup()
+
+    for workload in arguments.workloads:
+        print('Running {}...'.format(workload), file=sys.stderr)
+        results['workloads'][workload] = run_workload(
+            workload, DEFAULT_PLAYBACK_FRAMES // divisor, DEFAULT_SEEK_COUNT // divisor,
+            DEFAULT_EXPORT_FRAMES // divisor, DEFAULT_MEMORY_FRAMES // divisor, arguments.ffmpeg)
+
+    results_json = json.dumps(results, indent=2, sort_keys=True)
+    if arguments.output is None:
+        print(results_json)
+    else:
+        with open(arguments.output, 'w') as results_file:
+            results_file.write(results_json)
+
+    if arguments.baseline is None:
+        return 0
+
+    with open(arguments.baseline) as baseline_file:
+        baseline = json.load(baseline_file)
+    regressions = compare_results(results, baseline, arguments.tolerance)
+    for regression in regressions:
+        print('Regression: ' + regression, file=sys.stderr)
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -9,13 +9,12 @@ def redraw_fn(frame_num, axes):
     f0 = 3
     t = numpy.arange(0.0, 1.0, 0.001)
     s = amp * numpy.sin(2 * numpy.pi * f0 * t)
-    if not redraw_fn.initialized:
-        redraw_fn.l, = axes.plot(t, s, lw=2, color='red')
-        redraw_fn.initialized = True
+    # The line lives on the axes it is drawn onto, so exports rendering onto their own headless
+    #   axes get their own line and nothing keeps those axes alive afterwards
+    if not axes.lines:
+        axes.plot(t, s, lw=2, color='red')
     else:
-        redraw_fn.l.set_ydata(s)
-
-redraw_fn.initialized = False
+        axes.lines[0].set_ydata(s)
 
 video1 = PlotPlayer()
 video1.initialize(100, redraw_fn)
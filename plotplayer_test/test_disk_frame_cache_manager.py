@@ -0,0 +1,29 @@
+"""
+Tests of the byte budget of a DiskFrameCacheManager directory shared by several processes
+"""
+
+import numpy
+
+from plotplayer.managers.disk_frame_cache_manager import DiskFrameCacheManager
+
+FRAME_PIXELS = numpy.zeros((16, 16, 4), dtype=numpy.uint8)
+BUDGET_FRAMES = 4
+PROCESSES = 4
+
+def test_budget_covers_frames_of_other_processes(tmp_path):
+    """
+    Frames stored by other processes sharing the directory count toward the byte budget; each
+      manager stands in for a separate process since it only counts its own stores
+    """
+    probe_cache = DiskFrameCacheManager('probe', str(tmp_path / 'probe'))
+    probe_cache.put(0, FRAME_PIXELS)
+    max_bytes = probe_cache.get_stats().size_bytes * BUDGET_FRAMES
+
+    directory = str(tmp_path / 'frames')
+    frame_caches = [DiskFrameCacheManager('animation-{}'.format(index), directory, max_bytes,
+                                          rescan_puts=1)
+                    for index in range(PROCESSES)]
+    for frame_num in range(BUDGET_FRAMES * 2):
+        for frame_cache in frame_caches:
+            frame_cache.put(frame_num, FRAME_PIXELS)
+            assert frame_cache.get_stats().size_bytes <= max_bytes
@@ -0,0 +1,55 @@
+"""
+Tests of the progress reported by background ExportJobs
+"""
+
+import time
+
+from plotplayer.data_models.animation_params import AnimationParams
+from plotplayer.managers.export_job_manager import EXPORT_VIDEO, JOB_DONE, ExportJob
+
+RESUMED_FRAMES = 90
+RENDERED_FRAMES = 10
+FRAME_SECONDS = 0.01
+
+class ResumingExportManager(object):
+    """
+    ExportManager stand-in resuming most frames from checkpoints and rendering the rest slowly
+    """
+
+    job = None
+    progress = None
+
+    def __init__(self):
+        self.progress = []
+
+    def save_video(self, file_name, animation_params, frame_callback=None, resume_callback=None):
+        """
+        Credit the checkpointed frames, then render the remaining frames one at a time
+        """
+        del file_name, animation_params
+        resume_callback(RESUMED_FRAMES)
+        for _ in range(RENDERED_FRAMES):
+            time.sleep(FRAME_SECONDS)
+            frame_callback(1)
+            self.progress.append(self.job.get_progress())
+
+def test_resumed_frames_excluded_from_rate():
+    """
+    The rate and remaining time only count the frames rendered by the job itself
+    """
+    export_handler = ResumingExportManager()
+    job = ExportJob(export_handler, EXPORT_VIDEO, 'video.mp4',
+                    AnimationParams(RESUMED_FRAMES + RENDERED_FRAMES - 1))
+    export_handler.job = job
+    job.run()
+
+    progress = export_handler.progress[RENDERED_FRAMES // 2 - 1]
+    assert progress.frames_done == RESUMED_FRAMES + RENDERED_FRAMES // 2
+    assert progress.frames_resumed == RESUMED_FRAMES
+    # At most one frame per FRAME_SECONDS was rendered
+    assert 0 < progress.fps <= 1 / FRAME_SECONDS
+    assert progress.eta >= (RENDERED_FRAMES // 2) * FRAME_SECONDS * 0.9
+
+    progress = job.get_progress()
+    assert progress.state == JOB_DONE
+    assert progress.frames_done == RESUMED_FRAMES + RENDERED_FRAMES
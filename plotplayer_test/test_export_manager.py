@@ -0,0 +1,187 @@
+"""
+Tests of animations exported by the ExportManager of a headless PlotPlayer
+"""
+
+import os
+import re
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+from plotplayer.plotplayer import PlotPlayer
+from plotplayer.data_models.animation_params import AnimationParams
+
+PLAYER_ID_PATTERN = re.compile(r'<div class="plotplayer" id="(\w+)">')
+
+VIDEO_FRAMES = 12
+FFMPEG_PATH = shutil.which('ffmpeg')
+requires_ffmpeg = pytest.mark.skipif(FFMPEG_PATH is None, reason='ffmpeg is not installed')
+
+FAKE_FFMPEG = """#!{}
+import sys
+args = sys.argv[1:]
+with open(args[-1], 'wb') as video_file:
+    video_file.write(args[args.index('-s') + 1].encode() + b'\\n')
+    video_file.write(sys.stdin.buffer.read())
+"""
+
+def draw_line(frame_num, axes):
+    """
+    Draw a line whose height is the frame number onto the axes given
+    """
+    if not axes.lines:
+        axes.plot([0, 1], [0, 0])
+    axes.lines[0].set_ydata([frame_num, frame_num])
+
+@pytest.fixture(name='player')
+def fixture_player():
+    """
+    Returns a headless PlotPlayer of a few frames
+    """
+    player = PlotPlayer(headless=True)
+    player.get_render_manager().set_limits([0, 1], [0, 5])
+    player.initialize(5, draw_line)
+    return player
+
+def test_javascript_player_ids_are_unique(player):
+    """
+    Every Javascript export uses its own player id so several exports can share one page
+    """
+    animation_handler = player.get_animation_manager()
+    documents = [animation_handler.get_javascript() for _ in range(2)]
+    player_ids = [PLAYER_ID_PATTERN.search(document).group(1) for document in documents]
+
+    assert player_ids[0] != player_ids[1]
+    for document, player_id in zip(documents, player_ids):
+        assert '{}_frames.push('.format(player_id) in document
+        assert 'getElementById("{}_image")'.format(player_id) in document
+
+@pytest.fixture(name='export_handler')
+def fixture_export_handler():
+    """
+    Returns the ExportManager of a headless PlotPlayer exporting with the installed ffmpeg
+    """
+    player = PlotPlayer(headless=True)
+    player.get_render_manager().set_limits([0, 1], [0, VIDEO_FRAMES])
+    player.initialize(VIDEO_FRAMES, draw_line)
+    export_handler = player.get_animation_manager().get_export_manager()
+    export_handler.set_ffmpeg_path(FFMPEG_PATH)
+    return export_handler
+
+def decode_video(file_name):
+    """
+    Returns the raw RGBA pixels of every frame of a video decoded by ffmpeg
+    """
+    return subprocess.run([FFMPEG_PATH, '-loglevel', 'error', '-i', file_name,
+                           '-f', 'rawvideo', '-pix_fmt', 'rgba', '-'],
+                          check=True, stdout=subprocess.PIPE).stdout
+
+@requires_ffmpeg
+def test_parallel_export_matches_serial(export_handler, tmp_path):
+    """
+    A video exported by two worker processes decodes to the same frames as a serial export
+    """
+    animation_params = AnimationParams(VIDEO_FRAMES - 1)
+    serial_file_name = str(tmp_path / 'serial.mp4')
+    parallel_file_name = str(tmp_path / 'parallel.mp4')
+
+    export_handler.set_max_workers(1)
+    assert export_handler.save_video(serial_file_name, animation_params) == VIDEO_FRAMES
+    export_handler.set_max_workers(2)
+    assert export_handler.save_video(parallel_file_name, animation_params) == VIDEO_FRAMES
+
+    serial_frames = decode_video(serial_file_name)
+    assert serial_frames
+    assert decode_video(parallel_file_name) == serial_frames
+
+@pytest.fixture(name='fake_ffmpeg')
+def fixture_fake_ffmpeg(tmp_path):
+    """
+    Returns the path of an executable standing in for ffmpeg which writes the declared frame size
+      followed by the raw frames it reads from stdin to the output file
+    """
+    ffmpeg_path = tmp_path / 'ffmpeg'
+    ffmpeg_path.write_text(FAKE_FFMPEG.format(sys.executable))
+    ffmpeg_path.chmod(0o755)
+    return str(ffmpeg_path)
+
+@pytest.mark.skipif(os.name == 'nt', reason='the fake ffmpeg is a script run through its shebang')
+def test_player_figure_export_uses_physical_size(player, fake_ffmpeg, tmp_path):
+    """
+    An export falling back to the player figure declares the physical pixel size of its canvas
+      to ffmpeg on HiDPI displays
+    """
+    player_axes = player.get_render_manager().get_animation_axes()
+    def draw_player_line(frame_num, _):
+        """
+        Draw onto the player axes instead of the axes given
+        """
+        draw_line(frame_num, player_axes)
+
+    player.initialize(5, draw_player_line)
+    player_axes.figure.canvas._set_device_pixel_ratio(2) #pylint: disable=protected-access
+    animation_handler = player.get_animation_manager()
+    animation_handler.get_export_manager().set_ffmpeg_path(fake_ffmpeg)
+
+    video_file_name = str(tmp_path / 'video.mp4')
+    with pytest.warns(UserWarning):
+        animation_handler.save_video(video_file_name)
+
+    with open(video_file_name, 'rb') as video_file:
+        size = video_file.readline().decode()
+        frame_data = video_file.read()
+    width, height = (int(value) for value in size.split('x'))
+    assert (width, height) == player_axes.figure.canvas.get_width_height(physical=True)
+    assert len(frame_data) == 5 * width * height * 4
+
+def test_headless_export_leaves_player_figure(player):
+    """
+    An export rendered on headless canvases does not render the player figure again
+    """
+    render_handler = player.get_render_manager()
+    render_handler.reset_render_counts()
+    player.get_animation_manager().get_javascript()
+
+    assert not render_handler.get_render_counts()
+
+class InterruptExport(Exception):
+    """
+    Raised by a frame callback to interrupt an export
+    """
+
+@requires_ffmpeg
+def test_resumed_chunked_export_matches_uninterrupted(export_handler, tmp_path):
+    """
+    A chunked export interrupted part way and run again resumes from its complete chunks and
+      decodes to the same frames as an uninterrupted chunked export
+    """
+    animation_params = AnimationParams(VIDEO_FRAMES - 1)
+    export_handler.set_chunk_frames(4)
+    uninterrupted_file_name = str(tmp_path / 'uninterrupted.mp4')
+    resumed_file_name = str(tmp_path / 'resumed.mp4')
+    export_handler.save_video(uninterrupted_file_name, animation_params)
+
+    frames_written = []
+    def interrupt_after_six_frames(frame_count):
+        """
+        Interrupt the export part way through its second chunk
+        """
+        frames_written.append(frame_count)
+        if sum(frames_written) == 6:
+            raise InterruptExport()
+
+    with pytest.raises(InterruptExport):
+        export_handler.save_video(resumed_file_name, animation_params,
+                                  interrupt_after_six_frames)
+    assert not os.path.exists(resumed_file_name)
+
+    frames_resumed = []
+    frames_written.clear()
+    export_handler.save_video(resumed_file_name, animation_params, frames_written.append,
+                              frames_resumed.append)
+
+    assert frames_resumed == [4]
+    assert sum(frames_written) == VIDEO_FRAMES - 4
+    assert decode_video(resumed_file_name) == decode_video(uninterrupted_file_name)
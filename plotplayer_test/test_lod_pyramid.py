@@ -0,0 +1,41 @@
+"""
+Tests of the level of detail pyramid drawn for line series
+"""
+
+import numpy
+import pytest
+
+from plotplayer.data_models.frame_file_params import FrameFileParams
+from plotplayer.data_models.series_params import SeriesParams
+from plotplayer.frame_sources.array_frame_source import ArrayFrameSource
+from plotplayer.frame_sources.lod_pyramid import LodPyramid, POINTS_PER_PIXEL
+from plotplayer.frame_sources.memmap_frame_source import MemmapFrameSource
+
+def test_points_drawn_follow_pixel_width():
+    """
+    The level drawn for the whole x range draws about POINTS_PER_PIXEL points per pixel column
+    """
+    point_count = 2 ** 20
+    x_data = numpy.arange(point_count, dtype=float)
+    y_data = numpy.random.RandomState(0).standard_normal((2, point_count))
+    pyramid = LodPyramid(x_data, y_data)
+
+    for pixel_width in (100, 800, 1920):
+        x_values, y_values = pyramid.get_frame_data(1, (0, point_count), pixel_width)
+        assert x_values.shape == y_values.shape
+        assert POINTS_PER_PIXEL * pixel_width <= len(y_values) <= 2 * POINTS_PER_PIXEL * pixel_width
+        assert y_values.max() == y_data[1].max()
+        assert y_values.min() == y_data[1].min()
+
+def test_memmap_series_reject_level_of_detail(tmp_path):
+    """
+    Memory mapped series cannot enable level of detail since the pyramid is built in memory
+    """
+    file_name = str(tmp_path / 'y.npy')
+    numpy.save(file_name, numpy.zeros((4, 8192)))
+
+    with pytest.raises(AssertionError):
+        MemmapFrameSource(SeriesParams(FrameFileParams(file_name), level_of_detail=True))
+    with pytest.raises(AssertionError):
+        ArrayFrameSource(SeriesParams(numpy.load(file_name, mmap_mode='r'),
+                                      level_of_detail=True))
@@ -0,0 +1,38 @@
+"""
+Tests drawing frames of memory mapped recordings with a MemmapFrameSource
+"""
+
+import pickle
+
+import numpy
+
+from plotplayer.data_models.frame_file_params import FrameFileParams
+from plotplayer.data_models.series_params import SeriesParams, SERIES_SCATTER
+from plotplayer.frame_sources.memmap_frame_source import MemmapFrameSource
+from plotplayer.helpers import headless_helper
+
+TOTAL_FRAMES = 10
+TOTAL_POINTS = 25
+
+def test_separate_scatter_files_are_drawn_frame_by_frame(tmp_path):
+    """
+    A scatter series given as separate x and y files is drawn without stacking the recording,
+      also after the source is sent to another process
+    """
+    x_data = numpy.random.default_rng(0).random((TOTAL_FRAMES, TOTAL_POINTS))
+    y_data = numpy.random.default_rng(1).random((TOTAL_FRAMES, TOTAL_POINTS))
+    numpy.save(tmp_path / 'x.npy', x_data)
+    numpy.save(tmp_path / 'y.npy', y_data)
+
+    frame_source = MemmapFrameSource(SeriesParams(FrameFileParams(str(tmp_path / 'y.npy')),
+                                                  FrameFileParams(str(tmp_path / 'x.npy')),
+                                                  SERIES_SCATTER))
+    for source in (frame_source, pickle.loads(pickle.dumps(frame_source))):
+        assert source._offsets == [None] #pylint: disable=protected-access
+
+        figure = headless_helper.create_agg_figure((4, 3))
+        axes = figure.add_subplot()
+        for frame_num in (0, 7, 3):
+            scatter, = source(frame_num, axes)
+            expected_offsets = numpy.column_stack((x_data[frame_num], y_data[frame_num]))
+            numpy.testing.assert_array_equal(scatter.get_offsets(), expected_offsets)
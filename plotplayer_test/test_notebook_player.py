@@ -0,0 +1,88 @@
+"""
+Tests of the NotebookPlayer; skipped unless ipywidgets and tornado are installed
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from plotplayer.plotplayer import PlotPlayer
+
+pytest.importorskip('ipywidgets')
+pytest.importorskip('tornado')
+
+#pylint: disable=wrong-import-position
+from plotplayer.notebook_player import NotebookPlayer
+
+TIMEOUT_SECONDS = 10
+
+def draw_line(frame_num, axes):
+    """
+    Draw a line whose height is the frame number onto the axes given
+    """
+    if not axes.lines:
+        axes.plot([0, 1], [0, 0])
+    axes.lines[0].set_ydata([frame_num, frame_num])
+
+def create_player():
+    """
+    Returns an initialized headless PlotPlayer
+    """
+    player = PlotPlayer(headless=True)
+    player.get_render_manager().set_limits([0, 1], [0, 10])
+    player.initialize(10, draw_line)
+    return player
+
+def get_visible_images(notebook_player):
+    """
+    Returns the Image widgets of the front end pool which are displayed
+    """
+    images = notebook_player.get_widget().children[0].children
+    return [image for image in images if image.layout.display != 'none']
+
+def test_frames_held_by_front_end_are_not_sent_again():
+    """
+    Showing a frame which is still in the front end pool only switches the visible image
+    """
+    notebook_player = NotebookPlayer(create_player(), client_cache_frames=4)
+    notebook_player.show_frame(3)
+    notebook_player.show_frame(0)
+
+    assert notebook_player.get_sent_frame_count() == 2
+    assert notebook_player.get_frame_number() == 0
+    assert len(get_visible_images(notebook_player)) == 1
+    notebook_player.close()
+
+def test_renderer_thread_sets_widgets_on_loop():
+    """
+    Frames rendered by the renderer thread are assigned to the widgets on the IOLoop thread
+    """
+    async def request_frame():
+        """
+        Request a frame from the running loop and wait for its widget updates to arrive
+        """
+        notebook_player = NotebookPlayer(create_player(), client_cache_frames=4)
+        update_threads = []
+        for image in notebook_player.get_widget().children[0].children:
+            image.observe(lambda change: update_threads.append(threading.current_thread()),
+                          names='value')
+            image.layout.observe(lambda change: update_threads.append(
+                threading.current_thread()), names='display')
+
+        notebook_player.request_frame(5)
+        deadline = time.monotonic() + TIMEOUT_SECONDS
+        while notebook_player.get_frame_number() != 5 or len(update_threads) < 3:
+            assert time.monotonic() < deadline
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+
+        notebook_player.close()
+        return update_threads, get_visible_images(notebook_player)
+
+    update_threads, visible_images = asyncio.run(request_frame())
+    # The new image value, the new visible image and the previous image being hidden
+    assert len(update_threads) == 3
+    assert all(thread is threading.main_thread() for thread in update_threads)
+    assert len(visible_images) == 1
@@ -0,0 +1,104 @@
+"""
+Tests of the shared playback clock of a PlayerGroup of headless PlotPlayers
+"""
+
+import numpy
+import pytest
+
+from plotplayer.plotplayer import PlotPlayer
+from plotplayer.player_group import PlayerGroup
+
+def draw_line(frame_num, axes):
+    """
+    Draw a line whose height is the frame number onto the axes given
+    """
+    if not axes.lines:
+        axes.plot([0, 1], [0, 0])
+    axes.lines[0].set_ydata([frame_num, frame_num])
+
+@pytest.fixture(name='group')
+def fixture_group():
+    """
+    Returns a PlayerGroup of two headless PlotPlayers showing every frame during playback
+    """
+    players = []
+    for total_frames in (30, 20):
+        player = PlotPlayer(headless=True)
+        player.get_render_manager().set_limits([0, 1], [0, 30])
+        player.initialize(total_frames, draw_line)
+        players.append(player)
+
+    group = PlayerGroup(players)
+    group.set_drop_frames(False)
+    return group
+
+def tick(group, count=1):
+    """
+    Fire the shared playback timer; headless canvases never fire timers
+    """
+    for _ in range(count):
+        group.get_playback_manager().tick()
+
+def test_seek_backward_during_playback(group):
+    """
+    Seeking backward during playback continues playback from the sought frame
+    """
+    group.play()
+    tick(group, 10)
+    assert group.get_frame_number() == 10
+
+    group.render(3)
+    tick(group)
+    assert group.get_frame_number() == 4
+    for player in group.get_players():
+        assert player.get_animation_manager().get_frame_number() == 4
+    group.stop()
+
+def record_events(render_handler, index, events):
+    """
+    Record each external render function call and deferred canvas draw of a player as an event
+    """
+    render_func = render_handler.get_render_func()
+    draw_deferred = render_handler.draw_deferred
+
+    def render_and_record(frame_num, axes):
+        events.append(('render', index))
+        return render_func(frame_num, axes)
+
+    def draw_and_record():
+        events.append(('draw', index))
+        draw_deferred()
+
+    render_handler.initialize(render_and_record)
+    render_handler.draw_deferred = draw_and_record
+
+def test_render_draws_after_every_player_rendered(group):
+    """
+    A group frame is rendered on every player before any canvas is drawn
+    """
+    events = []
+    for index, player in enumerate(group.get_players()):
+        record_events(player.get_render_manager(), index, events)
+
+    group.render(5)
+    assert events == [('render', 0), ('render', 1), ('draw', 0), ('draw', 1)]
+    for player in group.get_players():
+        assert player.get_animation_manager().get_frame_number() == 5
+
+def test_playback_rate_and_direction(group):
+    """
+    The playback rate of any player sets the stride and direction of the whole group
+    """
+    group.render(20)
+    group.get_players()[1].get_animation_manager().set_playback_rate(-2)
+    assert group.get_playback_rate() == -2
+    assert group.get_players()[0].get_animation_manager().get_playback_rate() == -2
+
+    group.play()
+    tick(group, 3)
+    assert group.get_frame_number() == 14
+
+    tick(group, 10)
+    assert group.get_frame_number() == 0
+    assert not group.is_playing()
+    assert group.get_playback_stats().dropped_frames == 0
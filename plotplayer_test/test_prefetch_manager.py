@@ -0,0 +1,68 @@
+"""
+Tests for prefetching frames in worker processes
+"""
+
+import time
+
+import numpy
+import pytest
+
+from plotplayer.plotplayer import PlotPlayer
+from plotplayer.managers.prefetch_manager import PrefetchManager
+
+TOTAL_FRAMES = 20
+PREFETCH_TIMEOUT = 30
+
+class CountingSine(object):
+    """
+    Picklable render function counting how often it is pickled in this process
+    """
+
+    pickle_count = 0
+
+    def __getstate__(self):
+        CountingSine.pickle_count += 1
+        return {}
+
+    def __call__(self, frame_num, axes):
+        x_data = numpy.linspace(0, 2 * numpy.pi, 50)
+        if not axes.lines:
+            axes.plot(x_data, numpy.sin(x_data))
+        axes.lines[0].set_ydata(numpy.sin(x_data + frame_num))
+        return axes.lines
+
+@pytest.fixture(name='player')
+def fixture_player():
+    """
+    Returns a headless PlotPlayer prefetching frames in two worker processes
+    """
+    player = PlotPlayer(headless=True)
+    player.get_render_manager().set_limits([0, 2 * numpy.pi], [-1, 1])
+    player.initialize(TOTAL_FRAMES, CountingSine())
+    prefetch_handler = PrefetchManager(player.get_render_manager(), lookahead=4, max_workers=2)
+    player.get_animation_manager().set_prefetch_manager(prefetch_handler)
+    yield player
+    prefetch_handler.shutdown()
+
+def test_render_func_sent_once(player):
+    """
+    The render function is checked and sent to the workers once rather than with every frame
+    """
+    animation_handler = player.get_animation_manager()
+    frame_cache = player.get_render_manager().get_frame_cache()
+    CountingSine.pickle_count = 0
+
+    for frame_num in range(0, TOTAL_FRAMES - 1, 4):
+        animation_handler.render(frame_num)
+        deadline = time.monotonic() + PREFETCH_TIMEOUT
+        wanted_frames = range(frame_num + 1, min(frame_num + 5, TOTAL_FRAMES))
+        while (not all(frame_cache.contains(wanted_frame) for wanted_frame in wanted_frames) and
+               time.monotonic() < deadline):
+            time.sleep(0.05)
+            # Collects the finished frames
+            animation_handler.get_prefetch_manager().update(
+                frame_num, 1, 0, TOTAL_FRAMES - 1)
+
+    assert all(frame_cache.contains(frame_num) for frame_num in range(1, TOTAL_FRAMES))
+    # Pickled by the picklability check and, with the spawn start method, once per worker
+    assert CountingSine.pickle_count <= 3
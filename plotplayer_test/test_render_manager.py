@@ -0,0 +1,109 @@
+"""
+Tests counting external render function calls while playing, seeking and dragging the Scrubber
+  Slider of a headless PlotPlayer
+"""
+
+import numpy
+import pytest
+
+from plotplayer.plotplayer import PlotPlayer
+from plotplayer.managers.frame_cache_manager import FrameCacheManager
+from plotplayer.managers.stats_manager import STAGES
+
+TOTAL_FRAMES = 20
+
+def draw_sine(frame_num, axes):
+    """
+    Draw a sine wave shifted by the frame number onto the axes given
+    """
+    x_data = numpy.linspace(0, 2 * numpy.pi, 50)
+    if not axes.lines:
+        axes.plot(x_data, numpy.sin(x_data))
+    axes.lines[0].set_ydata(numpy.sin(x_data + frame_num))
+
+@pytest.fixture(name='player')
+def fixture_player():
+    """
+    Returns a headless PlotPlayer on an Agg figure with its render counters reset
+    """
+    player = PlotPlayer(headless=True)
+    player.get_render_manager().set_limits([0, 2 * numpy.pi], [-1, 1])
+    player.initialize(TOTAL_FRAMES, draw_sine)
+    player.get_render_manager().reset_render_counts()
+    return player
+
+def test_play_renders_each_frame_once(player):
+    """
+    Playback without frame dropping renders every frame after the first exactly once
+    """
+    animation_handler = player.get_animation_manager()
+    animation_handler.set_drop_frames(False)
+    animation_handler.play()
+    for _ in range(TOTAL_FRAMES * 2):
+        # Headless canvases never fire timers
+        animation_handler.get_playback_manager().tick()
+    animation_handler.stop()
+
+    expected_counts = {frame_num: 1 for frame_num in range(1, TOTAL_FRAMES)}
+    assert dict(player.get_render_manager().get_render_counts()) == expected_counts
+
+def test_seek_renders_each_frame_once(player):
+    """
+    Each seek renders the sought frame exactly once
+    """
+    animation_handler = player.get_animation_manager()
+    for frame_num in (5, 12, 3, 19):
+        animation_handler.request_seek(frame_num)
+        assert animation_handler.get_frame_number() == frame_num
+
+    expected_counts = {5: 1, 12: 1, 3: 1, 19: 1}
+    assert dict(player.get_render_manager().get_render_counts()) == expected_counts
+
+def test_slider_drag_renders_each_frame_once(player):
+    """
+    Dragging the Scrubber Slider renders each frame passed over exactly once
+    """
+    slider = player.get_render_manager().get_slider()
+    total_frames = player.get_animation_manager().get_total_frames()
+    slider.drag_active = True
+    for frame_num in (2, 7, 11, 16):
+        slider.set_val(frame_num / total_frames)
+    slider.drag_active = False
+
+    expected_counts = {2: 1, 7: 1, 11: 1, 16: 1}
+    assert dict(player.get_render_manager().get_render_counts()) == expected_counts
+
+def test_repeated_seeks_hit_frame_cache(player):
+    """
+    Seeking back to frames which were rendered before is served from the frame cache
+    """
+    render_handler = player.get_render_manager()
+    frame_cache = FrameCacheManager()
+    render_handler.set_frame_cache(frame_cache)
+    animation_handler = player.get_animation_manager()
+    for frame_num in (4, 9, 4, 9, 4):
+        animation_handler.request_seek(frame_num)
+
+    assert dict(render_handler.get_render_counts()) == {4: 1, 9: 1}
+    cache_stats = frame_cache.get_stats()
+    assert cache_stats.hits == 3
+    assert cache_stats.misses == 2
+
+def test_failed_cache_paste_records_one_slider_sample(player):
+    """
+    A cached frame whose pixels no longer fit the canvas is rendered in full and records a
+      single sample of each render stage
+    """
+    render_handler = player.get_render_manager()
+    frame_cache = FrameCacheManager()
+    render_handler.set_frame_cache(frame_cache)
+    frame_cache.set_signature(render_handler.get_render_signature())
+    frame_cache.put(6, numpy.zeros((1, 1, 4), numpy.uint8))
+    stats_handler = render_handler.get_stats_manager()
+    stats_handler.reset()
+
+    player.get_animation_manager().request_seek(6)
+
+    assert render_handler.get_render_count(6) == 1
+    for stage in STAGES:
+        assert len(stats_handler.get_durations(stage)) == 1
@@ -0,0 +1,107 @@
+"""
+Loopback tests of the StreamServer HTTP endpoints
+"""
+
+import json
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+import pytest
+
+from plotplayer.plotplayer import PlotPlayer
+from plotplayer.stream_server import StreamServer
+
+pytest.importorskip('PIL')
+
+TIMEOUT_SECONDS = 10
+JPEG_MAGIC = b'\xff\xd8\xff'
+
+def draw_line(frame_num, axes):
+    """
+    Draw a line whose height is the frame number onto the axes given
+    """
+    if not axes.lines:
+        axes.plot([0, 1], [0, 0])
+    axes.lines[0].set_ydata([frame_num, frame_num])
+
+@pytest.fixture(name='stream_server')
+def fixture_stream_server():
+    """
+    Returns a running StreamServer on a free loopback port; it is shut down after the test
+    """
+    player = PlotPlayer(headless=True)
+    player.get_render_manager().set_limits([0, 1], [0, 10])
+    player.initialize(10, draw_line)
+
+    stream_server = StreamServer(player)
+    stream_server.start()
+    yield stream_server
+    stream_server.shutdown()
+
+def request(stream_server, path, method='GET'):
+    """
+    Returns the status, content type and body of a request to the server
+    """
+    host, port = stream_server.get_address()
+    url = 'http://{}:{}{}'.format(host, port, path)
+    try:
+        with urlopen(Request(url, method=method), timeout=TIMEOUT_SECONDS) as response:
+            return response.status, response.headers['Content-Type'], response.read()
+    except HTTPError as error:
+        return error.code, error.headers['Content-Type'], error.read()
+
+def test_state(stream_server):
+    """
+    The state endpoint describes the frame range and playback state
+    """
+    status, content_type, body = request(stream_server, '/state')
+    state = json.loads(body.decode('utf-8'))
+
+    assert status == 200
+    assert content_type == 'application/json'
+    assert state['frame_number'] == 0
+    assert state['min_frame_number'] == 0
+    assert state['max_frame_number'] == 9
+    assert not state['playing']
+
+def test_frame(stream_server):
+    """
+    The frame endpoint returns encoded frames and rejects invalid frame numbers
+    """
+    status, content_type, body = request(stream_server, '/frame?number=3')
+    assert status == 200
+    assert content_type == 'image/jpeg'
+    assert body.startswith(JPEG_MAGIC)
+
+    status, _, body = request(stream_server, '/frame')
+    assert status == 200
+    assert body.startswith(JPEG_MAGIC)
+
+    status, _, _ = request(stream_server, '/frame?number=three')
+    assert status == 400
+
+def test_command(stream_server):
+    """
+    Commands change the playback state and reject unknown actions and invalid values
+    """
+    status, _, body = request(stream_server, '/command?action=seek&value=5', 'POST')
+    assert status == 200
+    assert json.loads(body.decode('utf-8'))['frame_number'] == 5
+    assert stream_server.get_frame_number() == 5
+
+    status, _, body = request(stream_server, '/command?action=step&value=-2')
+    assert status == 200
+    assert json.loads(body.decode('utf-8'))['frame_number'] == 3
+
+    assert request(stream_server, '/command?action=rewind')[0] == 400
+    assert request(stream_server, '/command?action=seek&value=five')[0] == 400
+    assert request(stream_server, '/missing')[0] == 404
+
+def test_shutdown(stream_server):
+    """
+    A shut down server stops accepting connections
+    """
+    stream_server.shutdown()
+    assert not stream_server.is_running()
+    with pytest.raises(URLError):
+        request(stream_server, '/state')
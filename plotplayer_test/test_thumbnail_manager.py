@@ -0,0 +1,82 @@
+"""
+Tests for rendering Scrubber Slider thumbnails in worker processes
+"""
+
+import time
+
+import numpy
+import pytest
+
+from plotplayer.plotplayer import PlotPlayer
+from plotplayer.managers.thumbnail_manager import ThumbnailManager
+from plotplayer.validators import type_validation
+
+TOTAL_FRAMES = 20
+THUMBNAIL_COUNT = 10
+THUMBNAIL_TIMEOUT = 30
+
+class CountingSine(object):
+    """
+    Picklable render function counting how often it is pickled in this process
+    """
+
+    pickle_count = 0
+
+    def __getstate__(self):
+        CountingSine.pickle_count += 1
+        return {}
+
+    def __call__(self, frame_num, axes):
+        x_data = numpy.linspace(0, 2 * numpy.pi, 50)
+        if not axes.lines:
+            axes.plot(x_data, numpy.sin(x_data))
+        axes.lines[0].set_ydata(numpy.sin(x_data + frame_num))
+        return axes.lines
+
+@pytest.fixture(name='player')
+def fixture_player():
+    """
+    Returns a headless PlotPlayer rendering thumbnails in one worker process
+    """
+    player = PlotPlayer(headless=True)
+    player.get_render_manager().set_limits([0, 2 * numpy.pi], [-1, 1])
+    thumbnail_handler = ThumbnailManager(player.get_render_manager(), THUMBNAIL_COUNT,
+                                         max_workers=1)
+    CountingSine.pickle_count = 0
+    player.initialize(TOTAL_FRAMES, CountingSine())
+    player.get_animation_manager().set_thumbnail_manager(thumbnail_handler)
+    yield player
+    thumbnail_handler.shutdown()
+
+def wait_for_thumbnails(thumbnail_handler):
+    """
+    Wait until every thumbnail has finished rendering
+    """
+    deadline = time.monotonic() + THUMBNAIL_TIMEOUT
+    while (len(thumbnail_handler.get_thumbnail_frames()) < THUMBNAIL_COUNT and
+           time.monotonic() < deadline):
+        time.sleep(0.05)
+    assert len(thumbnail_handler.get_thumbnail_frames()) == THUMBNAIL_COUNT
+
+def test_render_func_sent_once(player, monkeypatch):
+    """
+    The render function is sent to the workers once rather than with every thumbnail, and
+      resizing the window renders new thumbnails without checking it again
+    """
+    thumbnail_handler = player.get_animation_manager().get_thumbnail_manager()
+    wait_for_thumbnails(thumbnail_handler)
+    # Pickled by the picklability check and, with the spawn start method, once by the worker
+    assert CountingSine.pickle_count <= 2
+    thumbnail_shape = thumbnail_handler.get_thumbnail(0)[1].shape
+
+    def fail_picklable_check(*_):
+        raise AssertionError('render_func was checked while hovering')
+    monkeypatch.setattr(type_validation, 'assert_is_picklable', fail_picklable_check)
+
+    figure = player.get_render_manager().get_animation_axes().figure
+    width, height = figure.get_size_inches()
+    figure.set_size_inches(width * 2, height * 2)
+    thumbnail_handler.show_thumbnail(5)
+    wait_for_thumbnails(thumbnail_handler)
+    resized_shape = thumbnail_handler.get_thumbnail(0)[1].shape
+    assert resized_shape[0] > thumbnail_shape[0] and resized_shape[1] > thumbnail_shape[1]